@@ -0,0 +1,197 @@
+"""Achievement step of a study submission: full rescan vs incremental event.
+
+Seeds an in-memory SQLite copy of the schema with --users users, each holding
+a row for every achievement (4 categories x --stages stages), and runs
+--submissions study submissions of random users through either
+
+  rescan - UserService.check_user_achievemets, metric totals fetched from a
+           local metric server answering after --metric-delay seconds
+  event  - UserService.apply_achievement_event with the submission's
+           {"learned_amount": 1} event
+
+reporting latency per submission, statements and rows written. The step is the
+only part of POST /words/study that differs between the two. SQLite runs the
+repositories through a thin AsyncSession shim, so this needs no Postgres.
+
+Usage: python -m benchmarks.bench_achievements --mode rescan --users 2000
+"""
+
+import time
+import random
+import asyncio
+import argparse
+from types import SimpleNamespace
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from src.config.instance import (
+    ACHIEVEMENT_AUDIO,
+    ACHIEVEMENT_LEARNED,
+    ACHIEVEMENT_VIDEO,
+    ACHIEVEMENT_WORDS,
+)
+from src.database.db_config import Base
+from src.database.models import Achievement, User, UserAchievement
+from src.repositories.repositories import (
+    AchievementRepository,
+    UserAchievementRepository,
+    UserRepository,
+)
+from src.services import user_service as user_service_module
+from src.services.achievement_service import AchievementService
+from src.services.user_achievement_service import UserAchievementService
+from src.services.user_service import UserService
+from src.utils.metric import MetricClient
+
+CATEGORIES = [
+    ACHIEVEMENT_WORDS,
+    ACHIEVEMENT_LEARNED,
+    ACHIEVEMENT_AUDIO,
+    ACHIEVEMENT_VIDEO,
+]
+
+
+class SyncSession:
+    # just enough of AsyncSession for the repositories, over a sync Session
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def execute(self, *args, **kwargs):
+        return self.session.execute(*args, **kwargs)
+
+    async def flush(self):
+        self.session.flush()
+
+    async def commit(self):
+        self.session.commit()
+
+
+def seed(session: Session, users: int, stages: int) -> None:
+    session.add_all(
+        Achievement(
+            id=index * stages + stage + 1,
+            title=f"{category} {stage}",
+            category=category,
+            stage=stage,
+            target=10 ** (stage + 1),
+        )
+        for index, category in enumerate(CATEGORIES)
+        for stage in range(stages)
+    )
+    session.add_all(
+        User(id=user_id, provider="google", uwords_uid=f"uid-{user_id}")
+        for user_id in range(users)
+    )
+    session.flush()
+
+    session.add_all(
+        UserAchievement(
+            user_id=user_id,
+            achievement_id=achievement_id,
+            progress=0,
+            progress_percent=0,
+            is_completed=False,
+        )
+        for user_id in range(users)
+        for achievement_id in range(1, len(CATEGORIES) * stages + 1)
+    )
+    session.commit()
+
+
+async def run(args) -> None:
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+
+    statements = writes = 0
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        nonlocal statements, writes
+        statements += 1
+        if statement.lstrip().upper().startswith("UPDATE"):
+            writes += len(parameters) if executemany else 1
+
+    session = Session(engine)
+    seed(session, users=args.users, stages=args.stages)
+
+    uow = SimpleNamespace(session=SyncSession(session))
+    user_service = UserService(UserRepository(uow=uow))
+    user_achievement_service = UserAchievementService(
+        UserAchievementRepository(uow=uow)
+    )
+    user_service_module.achievement_service_fabric = lambda: AchievementService(
+        AchievementRepository(uow=uow)
+    )
+
+    async def metric(request):
+        await asyncio.sleep(args.metric_delay)
+        return web.json_response(
+            {
+                "alltime_userwords_amount": 120,
+                "alltime_learned_amount": 30,
+                "alltime_speech_seconds": 600,
+                "alltime_video_seconds": 0,
+            }
+        )
+
+    app = web.Application()
+    app.router.add_get("/metric", metric)
+
+    async with TestServer(app) as server:
+        user_service_module.metric_client = MetricClient(
+            server_url=str(server.make_url("/metric"))
+        )
+
+        latencies = []
+        statements = writes = 0
+
+        for _ in range(args.submissions):
+            user_id = random.randrange(args.users)
+            start = time.perf_counter()
+
+            if args.mode == "rescan":
+                await user_service.check_user_achievemets(
+                    user_id=user_id, user_achievement_service=user_achievement_service
+                )
+            else:
+                await user_service.apply_achievement_event(
+                    user_id=user_id,
+                    event={"uwords_uid": f"uid-{user_id}", "learned_amount": 1},
+                    user_achievement_service=user_achievement_service,
+                )
+            session.commit()
+
+            latencies.append(time.perf_counter() - start)
+
+        await user_service_module.metric_client.close()
+
+    latencies.sort()
+    mean = sum(latencies) / len(latencies) * 1000
+    p95 = latencies[int(len(latencies) * 0.95)] * 1000
+    print(
+        f"{args.mode}: mean {mean:.2f} ms, p95 {p95:.2f} ms per submission, "
+        f"{statements / args.submissions:.1f} statements, "
+        f"{writes / args.submissions:.1f} rows updated"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=["rescan", "event"], default="event")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--stages", type=int, default=5)
+    parser.add_argument("--submissions", type=int, default=200)
+    parser.add_argument("--metric-delay", type=float, default=0.02)
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Upload to recognized text: temp files vs the in-memory pipeline.
+
+Generates a --minutes long WAV at --sample-rate (tone bursts over noise, as
+in bench_vad_chunks) and runs the steps of general_process_audio on it with
+FakeSpeech standing in for the recognizer:
+
+  files  - AUDIO_TEMP_FILES: convert to a WAV, find speech in it, write each
+           chunk as a WAV and read it back for recognition
+  memory - decode through an ffmpeg pipe, find speech in the samples, slice
+           chunks as views and hand the recognizer their bytes
+
+reporting wall time and the bytes the pipeline wrote to disk. Needs ffmpeg.
+
+Usage: python -m benchmarks.bench_audio_pipeline --minutes 30
+"""
+
+import os
+import time
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.bench_vad_chunks import generate
+from src.config.instance import STT_WORKERS
+from src.services.speech_service import FakeSpeech
+from src.utils.audio import (
+    AudioChunk,
+    convert_audio,
+    decode_audio,
+    detect_speech,
+    pack_speech,
+    slice_chunks,
+    write_chunks,
+)
+from src.utils.stt import transcribe
+
+
+def with_files(path: str, directory: str):
+    converted = convert_audio(path, os.path.join(directory, "upload_converted.wav"))
+    chunks = pack_speech(detect_speech(audio=converted))
+    return [AudioChunk(path=file) for file in write_chunks(converted, chunks)]
+
+
+def in_memory(path: str, directory: str):
+    audio = decode_audio(path)
+    return slice_chunks(audio, pack_speech(detect_speech(audio=audio)))
+
+
+def written(directory: str) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(directory))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minutes", type=int, default=30)
+    parser.add_argument("--sample-rate", type=int, default=44100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "upload.wav")
+        generate(path, minutes=args.minutes, rate=args.sample_rate)
+
+        for name, pipeline in [("files", with_files), ("memory", in_memory)]:
+            with tempfile.TemporaryDirectory() as workdir:
+                start = time.perf_counter()
+
+                chunks = pipeline(path, workdir)
+                with ThreadPoolExecutor(max_workers=STT_WORKERS) as executor:
+                    transcribe(chunks, backend=FakeSpeech(), executor=executor)
+
+                seconds = time.perf_counter() - start
+                print(
+                    f"{name:<7} {len(chunks):4d} chunks  wall {seconds:6.2f} s  "
+                    f"written {written(workdir) / 2**20:7.1f} MiB"
+                )
+
+
+if __name__ == "__main__":
+    main()
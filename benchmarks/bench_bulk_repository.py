@@ -0,0 +1,123 @@
+"""Database round trips of single-row vs bulk repository calls.
+
+The session is replaced by a counter, so this runs without Postgres: every
+execute() is one round trip and every session is one checked out connection
+(a new TCP + auth handshake under NullPool).
+
+Usage: python -m benchmarks.bench_bulk_repository --rows 1000
+"""
+
+import asyncio
+import argparse
+from unittest.mock import MagicMock, patch
+
+from src.database.models import UserAchievement, UserWord
+from src.utils import repository
+from src.utils.repository import SQLAlchemyRepository
+
+
+class UserWordRepository(SQLAlchemyRepository):
+    model = UserWord
+
+
+class UserAchievementRepository(SQLAlchemyRepository):
+    model = UserAchievement
+
+
+class Counter:
+    def __init__(self):
+        self.sessions = 0
+        self.round_trips = 0
+
+    def session(self):
+        self.sessions += 1
+        return CountingSession(self)
+
+
+class CountingSession:
+    def __init__(self, counter: Counter):
+        self.counter = counter
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def execute(self, stmt, params=None):
+        self.counter.round_trips += 1
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = []
+        result.scalar_one.return_value = MagicMock(progress=1)
+        return result
+
+    async def scalars(self, stmt, params=None):
+        self.counter.round_trips += 1
+        return MagicMock(all=MagicMock(return_value=[]))
+
+    async def commit(self):
+        self.counter.round_trips += 1
+
+
+async def progress_single(rows: int):
+    repo = UserWordRepository()
+    for word_id in range(rows):
+        await repo.get_one([UserWord.user_id == 1, UserWord.id == word_id])
+        await repo.update_one(
+            [UserWord.user_id == 1, UserWord.id == word_id], {"progress": 1}
+        )
+
+
+async def progress_bulk(rows: int):
+    repo = UserWordRepository()
+    await repo.get_many_by_ids(ids=range(rows), filters=[UserWord.user_id == 1])
+    await repo.update_many(data=[{"id": i, "progress": 1} for i in range(rows)])
+
+
+async def achievements_single(rows: int):
+    repo = UserAchievementRepository()
+    for user_id in range(rows):
+        await repo.get_one([UserAchievement.user_id == user_id])
+        await repo.add_one({"user_id": user_id, "achievement_id": 1})
+
+
+async def achievements_bulk(rows: int):
+    repo = UserAchievementRepository()
+    await repo.get_columns_by_filter(
+        columns=[UserAchievement.user_id], filters=[UserAchievement.achievement_id == 1]
+    )
+    await repo.add_many(
+        data=[{"user_id": user_id, "achievement_id": 1} for user_id in range(rows)],
+        returning=False,
+    )
+
+
+def measure(workload, rows: int) -> Counter:
+    counter = Counter()
+    with patch.object(repository, "async_session_maker", counter.session):
+        asyncio.run(workload(rows))
+    return counter
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    workloads = [
+        ("update_progress_word", progress_single, progress_bulk),
+        ("update_user_achievements", achievements_single, achievements_bulk),
+    ]
+
+    for name, single, bulk in workloads:
+        before = measure(single, args.rows)
+        after = measure(bulk, args.rows)
+        print(
+            f"{name:<26} rows {args.rows}: "
+            f"round trips {before.round_trips} -> {after.round_trips}, "
+            f"sessions {before.sessions} -> {after.sessions}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Wall time and ffmpeg CPU time of cutting a long WAV into 30 second chunks.
+
+Generates a --minutes long noise WAV at --sample-rate, then cuts it with
+the previous cut_audio loop (one ffmpeg process per chunk, each seeking from
+the start of the file) and with segment_audio (one ffmpeg run with the
+segment muxer). CPU time is the user + system time of the ffmpeg children.
+
+Usage: python -m benchmarks.bench_cut_audio --minutes 60 --sample-rate 16000
+"""
+
+import os
+import time
+import argparse
+import resource
+import tempfile
+from typing import Callable, List
+
+import ffmpeg
+
+from src.config.instance import AUDIO_SEGMENT_SECONDS
+from src.utils.audio import segment_audio
+
+
+def per_chunk(path: str, duration: float) -> List[str]:
+    # the loop cut_audio ran before the segment muxer
+    files = []
+    filename, _ = os.path.splitext(path)
+    index = 0
+
+    while index * AUDIO_SEGMENT_SECONDS < duration:
+        outpath = f"{filename}_{index + 1}.wav"
+        stream = ffmpeg.input(path, ss=index * AUDIO_SEGMENT_SECONDS)
+
+        if (index + 1) * AUDIO_SEGMENT_SECONDS < duration:
+            stream = stream.output(outpath, t=AUDIO_SEGMENT_SECONDS, ac=1)
+        else:
+            stream = stream.output(outpath, ac=1)
+
+        stream.overwrite_output().run(quiet=True)
+        files.append(outpath)
+        index += 1
+
+    return files
+
+
+def measure(name: str, cut: Callable[[], List[str]]) -> None:
+    before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    start = time.perf_counter()
+
+    files = cut()
+
+    wall = time.perf_counter() - start
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+
+    print(f"{name:<10} {len(files):4d} chunks  wall {wall:7.2f} s  cpu {cpu:7.2f} s")
+
+    for file in files:
+        os.remove(file)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minutes", type=int, default=60)
+    parser.add_argument("--sample-rate", type=int, default=16000)
+    args = parser.parse_args()
+
+    duration = args.minutes * 60
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "podcast.wav")
+        ffmpeg.input(f"anoisesrc=d={duration}:r={args.sample_rate}", f="lavfi").output(
+            path, ac=1
+        ).overwrite_output().run(quiet=True)
+
+        measure("per chunk", lambda: per_chunk(path=path, duration=duration))
+        measure("segment", lambda: segment_audio(path=path, duration=duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Load test of GET /api/v1/user/topics with NullPool vs the pooled engine.
+
+Starts `uvicorn src.main:app` once per mode (DB_POOL_ENABLED=false/true) against
+the database from the environment and fires concurrent authorized requests.
+
+Usage: python -m benchmarks.bench_db_pool --token <ACCESS token> --requests 2000 --concurrency 50
+"""
+
+import os
+import time
+import asyncio
+import argparse
+import subprocess
+from typing import List
+
+import aiohttp
+
+
+ENDPOINT = "/api/v1/user/topics"
+
+
+async def wait_ready(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(f"{url}/docs"):
+                    return
+            except aiohttp.ClientError:
+                await asyncio.sleep(0.2)
+
+    raise TimeoutError(f"{url} did not start")
+
+
+async def load(url: str, token: str, requests: int, concurrency: int) -> List[float]:
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async with aiohttp.ClientSession(headers=headers) as session:
+
+        async def request():
+            async with semaphore:
+                start = time.perf_counter()
+                async with session.get(f"{url}{ENDPOINT}") as response:
+                    await response.read()
+                    response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(request() for _ in range(requests)))
+
+    return latencies
+
+
+def run_mode(pooled: bool, args) -> None:
+    url = f"http://127.0.0.1:{args.port}"
+    env = {**os.environ, "DB_POOL_ENABLED": str(pooled).lower()}
+
+    server = subprocess.Popen(
+        ["uvicorn", "src.main:app", "--port", str(args.port), "--log-level", "warning"],
+        env=env,
+    )
+
+    try:
+        asyncio.run(wait_ready(url=url))
+
+        start = time.perf_counter()
+        latencies = sorted(
+            asyncio.run(
+                load(
+                    url=url,
+                    token=args.token,
+                    requests=args.requests,
+                    concurrency=args.concurrency,
+                )
+            )
+        )
+        seconds = time.perf_counter() - start
+
+    finally:
+        server.terminate()
+        server.wait()
+
+    p50 = latencies[len(latencies) // 2] * 1000
+    p95 = latencies[int(len(latencies) * 0.95)] * 1000
+
+    print(
+        f"{'pooled' if pooled else 'NullPool':>8}: {args.requests / seconds:8.1f} req/s "
+        f"p50 {p50:7.1f} ms  p95 {p95:7.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    run_mode(pooled=False, args=args)
+    run_mode(pooled=True, args=args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Load test of the error WebSocket: many open sockets, errors pushed to them.
+
+Opens --sockets sockets on /api/v1/websockets/errors of a running server
+(distinct user ids from --first-user-id), then posts --errors errors through
+/api/v1/error/add to random connected users and measures the delay from the
+POST until the socket receives the message. Needs the API with its Postgres
+and Redis.
+
+Usage: python -m benchmarks.bench_error_push --url http://127.0.0.1:8000 --sockets 2000 --errors 500
+"""
+
+import time
+import random
+import asyncio
+import argparse
+from typing import Dict, List
+
+import aiohttp
+
+
+async def drain(socket: aiohttp.ClientWebSocketResponse, received: List[float]):
+    async for message in socket:
+        if message.type == aiohttp.WSMsgType.TEXT:
+            received.append(time.perf_counter())
+
+
+async def run(args) -> None:
+    ws_url = args.url.replace("http", "ws", 1) + "/api/v1/websockets/errors"
+    user_ids = range(args.first_user_id, args.first_user_id + args.sockets)
+    received: Dict[int, List[float]] = {user_id: [] for user_id in user_ids}
+
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        sockets = await asyncio.gather(
+            *(session.ws_connect(f"{ws_url}?user_id={user_id}") for user_id in user_ids)
+        )
+        print(f"{len(sockets)} sockets open in {time.perf_counter() - start:.2f} s")
+
+        readers = [
+            asyncio.create_task(drain(socket, received[user_id]))
+            for user_id, socket in zip(user_ids, sockets)
+        ]
+        # anything unsent from earlier runs arrives on connect
+        await asyncio.sleep(1)
+        for times in received.values():
+            times.clear()
+
+        latencies = []
+        for _ in range(args.errors):
+            user_id = random.choice(user_ids)
+            sent_at = time.perf_counter()
+            async with session.post(
+                f"{args.url}/api/v1/error/add", params={"user_id": user_id}
+            ) as response:
+                response.raise_for_status()
+
+            while not received[user_id]:
+                if time.perf_counter() - sent_at > args.timeout:
+                    break
+                await asyncio.sleep(0.001)
+            else:
+                latencies.append(received[user_id].pop(0) - sent_at)
+
+        for socket in sockets:
+            await socket.close()
+        await asyncio.gather(*readers, return_exceptions=True)
+
+    latencies.sort()
+    if not latencies:
+        print("no error was delivered")
+        return
+
+    p50 = latencies[len(latencies) // 2] * 1000
+    p95 = latencies[int(len(latencies) * 0.95)] * 1000
+    print(
+        f"delivered {len(latencies)}/{args.errors} errors, "
+        f"POST->push p50 {p50:.1f} ms, p95 {p95:.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--sockets", type=int, default=2000)
+    parser.add_argument("--errors", type=int, default=500)
+    parser.add_argument("--first-user-id", type=int, default=1_000_000)
+    parser.add_argument("--timeout", type=float, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Per-token pymorphy3 parsing vs deduplicated, memoized normalization.
+
+Usage: python -m benchmarks.bench_lemmatization --tokens 50000
+"""
+
+import time
+import random
+import argparse
+from typing import List
+
+import pymorphy3
+
+from src.utils.cache import LRUCache
+from src.utils.text import normalize_tokens
+
+
+RU_WORDS = (
+    "время человек года жизнь дела руки дом работы слова место лица друга глаза "
+    "вопросы дня головы стороны страны мира случае ребята город части земли "
+    "бежали говорил видела знали пошёл стояли думаю хотели читала писали живут "
+    "новый большие хорошего последним русская главные высокий маленькие старого"
+).split()
+
+EN_WORDS = (
+    "time people years way days things man world life hand part children eyes "
+    "woman place work week case point government company number group problem "
+    "went said told made took came thought looked wanted gave used found called"
+).split()
+
+
+def build_vocabulary(ma: pymorphy3.MorphAnalyzer) -> List[str]:
+    ru_forms = {form.word for word in RU_WORDS for form in ma.parse(word)[0].lexeme}
+    en_forms = {word + suffix for word in EN_WORDS for suffix in ("", "s", "ed", "ing")}
+    return sorted(ru_forms | en_forms)
+
+
+def build_tokens(vocabulary: List[str], amount: int, seed: int = 42) -> List[str]:
+    rng = random.Random(seed)
+    vocabulary = list(vocabulary)
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    rng.shuffle(vocabulary)
+    return rng.choices(vocabulary, weights=weights, k=amount)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=50000)
+    args = parser.parse_args()
+
+    ma = pymorphy3.MorphAnalyzer()
+    tokens = build_tokens(vocabulary=build_vocabulary(ma=ma), amount=args.tokens)
+
+    start = time.perf_counter()
+    expected = [ma.parse(word)[0].normal_form for word in tokens]
+    loop_seconds = time.perf_counter() - start
+
+    cache = LRUCache(maxsize=200000)
+    normalizer = lambda word: ma.parse(word)[0].normal_form
+
+    start = time.perf_counter()
+    cold = normalize_tokens(words=tokens, normalizer=normalizer, cache=cache)
+    cold_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    warm = normalize_tokens(words=tokens, normalizer=normalizer, cache=cache)
+    warm_seconds = time.perf_counter() - start
+
+    assert cold == expected and warm == expected
+
+    print(f"tokens:       {len(tokens)} ({len(set(tokens))} unique)")
+    print(f"per-token:    {loop_seconds * 1000:8.1f} ms")
+    print(f"dedup cold:   {cold_seconds * 1000:8.1f} ms")
+    print(f"memo warm:    {warm_seconds * 1000:8.1f} ms")
+    print(f"cache stats:  {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
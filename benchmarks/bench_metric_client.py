@@ -0,0 +1,79 @@
+"""Time a request path spends on metrics: inline POST vs the buffered client.
+
+Runs a local metric server that answers after --delay seconds and sends
+--events events for --users users, once with a new session and an awaited
+POST per event (the old send_user_data path) and once through MetricClient,
+whose send() only buffers. Reports the time on the caller's path and the
+number of POSTs that reached the server.
+
+Usage: python -m benchmarks.bench_metric_client --events 500 --users 50 --delay 0.05
+"""
+
+import time
+import asyncio
+import argparse
+import tempfile
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.utils.metric import MetricClient, send_user_data
+
+
+async def run(args) -> None:
+    posts = 0
+
+    async def post(request):
+        nonlocal posts
+        posts += 1
+        await asyncio.sleep(args.delay)
+        return web.Response()
+
+    app = web.Application()
+    app.router.add_post("/metric", post)
+
+    events = [
+        {"uwords_uid": f"user-{i % args.users}", "learned_amount": 1}
+        for i in range(args.events)
+    ]
+
+    async with TestServer(app) as server:
+        url = str(server.make_url("/metric"))
+
+        start = time.perf_counter()
+        for data in events:
+            await send_user_data(data=data, server_url=url)
+        inline = time.perf_counter() - start
+        print(f"inline:   {inline * 1000:8.1f} ms on the request path, {posts} POSTs")
+
+        posts = 0
+        with tempfile.TemporaryDirectory() as spool_dir:
+            client = MetricClient(server_url=url, spool_dir=spool_dir)
+
+            start = time.perf_counter()
+            for data in events:
+                client.send(data)
+            buffered = time.perf_counter() - start
+
+            start = time.perf_counter()
+            await client.close()
+            flush = time.perf_counter() - start
+
+        print(
+            f"buffered: {buffered * 1000:8.1f} ms on the request path, {posts} POSTs "
+            f"(background flush {flush * 1000:.1f} ms)"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
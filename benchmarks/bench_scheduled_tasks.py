@@ -0,0 +1,141 @@
+"""Per-user vs set-based reset_limits and check_sub on a seeded database.
+
+Seeds --users users (a quarter with an expired subscription) into the database
+from the environment, times the old one-statement-per-user loops against the
+batched UPDATEs, then deletes the seeded rows. Both jobs touch every user in
+the table, so point it at a scratch database.
+
+Usage: python -m benchmarks.bench_scheduled_tasks --users 100000
+"""
+
+import time
+import asyncio
+import argparse
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, select, update
+
+from src.config.instance import (
+    ALLOWED_AUDIO_SECONDS,
+    ALLOWED_VIDEO_SECONDS,
+    DEFAULT_ENERGY,
+)
+from src.database.db_config import async_session_maker, dispose_engine
+from src.database.models import Subscription, User
+from src.repositories.repositories import UserRepository
+from src.services.user_service import UserService
+
+
+PROVIDER = "benchmark"
+
+
+async def seed(users: int) -> int:
+    now = datetime.now()
+
+    async with async_session_maker() as session:
+        sub_id = await session.scalar(
+            insert(Subscription)
+            .values(name=f"{PROVIDER} {now.timestamp()}", price=0, months=1)
+            .returning(Subscription.id)
+        )
+
+        rows = [
+            {
+                "provider": PROVIDER,
+                "energy": 0,
+                "allowed_audio_seconds": 0,
+                "allowed_video_seconds": 0,
+                "subscription_type": sub_id if i % 4 == 0 else None,
+                "subscription_acquisition": now - timedelta(days=62),
+                "subscription_expired": now - timedelta(days=31),
+            }
+            for i in range(users)
+        ]
+        for start in range(0, users, 5000):
+            await session.execute(insert(User), rows[start : start + 5000])
+        await session.commit()
+
+    return sub_id
+
+
+async def cleanup(sub_id: int) -> None:
+    async with async_session_maker() as session:
+        await session.execute(delete(User).where(User.provider == PROVIDER))
+        await session.execute(delete(Subscription).where(Subscription.id == sub_id))
+        await session.commit()
+
+
+async def restore(sub_id: int) -> None:
+    async with async_session_maker() as session:
+        await session.execute(
+            update(User)
+            .where(User.provider == PROVIDER)
+            .values(
+                energy=0,
+                allowed_audio_seconds=0,
+                allowed_video_seconds=0,
+                subscription_type=sub_id,
+            )
+        )
+        await session.execute(
+            update(User)
+            .where(User.provider == PROVIDER, User.id % 4 != 0)
+            .values(subscription_type=None)
+        )
+        await session.commit()
+
+
+async def per_user(user_service: UserService) -> None:
+    # the pre-batching shape: read every user, one UPDATE (and for check_sub
+    # one subscription read) per user
+    async with async_session_maker() as session:
+        users = (await session.execute(select(User.id, User.subscription_type))).all()
+
+    for user_id, subscription_type in users:
+        if subscription_type is None:
+            await user_service.update_user(
+                user_id=user_id,
+                user_data={
+                    "allowed_audio_seconds": ALLOWED_AUDIO_SECONDS,
+                    "allowed_video_seconds": ALLOWED_VIDEO_SECONDS,
+                    "energy": DEFAULT_ENERGY,
+                },
+            )
+        else:
+            async with async_session_maker() as session:
+                await session.get(Subscription, subscription_type)
+            await user_service.update_user(
+                user_id=user_id, user_data={"subscription_type": None}
+            )
+
+
+async def set_based(user_service: UserService) -> None:
+    await user_service.reset_limits()
+    await user_service.expire_subscriptions()
+
+
+async def run(users: int) -> None:
+    user_service = UserService(UserRepository())
+    sub_id = await seed(users)
+
+    try:
+        for name, job in [("per user", per_user), ("set based", set_based)]:
+            start = time.perf_counter()
+            await job(user_service)
+            print(f"{name:>9}: {time.perf_counter() - start:8.2f} s for {users} users")
+            await restore(sub_id)
+    finally:
+        await cleanup(sub_id)
+        await dispose_engine()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100_000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.users))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Messages per second: a new SMTP session per message vs the pooled sender.
+
+Delivers to a local aiosmtpd server over plain SMTP, so the numbers are a
+lower bound on the saving: the real server adds a TLS handshake and a LOGIN to
+every per-message session.
+
+Usage: python -m benchmarks.bench_smtp_sender --messages 500
+"""
+
+import time
+import socket
+import smtplib
+import argparse
+
+from aiosmtpd.controller import Controller
+
+from src.services.email_service import EmailService
+from src.services.notification_service import NotificationService
+from src.utils.smtp_sender import SMTPSender
+
+
+class Sink:
+    async def handle_DATA(self, server, session, envelope):
+        return "250 OK"
+
+
+SENDER = "noreply@uwords.test"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def per_message(host: str, port: int, recipients) -> float:
+    start = time.perf_counter()
+
+    for email, username in recipients:
+        message = EmailService.build_message(
+            email=email, theme="t", text=username, sender_email=SENDER
+        )
+        with smtplib.SMTP(host, port) as server:
+            server.send_message(message)
+
+    return time.perf_counter() - start
+
+
+def pooled(host: str, port: int, recipients) -> float:
+    sender = SMTPSender(
+        host=host,
+        port=port,
+        user=None,
+        password=None,
+        use_ssl=False,
+        rate=0,
+        address=SENDER,
+    )
+    stats = NotificationService.send_streak_batch(recipients, sender=sender)
+    sender.close()
+    return stats["seconds"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=500)
+    args = parser.parse_args()
+
+    controller = Controller(Sink(), hostname="127.0.0.1", port=free_port())
+    controller.start()
+    recipients = [[f"user{i}@uwords.test", f"user{i}"] for i in range(args.messages)]
+
+    try:
+        for name, send in [("per message", per_message), ("pooled", pooled)]:
+            seconds = send(controller.hostname, controller.port, recipients)
+            print(f"{name:>11}: {args.messages / seconds:8.1f} messages/s")
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""STT calls and wall time per upload: both languages on every chunk vs probe.
+
+Makes --chunks 30 second chunks of silence and recognizes them with
+FakeSpeech, which sleeps --latency seconds per call and answers in
+--language with high confidence (the other language gets a garbled low
+confidence guess). "dual" is the previous path, every chunk in ru-RU and
+en-US; "probe" is transcribe(). --workers matches the task's thread pool.
+
+Usage: python -m benchmarks.bench_stt_probe --chunks 60 --latency 1.5
+"""
+
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.config.instance import AUDIO_SAMPLE_RATE, STT_LANGUAGES, STT_WORKERS
+from src.services.speech_service import FakeSpeech
+from src.utils.audio import AudioChunk
+from src.utils.stt import transcribe
+
+
+class CountingSpeech(FakeSpeech):
+    def __init__(self, language: str, latency: float):
+        super().__init__(language=language, latency=latency)
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def recognize(self, chunk, language):
+        with self.lock:
+            self.calls += 1
+        return super().recognize(chunk, language)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=1.5)
+    parser.add_argument("--language", choices=STT_LANGUAGES, default="en-US")
+    parser.add_argument("--workers", type=int, default=STT_WORKERS)
+    args = parser.parse_args()
+
+    chunks = [
+        AudioChunk(parts=[np.zeros(30 * AUDIO_SAMPLE_RATE, dtype=np.int16)])
+        for _ in range(args.chunks)
+    ]
+
+    backend = CountingSpeech(args.language, args.latency)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for language in STT_LANGUAGES:
+            list(executor.map(lambda chunk: backend.recognize(chunk, language), chunks))
+    print(f"dual   {backend.calls:4d} calls  wall {time.perf_counter() - start:6.2f} s")
+
+    backend = CountingSpeech(args.language, args.latency)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        _, language = transcribe(chunks, backend=backend, executor=executor)
+    print(
+        f"probe  {backend.calls:4d} calls  wall {time.perf_counter() - start:6.2f} s  "
+        f"language {language}"
+    )
+
+
+if __name__ == "__main__":
+    main()
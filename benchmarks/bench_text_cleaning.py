@@ -0,0 +1,100 @@
+"""Old staged text cleaning vs the single-pass token pipeline on large inputs.
+
+Usage: python -m benchmarks.bench_text_cleaning --megabytes 4
+"""
+
+import time
+import random
+import string
+import argparse
+from collections import Counter
+
+from src.utils.text import iter_clean_tokens
+
+
+WORDS = (
+    "время человек жизнь дела руки дом работы слова место лица друга глаза "
+    "house time people water day world school state family student group "
+    "и в не на я что он с это как the of and to a in is it you that"
+).split()
+
+
+def build_text(megabytes: float, seed: int = 42) -> str:
+    rng = random.Random(seed)
+    parts, size = [], 0
+
+    while size < megabytes * 1024 * 1024:
+        word = rng.choice(WORDS)
+        roll = rng.random()
+        if roll < 0.05:
+            word += ","
+        elif roll < 0.08:
+            word += "."
+        elif roll < 0.085:
+            word = f"«{word}»"
+        elif roll < 0.09:
+            word = str(rng.randint(1, 2024))
+        parts.append(word)
+        size += len(word.encode("utf-8")) + 1
+
+    return " ".join(parts)
+
+
+def load_stopwords():
+    try:
+        from nltk.corpus import stopwords
+
+        return stopwords.words("english") + stopwords.words("russian")
+    except LookupError:
+        rng = random.Random(0)
+        filler = ["".join(rng.choices(string.ascii_lowercase, k=6)) for _ in range(330)]
+        return ["и", "в", "не", "на", "я", "что", "он", "с", "это", "как"] + filler
+
+
+def staged(text: str, stopwords: list) -> dict:
+    spec_chars = string.punctuation + "\n\xa0«»\t—…" + string.digits
+    cleaned = " ".join("".join([c for c in text if c not in spec_chars]).split())
+    words = [word for word in cleaned.split() if word not in stopwords]
+
+    freq_dict = {}
+    for word in words:
+        if word not in freq_dict.keys():
+            freq_dict[word] = 1
+        else:
+            freq_dict[word] += 1
+
+    return dict(sorted(freq_dict.items(), key=lambda x: x[1], reverse=True))
+
+
+def single_pass(text: str, stopwords: frozenset) -> dict:
+    return dict(
+        Counter(iter_clean_tokens(text=text, stopwords=stopwords)).most_common()
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--megabytes", type=float, default=4)
+    args = parser.parse_args()
+
+    text = build_text(megabytes=args.megabytes)
+    stopwords = load_stopwords()
+
+    start = time.perf_counter()
+    expected = staged(text=text, stopwords=stopwords)
+    staged_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = single_pass(text=text, stopwords=frozenset(stopwords))
+    single_seconds = time.perf_counter() - start
+
+    assert result == expected and list(result) == list(expected)
+
+    print(f"input:        {len(text.encode('utf-8')) / 1024 / 1024:.1f} MB")
+    print(f"staged:       {staged_seconds * 1000:8.1f} ms")
+    print(f"single pass:  {single_seconds * 1000:8.1f} ms")
+    print(f"speedup:      {staged_seconds / single_seconds:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
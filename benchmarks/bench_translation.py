@@ -0,0 +1,75 @@
+"""Words/second of the per-word Marian loop vs the batched MarianTranslator.
+
+Usage: python -m benchmarks.bench_translation --words 500 --batch-size 32
+"""
+
+import time
+import argparse
+from typing import List
+
+from transformers import MarianMTModel, MarianTokenizer
+
+from src.config.instance import TRANSLATION_EN_RU
+from src.services.translation_service import MarianTranslator
+
+
+WORDS = (
+    "house time people way water day man thing woman life child world school "
+    "state family student group country problem hand part place case week "
+    "company system program question work government number night point home "
+    "room mother area money story fact month lot right study book eye job word "
+    "business issue side kind head service friend father power hour game line "
+    "end member law car city community name president team minute idea kid body "
+    "information back parent face others level office door health person art war "
+    "history party result change morning reason research girl guy moment air "
+    "teacher force education foot boy age policy process music market sense"
+).split()
+
+
+def build_words(amount: int) -> List[str]:
+    return [WORDS[i % len(WORDS)] + ("s" * (i // len(WORDS))) for i in range(amount)]
+
+
+def per_word(tokenizer: MarianTokenizer, model: MarianMTModel, words: List[str]):
+    for word in words:
+        inputs = tokenizer(word, return_tensors="pt", padding=True)
+        translated = model.generate(
+            **inputs, max_length=50, num_beams=5, no_repeat_ngram_size=2
+        )
+        tokenizer.decode(
+            translated[0], skip_special_tokens=True, clean_up_tokenization_spaces=True
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--words", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    tokenizer = MarianTokenizer.from_pretrained(TRANSLATION_EN_RU)
+    model = MarianMTModel.from_pretrained(TRANSLATION_EN_RU)
+    model.eval()
+
+    words = build_words(args.words)
+
+    start = time.perf_counter()
+    per_word(tokenizer=tokenizer, model=model, words=words)
+    loop_seconds = time.perf_counter() - start
+
+    translator = MarianTranslator(
+        tokenizer=tokenizer, model=model, batch_size=args.batch_size
+    )
+
+    start = time.perf_counter()
+    translator.translate(words=words)
+    batch_seconds = time.perf_counter() - start
+
+    print(f"words:        {len(words)}")
+    print(f"per-word:     {len(words) / loop_seconds:8.1f} words/s")
+    print(f"batched({args.batch_size:>3}): {len(words) / batch_seconds:8.1f} words/s")
+    print(f"speedup:      {loop_seconds / batch_seconds:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
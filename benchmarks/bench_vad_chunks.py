@@ -0,0 +1,75 @@
+"""STT calls and audio seconds per upload: fixed 30 s cuts vs speech chunks.
+
+Generates a --minutes long WAV of tone bursts ("utterances" of 0.5-4 s)
+separated by pauses of 0.3-3 s and longer silences, over faint noise, and
+compares the fixed cuts with detect_speech + pack_speech + write_chunks:
+chunk count (one STT call per chunk per language), seconds sent and time.
+
+Usage: python -m benchmarks.bench_vad_chunks --minutes 30
+"""
+
+import os
+import math
+import time
+import argparse
+import tempfile
+
+import numpy as np
+import soundfile
+
+from src.config.instance import AUDIO_SEGMENT_SECONDS
+from src.utils.audio import detect_speech, pack_speech, speech_seconds, write_chunks
+
+
+def generate(path: str, minutes: int, rate: int, seed: int = 0) -> float:
+    rng = np.random.default_rng(seed)
+    total = minutes * 60 * rate
+    samples = rng.normal(0, 0.002, total).astype(np.float32)
+    position = speech = 0
+
+    while position < total:
+        length = int(rng.uniform(0.5, 4) * rate)
+        t = np.arange(min(length, total - position)) / rate
+        pitch = rng.uniform(100, 300)
+        samples[position : position + len(t)] += 0.3 * np.sin(2 * np.pi * pitch * t)
+        speech += len(t)
+
+        pause = rng.uniform(0.3, 3) if rng.random() < 0.85 else rng.uniform(5, 20)
+        position += length + int(pause * rate)
+
+    soundfile.write(path, samples, rate, subtype="PCM_16")
+    return speech / rate
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minutes", type=int, default=30)
+    parser.add_argument("--sample-rate", type=int, default=16000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "upload.wav")
+        speech = generate(path, minutes=args.minutes, rate=args.sample_rate)
+        duration = args.minutes * 60
+
+        print(f"file {duration} s, of which speech {speech:.0f} s")
+        print(
+            f"fixed  {math.ceil(duration / AUDIO_SEGMENT_SECONDS):4d} chunks, "
+            f"{duration:7.0f} s sent"
+        )
+
+        start = time.perf_counter()
+        spans = detect_speech(audio=path)
+        chunks = pack_speech(spans=spans)
+        files = write_chunks(path=path, chunks=chunks)
+        seconds = time.perf_counter() - start
+
+        sent = speech_seconds([span for chunk in chunks for span in chunk])
+        print(
+            f"vad    {len(files):4d} chunks, {sent:7.0f} s sent "
+            f"({seconds:.2f} s to detect and write)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Words/second of WordService.upload_new_words with local stand-ins.
+
+The picture downloader, Google Vision, gTTS, MinIO, Chroma, the database and the
+Redis lease are replaced by fakes that sleep for a fixed latency (blocking fakes for the sync
+clients), so only the scheduling of the enrichment stage is measured.
+
+Usage: python -m benchmarks.bench_word_enrichment --words 300 --concurrency 8
+"""
+
+import time
+import asyncio
+import argparse
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.services import audio_service, censore_service, image_service
+from src.services import minio_uploader
+from src.services.word_service import WordService
+
+
+DOWNLOAD_SECONDS = 0.20
+VISION_SECONDS = 0.15
+TTS_SECONDS = 0.10
+MINIO_SECONDS = 0.05
+SUBTOPIC_SECONDS = 0.05
+DB_SECONDS = 0.01
+
+
+async def get_image_data(word):
+    await asyncio.sleep(DOWNLOAD_SECONDS)
+    return b"\xff\xd8" + word.encode()
+
+
+class FakeVision:
+    @staticmethod
+    def safe_search_detection(image):
+        time.sleep(VISION_SECONDS)
+        return SimpleNamespace(
+            safe_search_annotation=SimpleNamespace(
+                adult=0, medical=0, violence=0, racy=0
+            )
+        )
+
+
+class FakeMinio:
+    @staticmethod
+    def put_object(**kwargs):
+        time.sleep(MINIO_SECONDS)
+
+
+class FakeTTS:
+    def __init__(self, text, lang, slow):
+        self.text = text
+
+    def write_to_fp(self, fp):
+        time.sleep(TTS_SECONDS)
+        fp.write(self.text.encode())
+
+
+class FakeSubtopicService:
+    @staticmethod
+    async def get_word_subtopic(word):
+        await asyncio.to_thread(time.sleep, SUBTOPIC_SECONDS)
+        return SimpleNamespace(title="Other", topic_title="Other")
+
+
+class FakeWordRepository:
+    def __init__(self):
+        self.id = 0
+
+    async def get_one(self, filters):
+        return None
+
+    async def add_one_if_absent(self, data, index_elements):
+        await asyncio.sleep(DB_SECONDS)
+        self.id += 1
+        return SimpleNamespace(id=self.id, **data)
+
+
+class FakeSingleFlight:
+    @staticmethod
+    async def run(key, producer, lookup):
+        return await producer()
+
+
+async def run(words, concurrency):
+    word_service = WordService(
+        repo=FakeWordRepository(), single_flight=FakeSingleFlight()
+    )
+
+    start = time.perf_counter()
+    uploaded = await word_service.upload_new_words(
+        words=words, subtopic_service=FakeSubtopicService(), concurrency=concurrency
+    )
+    seconds = time.perf_counter() - start
+
+    assert all(word for word, _ in uploaded.values())
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--words", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    words = {f"word{i}": f"слово{i}" for i in range(args.words)}
+    serial_seconds = args.words * (
+        DOWNLOAD_SECONDS
+        + VISION_SECONDS
+        + TTS_SECONDS
+        + 2 * MINIO_SECONDS
+        + SUBTOPIC_SECONDS
+        + DB_SECONDS
+    )
+
+    with patch.object(
+        image_service.ImageDownloader, "get_image_data", get_image_data
+    ), patch.object(censore_service, "google_vision", FakeVision), patch.object(
+        minio_uploader, "mc", FakeMinio
+    ), patch.object(
+        audio_service, "gTTS", FakeTTS
+    ):
+        one_seconds = asyncio.run(run(words=words, concurrency=1))
+        many_seconds = asyncio.run(run(words=words, concurrency=args.concurrency))
+
+    print(f"words:           {args.words}")
+    print(f"serial (before): {args.words / serial_seconds:8.1f} words/s")
+    print(f"concurrency   1: {args.words / one_seconds:8.1f} words/s")
+    print(
+        f"concurrency {args.concurrency:>3}: {args.words / many_seconds:8.1f} words/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Rows loaded and payload size of /api/v1/user/topics and /words/study reads,
+with the models' default lazy="selectin" graph vs the services' load plans.
+
+The reads run against an in-memory SQLite copy of the schema seeded with
+--users users sharing a vocabulary of --words words (each with --per-user
+words and --stop-list stop-listed words), so this needs no Postgres.
+
+Usage: python -m benchmarks.report_load_plans --users 200 --words 1000 --per-user 300 --stop-list 50
+"""
+
+import json
+import random
+import argparse
+from typing import Callable, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session
+
+from src.database.db_config import Base
+from src.database.models import SubTopic, Topic, User, UserWord, UserWordStopList, Word
+from src.services.user_word_service import PICTURES_PLAN, USER_WORD_PLAN
+from src.utils.load_plan import NO_RELATIONSHIPS, LoadPlan
+
+
+def seed(
+    session: Session, users: int, words: int, per_user: int, stop_list: int
+) -> None:
+    topics = [Topic(title=f"topic {i}") for i in range(10)]
+    subtopics = [
+        SubTopic(title=f"subtopic {i}", topic_title=f"topic {i % 10}")
+        for i in range(100)
+    ]
+    session.add_all(topics + subtopics)
+    session.flush()
+
+    session.add_all(
+        Word(
+            id=i,
+            enValue=f"Word {i}",
+            ruValue=f"Слово {i}",
+            pictureLink=f"https://minio/pictures/{i}.jpg",
+            audioLink=f"https://minio/audio/{i}.mp3",
+            topic=f"topic {i % 10}",
+            subtopic=f"subtopic {i % 100}",
+        )
+        for i in range(words)
+    )
+    session.flush()
+
+    session.add_all(User(id=user_id, provider="google") for user_id in range(users))
+    session.flush()
+
+    for user_id in range(users):
+        sample = random.sample(range(words), per_user + stop_list)
+        session.add_all(
+            UserWord(user_id=user_id, word_id=word_id, frequency=1, progress=0)
+            for word_id in sample[:per_user]
+        )
+        session.add_all(
+            UserWordStopList(user_id=user_id, word_id=word_id)
+            for word_id in sample[per_user:]
+        )
+    session.commit()
+
+
+def select_with(model, plan: Optional[LoadPlan]):
+    return plan.select(model) if plan else select(model)
+
+
+def read_all(session: Session, stmt, plan: Optional[LoadPlan]) -> list:
+    res = session.execute(stmt)
+    if plan and plan.is_projection:
+        rows = res.all()
+        # projected rows never reach the "load" event
+        session.info["rows"] = session.info.get("rows", 0) + len(rows)
+        return rows
+    return res.scalars().all()
+
+
+def topics(session: Session, optimized: bool):
+    plan = USER_WORD_PLAN if optimized else None
+    user_words = read_all(
+        session,
+        select_with(UserWord, plan)
+        .filter(UserWord.user_id == 0)
+        .order_by(UserWord.frequency.desc()),
+        plan,
+    )
+
+    plan = NO_RELATIONSHIPS if optimized else None
+    read_all(session, select_with(SubTopic, plan), plan)
+
+    # the response is List[TopicWords], its size does not depend on the plan
+    return [(uw.word.topic, uw.word.subtopic, uw.progress) for uw in user_words]
+
+
+def study(session: Session, optimized: bool):
+    filters = [UserWord.user_id == 0]
+
+    if optimized:
+        stmt = PICTURES_PLAN.select(UserWord).filter(
+            *filters, UserWord.word_id == Word.id
+        )
+        read_all(session, stmt, PICTURES_PLAN)
+    else:
+        read_all(session, select(UserWord).filter(*filters), None)
+
+    plan = USER_WORD_PLAN if optimized else None
+    user_words = read_all(
+        session,
+        select_with(UserWord, plan).filter(*filters).order_by(UserWord.progress.desc()),
+        plan,
+    )
+
+    return [user_word.__dict__ for user_word in user_words[:20]]
+
+
+def measure(engine, read: Callable, optimized: bool) -> str:
+    statements, loaded = [], []
+
+    def on_execute(*args):
+        statements.append(1)
+
+    def on_load(target, context):
+        loaded.append(1)
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    event.listen(Base, "load", on_load, propagate=True)
+    try:
+        with Session(engine) as session:
+            payload = read(session, optimized)
+            rows = len(loaded) + session.info.get("rows", 0)
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+        event.remove(Base, "load", on_load)
+
+    size = len(json.dumps(jsonable_encoder(payload), default=str))
+
+    return f"{len(statements):>3} queries, {rows:>7} rows, " f"payload {size:>8} B"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--words", type=int, default=1000)
+    parser.add_argument("--per-user", type=int, default=300)
+    parser.add_argument("--stop-list", type=int, default=50)
+    args = parser.parse_args()
+
+    random.seed(0)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        seed(session, args.users, args.words, args.per_user, args.stop_list)
+
+    reads: List = [("/api/v1/user/topics", topics), ("/api/v1/user/words/study", study)]
+    for endpoint, read in reads:
+        print(f"{endpoint:<26} selectin: {measure(engine, read, False)}")
+        print(f"{'':<26} plan:     {measure(engine, read, True)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,14 @@
 import logging
-from datetime import datetime
+from typing import List
 from asgiref.sync import async_to_sync
-from dateutil.relativedelta import relativedelta
 
 from src.config.celery_app import app
 
-from src.config.instance import (
-    ALLOWED_AUDIO_SECONDS,
-    ALLOWED_VIDEO_SECONDS,
-    DEFAULT_ENERGY,
-)
-from src.database.models import Subscription
-from src.services.subscription_service import SubscriptionService
 from src.services.user_service import UserService
-from src.services.email_service import EmailService
-from src.utils.dependenes.sub_service_fabric import sub_service_fabric
+from src.services.notification_service import NotificationService
+from src.utils.dependenes.notification_service_fabric import (
+    notification_service_fabric,
+)
 from src.utils.dependenes.user_service_fabric import user_service_fabric
 from src.utils.logger import scheduled_tasks_logger
 
@@ -31,21 +25,9 @@ def check_sub_receiver():
     scheduled_tasks_logger.info("[CHECK SUB] Completed")
 
 
-async def check_sub(
-    user_service: UserService = user_service_fabric(),
-    sub_service: SubscriptionService = sub_service_fabric(),
-):
-    users = await user_service.get_users_with_sub()
-
-    for user in users:
-        sub: Subscription = await sub_service.get_sub_by_id(id=user.subscription_type)
-
-        date: datetime = user.subscription_acquisition
-
-        if date + relativedelta(months=sub.months) > datetime.now():
-            await user_service.update_user(
-                user_id=user.id, user_data={"subscription_type": None}
-            )
+async def check_sub(user_service: UserService = user_service_fabric()):
+    expired = await user_service.expire_subscriptions()
+    scheduled_tasks_logger.info(f"[CHECK SUB] Expired {expired} subscriptions")
 
 
 @app.task(name="reset_limits")
@@ -56,17 +38,8 @@ def reset_limits_receiver():
 
 
 async def reset_limits(user_service: UserService = user_service_fabric()):
-    users = await user_service.get_users_without_sub()
-
-    for user in users:
-        await user_service.update_user(
-            user_id=user.id,
-            user_data={
-                "allowed_audio_seconds": ALLOWED_AUDIO_SECONDS,
-                "allowed_video_seconds": ALLOWED_VIDEO_SECONDS,
-                "energy": DEFAULT_ENERGY,
-            },
-        )
+    reset = await user_service.reset_limits()
+    scheduled_tasks_logger.info(f"[RESET LIMITS] Reset {reset} users")
 
 
 @app.task(name="send_notifications")
@@ -76,22 +49,20 @@ def send_notifications_receiver():
     scheduled_tasks_logger.info("[SEND NOTIFICATIONS] Completed")
 
 
-async def send_notifications(user_service: UserService = user_service_fabric()):
-    users = await user_service.get_users()
-
-    now = datetime.now()
+async def send_notifications(
+    notification_service: NotificationService = notification_service_fabric(),
+):
+    batches = 0
 
-    for user in users:
-        if not user.latest_study:
-            continue
+    async for recipients in notification_service.iter_streak_recipients():
+        send_notification_batch.delay(recipients)
+        batches += 1
 
-        latest_study: datetime = user.latest_study
+    scheduled_tasks_logger.info(f"[SEND NOTIFICATIONS] Queued {batches} batches")
 
-        time_delta = now - latest_study
 
-        if time_delta.days == 1:
-            EmailService.send_email(
-                email=user.email,
-                theme="Uwords - Stroke Days",
-                text=f"Hello, Dear {user.username}!\n\nTime to learn! Otherwise your progress will be reset!",
-            )
+@app.task(name="send_notification_batch")
+def send_notification_batch(recipients: List[List[str]]):
+    stats = NotificationService.send_streak_batch(recipients=recipients)
+    NotificationService.record_stats(stats=stats)
+    scheduled_tasks_logger.info(f"[SEND NOTIFICATIONS] Batch: {stats}")
@@ -1,19 +1,19 @@
 import os
+import shutil
+import tempfile
 from typing import Dict
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 
-from librosa import get_duration
 from asgiref.sync import async_to_sync
-from concurrent.futures import ThreadPoolExecutor
 from celery.exceptions import MaxRetriesExceededError
 
 from src.config.celery_app import app
-
-from src.config.instance import METRIC_URL
+from src.config.instance import AUDIO_TEMP_FILES, UPLOAD_DIR
 from src.schemes.error_schemas import ErrorCreate
 
 from src.services.text_service import TextService
+from src.services.translation_cache import TranslationCache
 from src.services.audio_service import AudioService
 from src.services.email_service import EmailService
 from src.services.error_service import ErrorService
@@ -27,8 +27,13 @@ from src.services.user_word_service import UserWordService
 from src.services.user_achievement_service import UserAchievementService
 from src.services.user_word_stop_list_service import UserWordStopListService
 
-from src.utils.metric import send_user_data
-from src.utils.helpers import get_allowed_iterations_and_metric_data
+from src.utils.audio import audio_seconds, speech_seconds
+from src.utils.metric import metric_client
+from src.utils.unit_of_work import UnitOfWork
+from src.utils.helpers import (
+    get_allowed_iterations_and_metric_data,
+    get_max_decode_seconds,
+)
 from src.utils.dependenes.sub_service_fabric import sub_service_fabric
 from src.utils.dependenes.user_service_fabric import user_service_fabric
 from src.utils.dependenes.word_service_fabric import word_service_fabric
@@ -36,6 +41,7 @@ from src.utils.dependenes.error_service_fabric import error_service_fabric
 from src.utils.dependenes.user_word_fabric import user_word_service_fabric
 from src.utils.dependenes.payment_service_fabric import payment_service_fabric
 from src.utils.dependenes.chroma_service_fabric import subtopic_service_fabric
+from src.utils.dependenes.translation_cache_fabric import translation_cache_fabric
 from src.utils.dependenes.user_achievement_fabric import user_achievement_service_fabric
 from src.utils.dependenes.user_word_stop_list_service_fabric import (
     user_word_stop_list_service_fabric,
@@ -102,12 +108,24 @@ def process_text_task(self, text: str, user_id: int):
         return "Возникла ошибка загрузки текста"
 
 
-async def auto_check_payment(
+async def auto_check_payment(user_id: int, pay_id: str) -> Dict[str, int]:
+    # the bill and the user subscription are committed together or not at all
+    async with UnitOfWork() as uow:
+        return await complete_payment(
+            user_id=user_id,
+            pay_id=pay_id,
+            user_service=user_service_fabric(uow=uow),
+            payment_service=payment_service_fabric(uow=uow),
+            sub_service=sub_service_fabric(uow=uow),
+        )
+
+
+async def complete_payment(
     user_id: int,
     pay_id: str,
-    user_service: UserService = user_service_fabric(),
-    payment_service: PaymentService = payment_service_fabric(),
-    sub_service: SubscriptionService = sub_service_fabric(),
+    user_service: UserService,
+    payment_service: PaymentService,
+    sub_service: SubscriptionService,
 ) -> Dict[str, int]:
     user = await user_service.get_user_by_id(user_id=user_id)
 
@@ -161,9 +179,21 @@ async def process_youtube(
         link=link, error_service=error_service, user_id=user_id
     )
 
-    return await general_process_audio(
-        file_path=file_path.__str__(), type="video", title=title, user_id=user_id
-    )
+    try:
+        return await general_process_audio(
+            file_path=file_path.__str__(), type="video", title=title, user_id=user_id
+        )
+    finally:
+        # a retry downloads the video again
+        if file_path:
+            remove_upload(path=file_path)
+
+
+def remove_upload(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError as e:
+        celery_tasks_logger.error(f"[REMOVE UPLOAD] Error: {e}")
 
 
 @app.task(bind=True, name="process_audio", max_retries=2)
@@ -177,9 +207,11 @@ def process_audio_task(self, path: str, title: str, user_id: int):
         if not result:
             raise self.retry(countdown=5)
 
+        remove_upload(path=path)
         return "Загрузка аудио окончена"
 
     except MaxRetriesExceededError:
+        remove_upload(path=path)
         return "Возникла ошибка загрузки аудио"
 
 
@@ -195,50 +227,62 @@ async def general_process_audio(
     error_service: ErrorService = error_service_fabric(),
     user_achievement_service: UserAchievementService = user_achievement_service_fabric(),
     user_word_stop_list_service: UserWordStopListService = user_word_stop_list_service_fabric(),
+    translation_cache: TranslationCache = translation_cache_fabric(),
 ):
     celery_tasks_logger.info(
         f"[GENERAL PROCESS AUDIO] Processing file at path: {file_path}"
     )
 
+    # chunks stay in memory unless temp files are turned on
+    workdir = tempfile.mkdtemp(dir=UPLOAD_DIR) if AUDIO_TEMP_FILES else None
+
     try:
-        files_paths = [file_path]
         user = await user_service.get_user_by_id(user_id=user_id)
 
-        extension = file_path.split(".")[-1]
-
-        if extension != "wav":
-            converted_file = await AudioService.convert_audio(
-                path=file_path,
-                title=title,
-                error_service=error_service,
-                user_id=user_id,
-            )
-
-            files_paths.append(converted_file)
+        audio = await AudioService.decode_audio(
+            path=file_path,
+            title=title,
+            error_service=error_service,
+            user_id=user_id,
+            directory=workdir,
+            max_seconds=get_max_decode_seconds(type=type, user=user),
+        )
+        if audio is None:
+            return False
 
-        else:
-            converted_file = file_path
+        duration = audio_seconds(audio)
 
-        celery_tasks_logger.info(f"[GENERAL PROCESS AUDIO] files_paths: {files_paths}")
-        celery_tasks_logger.info(
-            f"[GENERAL PROCESS AUDIO] converted_file: {converted_file}"
+        # quota and metrics count speech, silence is neither charged nor sent
+        spans = await AudioService.detect_speech(
+            audio=audio, error_service=error_service, user_id=user_id
         )
+        if spans == []:
+            celery_tasks_logger.info("[GENERAL PROCESS AUDIO] No speech found")
+
+            error = ErrorCreate(
+                user_id=user_id,
+                message="[VAD] В аудио не найдена речь!",
+                description=f"{title}: {duration:.0f} s",
+            )
+            await error_service.add_one(error=error)
+            return True
 
-        duration = get_duration(path=converted_file)
+        speech_duration = duration if spans is None else speech_seconds(spans)
 
         allowed_iterations, user_data, metric_data = (
             await get_allowed_iterations_and_metric_data(
-                type=type, user=user, duration=int(duration)
+                type=type, user=user, duration=int(speech_duration)
             )
         )
 
         if user_data:
             await user_service.update_user(user_id=user.id, user_data=user_data)
 
-        await send_user_data(data=metric_data, server_url=METRIC_URL)
+        metric_client.send(data=metric_data)
 
-        await user_service.check_user_achievemets(
+        await user_service.apply_achievement_event(
             user_id=user_id,
+            event=metric_data,
             user_achievement_service=user_achievement_service,
         )
 
@@ -246,65 +290,30 @@ async def general_process_audio(
             celery_tasks_logger.info("[GENERAL PROCESS AUDIO] Seconds limits ran out")
             return True
 
-        cutted_files = await AudioService.cut_audio(
-            path=converted_file,
+        chunks = await AudioService.cut_audio(
+            audio=audio,
             error_service=error_service,
             user_id=user_id,
             duration=duration,
             allowed_iterations=allowed_iterations,
+            spans=spans,
         )
 
-        files_paths += cutted_files
-        with ThreadPoolExecutor(max_workers=20) as executor:
-            try:
-                results_ru = list(
-                    executor.map(AudioService.speech_to_text_ru, cutted_files)
-                )
-            except Exception as e:
-                celery_tasks_logger.error(f"[STT RU] Error {e}")
-
-                error = ErrorCreate(
-                    user_id=user_id, message="[STT RU] ERROR", description=str(e)
-                )
-
-                await error_service.add_one(error=error)
-
-        with ThreadPoolExecutor(max_workers=20) as executor:
-            try:
-                results_en = list(
-                    executor.map(AudioService.speech_to_text_en, cutted_files)
-                )
-
-            except Exception as e:
-                celery_tasks_logger.error(f"[STT EN] Error {e}")
-
-                error = ErrorCreate(
-                    user_id=user_id, message="[STT EN] ERROR", description=str(e)
-                )
-
-                await error_service.add_one(error=error)
-
-        text_ru = " ".join(result for result in results_ru if result.strip())
-        text_en = " ".join(result for result in results_en if result.strip())
+        # one language once the first chunks show which, both when unsure
+        text = await AudioService.transcribe(
+            chunks=chunks, error_service=error_service, user_id=user_id
+        )
 
-        if len(text_ru) == 0 and len(text_en) == 0:
+        if len(text) == 0:
             return False
 
-        if len(text_ru) > len(text_en):
-            text = text_ru
-        else:
-            text = text_en
-
         celery_tasks_logger.info(f"[GENERAL PROCESS AUDIO] Recognized text: {text}")
 
-        # for file_path in files_paths:
-        #     try:
-        #         os.remove(path=file_path)
-        #     except:
-        #         continue
-
         translated_words = await TextService.get_translated_clear_text(
-            text, error_service, user_id
+            text=text,
+            error_service=error_service,
+            user_id=user_id,
+            translation_cache=translation_cache,
         )
         await user_word_service.upload_user_words(
             user_words=translated_words,
@@ -325,6 +334,12 @@ async def general_process_audio(
     except Exception as e:
         celery_tasks_logger.error(f"[GENERAL PROCESS AUDIO] Error: {e}")
         return False
+    finally:
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        # the event loop of async_to_sync ends with this call
+        await metric_client.close()
 
 
 async def process_text(
@@ -337,11 +352,15 @@ async def process_text(
     error_service: ErrorService = error_service_fabric(),
     user_achievement_service: UserAchievementService = user_achievement_service_fabric(),
     user_word_stop_list_service: UserWordStopListService = user_word_stop_list_service_fabric(),
+    translation_cache: TranslationCache = translation_cache_fabric(),
 ):
     try:
         user = await user_service.get_user_by_id(user_id=user_id)
         translated_words = await TextService.get_translated_clear_text(
-            text=text, error_service=error_service, user_id=user_id
+            text=text,
+            error_service=error_service,
+            user_id=user_id,
+            translation_cache=translation_cache,
         )
         await user_word_service.upload_user_words(
             user_words=translated_words,
@@ -360,3 +379,5 @@ async def process_text(
     except Exception as e:
         celery_tasks_logger.error(f"[PROCESS Text] Error: {e}")
         return False
+    finally:
+        await metric_client.close()
@@ -1,7 +1,9 @@
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_init, worker_process_init
 
 from src.config.instance import REDIS_URL
+from src.database.db_config import configure_engine
 
 
 app = Celery(
@@ -13,6 +15,14 @@ app = Celery(
 
 app.autodiscover_tasks()
 
+
+@worker_init.connect
+@worker_process_init.connect
+def init_worker_engine(**kwargs):
+    # tasks run their coroutines through async_to_sync, i.e. a new loop per task
+    configure_engine(pooled=False)
+
+
 app.conf.timezone = "UTC"
 app.conf.beat_schedule = {
     "reset-limits": {
@@ -150,6 +150,15 @@ USER_SUB_DESCRIPTION = """\
 Нужен админ-доступ. Метод, начисляющий подписку пользователю вручную\
 """
 
+DB_POOL_STATS_TITLE = """\
+Состояние пула соединений с БД\
+"""
+
+DB_POOL_STATS_DESCRIPTION = """\
+Нужен админ-доступ. Метод, возвращающий размер пула соединений процесса, \
+число занятых и свободных соединений и переполнение\
+"""
+
 SEND_CODE_TITLE = """\
 Отправить код на почту
 """
@@ -13,12 +13,25 @@ POSTGRES_HOST: str = os.environ.get("POSTGRES_HOST")
 POSTGRES_PORT: str = os.environ.get("POSTGRES_PORT")
 POSTGRES_USER: str = os.environ.get("POSTGRES_USER")
 POSTGRES_PASSWORD: str = os.environ.get("POSTGRES_PASSWORD")
+DB_BULK_CHUNK_SIZE: int = 1000  # rows per bulk statement
+DB_MAX_QUERY_PARAMS: int = 32767  # asyncpg bind parameter limit
+DB_STREAM_PAGE_SIZE: int = 1000  # rows per keyset page of a table scan
+DB_UPDATE_BATCH_SIZE: int = 5000  # rows per transaction of a set-based update
+DB_POOL_ENABLED: bool = os.environ.get("DB_POOL_ENABLED", "true").lower() == "true"
+DB_POOL_SIZE: int = int(os.environ.get("DB_POOL_SIZE", 10))
+DB_POOL_MAX_OVERFLOW: int = int(os.environ.get("DB_POOL_MAX_OVERFLOW", 20))
+DB_POOL_TIMEOUT: int = 30  # seconds
+DB_POOL_RECYCLE: int = 1800  # seconds
+DB_POOL_PRE_PING: bool = True
 
 # REDIS
 REDIS_URL: str = os.environ.get("REDIS_URL")
 REDIS_HOST: str = os.environ.get("REDIS_HOST")
 REDIS_PORT: str = os.environ.get("REDIS_PORT")
 REDIS_PASS: str = os.environ.get("REDIS_PASS")
+PUBSUB_READY_TIMEOUT: float = 5  # seconds a listener waits for the subscription
+PUBSUB_QUEUE_SIZE: int = 100  # undelivered messages kept per listener
+PUBSUB_RECONNECT_DELAY: float = 1  # first retry delay, doubled up to 30s
 
 # MINIO
 MINIO_ENDPOINT: str = os.environ.get("MINIO_ENDPOINT")
@@ -92,12 +105,26 @@ DEFAULT_SUBTOPIC_ICON: str = (
 
 ALLOWED_AUDIO_SECONDS: int = 1800
 ALLOWED_VIDEO_SECONDS: int = 900
+AUDIO_SAMPLE_RATE: int = 16000  # uploads are decoded to mono PCM at this rate
+AUDIO_MAX_SECONDS: int = int(
+    os.environ.get("AUDIO_MAX_SECONDS", 3600)
+)  # decoded for users without a subscription
+AUDIO_DECODE_SLACK: float = 2  # seconds decoded per second of speech allowed
+AUDIO_TEMP_FILES: bool = os.environ.get("AUDIO_TEMP_FILES", "false").lower() == "true"
+AUDIO_SEGMENT_SECONDS: int = 30  # length of a chunk sent to speech recognition
+AUDIO_VAD_FRAME_MS: int = 30
+AUDIO_VAD_MARGIN_DB: float = 12  # speech rises this far above the noise floor
+AUDIO_VAD_MIN_DB: float = -55  # dBFS, quieter frames are never speech
+AUDIO_VAD_MIN_SILENCE: float = 0.4  # seconds, shorter pauses do not split speech
+AUDIO_VAD_MIN_SPEECH: float = 0.2  # seconds
+AUDIO_VAD_PADDING: float = 0.15  # seconds kept around each speech span
 DEFAULT_ENERGY: int = 100
 
 ACHIEVEMENT_WORDS: str = "added_words"
 ACHIEVEMENT_LEARNED: str = "learned_words"
 ACHIEVEMENT_AUDIO: str = "speech_seconds"
 ACHIEVEMENT_VIDEO: str = "video_seconds"
+ACHIEVEMENT_CATALOG_TTL: int = 300  # seconds
 
 # TOKEN SETTINGS
 JWT_ALGORITHM: str = "HS256"
@@ -116,6 +143,12 @@ SMTP_SERVER: str = os.environ.get("SMTP_SERVER")
 SENDER_EMAIL: str = os.environ.get("SENDER_EMAIL")
 EMAIL_PASSWORD: str = os.environ.get("EMAIL_PASSWORD")
 EMAIL_CODE_LEN: int = 4
+EMAIL_USE_SSL: bool = os.environ.get("EMAIL_USE_SSL", "true").lower() == "true"
+# messages per second per worker process, 0 disables the limit
+SMTP_RATE_LIMIT: float = float(os.environ.get("SMTP_RATE_LIMIT", 5))
+SMTP_IDLE_TIMEOUT: int = 60  # seconds before a reused connection is NOOP-checked
+NOTIFICATION_BATCH_SIZE: int = 500  # recipients per Celery delivery task
+NOTIFICATION_STATS_TTL: int = 7 * 24 * 60 * 60
 TELEGRAM_CODE_LEN: int = 12
 
 # VK
@@ -132,6 +165,18 @@ os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = GOOGLE_APPLICATION_CREDENTIALS.__
 # METRIC
 METRIC_URL: str = os.environ.get("METRIC_URL")
 METRIC_TOKEN: str = os.environ.get("METRIC_TOKEN")
+METRIC_BATCH_SIZE: int = 200  # users buffered before an early flush
+METRIC_FLUSH_INTERVAL: float = 2  # seconds
+METRIC_MAX_RETRIES: int = 3
+METRIC_RETRY_DELAY: float = 0.5  # seconds, doubled on every retry
+METRIC_POOL_SIZE: int = 20
+METRIC_TIMEOUT: float = 5  # seconds
+METRIC_SPOOL_DIR: Path = Path(
+    os.environ.get("METRIC_SPOOL_DIR", BASE_DIR / "metric_spool")
+)
+METRIC_CACHE_TTL: int = 30  # seconds a cached metric is fresh
+METRIC_CACHE_STALE_TTL: int = 600  # seconds a stale metric is still served
+METRIC_CACHE_REFRESH_LEASE: int = 10000  # milliseconds
 
 # DOWNLOADER
 DOWNLOADER_URL: str = os.environ.get("DOWNLOADER_URL")
@@ -144,8 +189,38 @@ WALLET_ID: str = os.environ.get("WALLET_ID")
 # HUGGINGFACE
 TRANSLATION_RU_EN: str = "Helsinki-NLP/opus-mt-ru-en"
 TRANSLATION_EN_RU: str = "Helsinki-NLP/opus-mt-en-ru"
+TRANSLATION_BATCH_SIZE: int = 32
+TRANSLATION_MAX_LENGTH: int = 50
+TRANSLATION_NUM_BEAMS: int = 5
+TRANSLATION_CACHE_SIZE: int = 50000
+TRANSLATION_CACHE_TTL: int = 604800  # seconds
+LEMMA_CACHE_SIZE: int = 200000
+WORD_ENRICHMENT_CONCURRENCY: int = 8  # new words enriched at once
+SINGLE_FLIGHT_LEASE_TTL: int = 60000  # milliseconds
+SINGLE_FLIGHT_WAIT_TIMEOUT: float = 90  # seconds
+SINGLE_FLIGHT_EMPTY_TTL: int = 300000  # milliseconds a "no result" is remembered
+# milliseconds a failed producer keeps followers from retrying; short, so a
+# transient API error does not block the key for everyone
+SINGLE_FLIGHT_ERROR_TTL: int = 5000
+SINGLE_FLIGHT_POLL_INTERVAL: float = 0.25  # seconds
+TEXT_STREAM_MEMORY_LIMIT: int = int(
+    os.environ.get("TEXT_STREAM_MEMORY_LIMIT", 16 * 1024 * 1024)
+)  # bytes
+TEXT_STREAM_CHUNK_SIZE: int = TEXT_STREAM_MEMORY_LIMIT // 16  # chars
+TEXT_STREAM_THRESHOLD: int = 4 * TEXT_STREAM_CHUNK_SIZE  # chars
 
 HUGGING_FACE_URL: str = (
     "https://api-inference.huggingface.co/models/openai/whisper-large-v2"
 )
 HUGGING_FACE_TOKEN: str = os.environ.get("HUGGING_FACE_TOKEN")
+
+# SPEECH RECOGNITION
+STT_BACKEND: str = os.environ.get("STT_BACKEND", "google")  # see speech_service
+STT_LANGUAGES: tuple = ("ru-RU", "en-US")
+STT_PROBE_CHUNKS: int = 2  # chunks recognized in every language
+STT_PROBE_SHARE: float = 0.7  # score share a language needs to win the probe
+STT_WORKERS: int = 20
+STT_WHISPER_MODEL: str = os.environ.get("STT_WHISPER_MODEL", "small")
+STT_WHISPER_THREADS: int = int(os.environ.get("STT_WHISPER_THREADS", 4))
+STT_WHISPER_BATCH_SIZE: int = 8  # chunks decoded in one forward pass
+STT_FAKE_LATENCY: float = float(os.environ.get("STT_FAKE_LATENCY", 0))  # seconds
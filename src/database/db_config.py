@@ -1,10 +1,18 @@
+from typing import Dict, Union
+
 from sqlalchemy import MetaData
 from sqlalchemy.pool import NullPool
 from sqlalchemy.ext.declarative import DeclarativeMeta
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 
 from src.config.instance import (
+    DB_POOL_ENABLED,
+    DB_POOL_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
     POSTGRES_DB,
     POSTGRES_HOST,
     POSTGRES_PORT,
@@ -18,7 +26,54 @@ Base: DeclarativeMeta = declarative_base()
 
 metadata = MetaData()
 
-engine = create_async_engine(DATABASE_URL, poolclass=NullPool)
+
+def create_engine(pooled: bool = DB_POOL_ENABLED) -> AsyncEngine:
+    if not pooled:
+        return create_async_engine(DATABASE_URL, poolclass=NullPool)
+
+    return create_async_engine(
+        DATABASE_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_POOL_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+
+
+engine = create_engine()
 async_session_maker: AsyncSession = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
+
+
+def configure_engine(pooled: bool) -> None:
+    """Replaces the engine of this process, e.g. in a freshly forked worker.
+
+    Pooled asyncpg connections are bound to the event loop that opened them, so
+    processes that run every task in a new loop (Celery) must not pool.
+    """
+    global engine
+
+    engine.sync_engine.dispose(close=False)
+    engine = create_engine(pooled=pooled)
+    async_session_maker.configure(bind=engine)
+
+
+async def dispose_engine() -> None:
+    await engine.dispose()
+
+
+def pool_stats() -> Dict[str, Union[bool, int]]:
+    pool = engine.pool
+
+    if isinstance(pool, NullPool):
+        return {"pooled": False}
+
+    return {
+        "pooled": True,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
@@ -1,6 +1,16 @@
 from datetime import datetime
 from sqlalchemy.orm import relationship
-from sqlalchemy import Boolean, Column, Float, Integer, String, ForeignKey, DateTime
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Float,
+    Integer,
+    String,
+    ForeignKey,
+    DateTime,
+    Index,
+    UniqueConstraint,
+)
 
 from src.config.instance import (
     ALLOWED_AUDIO_SECONDS,
@@ -30,6 +40,11 @@ class SubTopic(Base):
 
 class Word(Base):
     __tablename__ = "word"
+    __table_args__ = (
+        UniqueConstraint("enValue", name="uq_word_en_value"),
+        Index("ix_word_ru_value", "ruValue"),
+        Index("ix_word_topic_subtopic", "topic", "subtopic"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     enValue = Column(String)
@@ -46,6 +61,10 @@ class Word(Base):
 
 class UserWord(Base):
     __tablename__ = "user_word"
+    __table_args__ = (
+        UniqueConstraint("user_id", "word_id", name="uq_user_word_user_id_word_id"),
+        Index("ix_user_word_word_id", "word_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     word_id = Column(Integer, ForeignKey(Word.id))
@@ -79,6 +98,7 @@ class Subscription(Base):
 
 class User(Base):
     __tablename__ = "user"
+    __table_args__ = (Index("uq_user_uwords_uid", "uwords_uid", unique=True),)
 
     id = Column(Integer, primary_key=True, index=True)
     uwords_uid = Column(String, nullable=True)
@@ -125,6 +145,7 @@ class User(Base):
 
 class Error(Base):
     __tablename__ = "error"
+    __table_args__ = (Index("ix_error_user_id_id", "user_id", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer)
@@ -146,6 +167,7 @@ class Feedback(Base):
 
 class Bill(Base):
     __tablename__ = "bill"
+    __table_args__ = (Index("uq_bill_label", "label", unique=True),)
 
     id = Column(Integer, primary_key=True, index=True)
     label = Column(String)
@@ -172,6 +194,15 @@ class Achievement(Base):
 
 class UserAchievement(Base):
     __tablename__ = "user_achievement"
+    __table_args__ = (
+        Index(
+            "uq_user_achievement_user_id_achievement_id",
+            "user_id",
+            "achievement_id",
+            unique=True,
+        ),
+        Index("ix_user_achievement_achievement_id", "achievement_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey(User.id))
@@ -187,6 +218,9 @@ class UserAchievement(Base):
 
 class UserWordStopList(Base):
     __tablename__ = "user_word_stop_list"
+    __table_args__ = (
+        Index("ix_user_word_stop_list_user_id_word_id", "user_id", "word_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey(User.id))
@@ -1,6 +1,10 @@
 import redis
+import redis.asyncio
 
 from src.config.instance import REDIS_HOST, REDIS_PORT, REDIS_PASS
 
 
 redis_connection = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, password=REDIS_PASS)
+async_redis_connection = redis.asyncio.Redis(
+    host=REDIS_HOST, port=REDIS_PORT, password=REDIS_PASS
+)
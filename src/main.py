@@ -1,4 +1,5 @@
 import sentry_sdk
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -15,16 +16,27 @@ from src.routers.achievement_router import achievement_router_v1
 
 from src.config.instance import ALLOWED_ORIGINS_LIST, SENTRY_URL
 from src.config.fastapi_docs_config import TAGS_METADATA
+from src.database.db_config import dispose_engine
+from src.utils.metric import METRIC_CACHE_AGE_HEADER, metric_client
 
 sentry_sdk.init(
     dsn=SENTRY_URL,
     traces_sample_rate=1.0,
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await metric_client.close()
+    await dispose_engine()
+
+
 app = FastAPI(
     title="UWords FastAPI",
     description="API of UWords - application for learning English",
     openapi_tags=TAGS_METADATA,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -33,6 +45,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[METRIC_CACHE_AGE_HEADER],
 )
 
 app.include_router(user_router_v1)
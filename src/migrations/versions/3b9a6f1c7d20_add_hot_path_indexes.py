@@ -0,0 +1,85 @@
+"""add hot path indexes
+
+Revision ID: 3b9a6f1c7d20
+Revises: 8e5f0b6c2d41
+Create Date: 2026-10-18 15:25:33
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b9a6f1c7d20"
+down_revision: Union[str, None] = "8e5f0b6c2d41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, unique)
+INDEXES = [
+    ("ix_user_word_word_id", "user_word", ["word_id"], False),
+    ("ix_word_ru_value", "word", ["ruValue"], False),
+    ("ix_word_topic_subtopic", "word", ["topic", "subtopic"], False),
+    (
+        "ix_user_word_stop_list_user_id_word_id",
+        "user_word_stop_list",
+        ["user_id", "word_id"],
+        False,
+    ),
+    (
+        "uq_user_achievement_user_id_achievement_id",
+        "user_achievement",
+        ["user_id", "achievement_id"],
+        True,
+    ),
+    (
+        "ix_user_achievement_achievement_id",
+        "user_achievement",
+        ["achievement_id"],
+        False,
+    ),
+    ("ix_error_user_id_id", "error", ["user_id", "id"], False),
+    ("uq_bill_label", "bill", ["label"], True),
+    ("uq_user_uwords_uid", "user", ["uwords_uid"], True),
+]
+
+
+def upgrade() -> None:
+    # a unique index cannot be built over duplicates, keep the oldest row
+    op.execute(
+        """
+        DELETE FROM user_achievement
+        USING user_achievement AS kept
+        WHERE user_achievement.user_id = kept.user_id
+          AND user_achievement.achievement_id = kept.achievement_id
+          AND user_achievement.id > kept.id
+        """
+    )
+
+    # CONCURRENTLY does not lock writes but cannot run inside a transaction;
+    # a failed build leaves an INVALID index that IF NOT EXISTS would skip,
+    # so it is dropped before every attempt
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=unique,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
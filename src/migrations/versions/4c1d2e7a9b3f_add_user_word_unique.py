@@ -0,0 +1,59 @@
+"""add user word unique
+
+Revision ID: 4c1d2e7a9b3f
+Revises: 1e7f44122f60
+Create Date: 2026-10-18 15:10:26
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4c1d2e7a9b3f"
+down_revision: Union[str, None] = "1e7f44122f60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # merge duplicated user words into the oldest row before adding the constraint
+    op.execute(
+        """
+        WITH merged AS (
+            SELECT MIN(id) AS id,
+                   user_id,
+                   word_id,
+                   SUM(frequency) AS frequency,
+                   MAX(progress) AS progress,
+                   MAX(latest_study) AS latest_study
+            FROM user_word
+            GROUP BY user_id, word_id
+            HAVING COUNT(*) > 1
+        )
+        UPDATE user_word
+        SET frequency = merged.frequency,
+            progress = merged.progress,
+            latest_study = merged.latest_study
+        FROM merged
+        WHERE user_word.id = merged.id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM user_word
+        USING user_word AS kept
+        WHERE user_word.user_id = kept.user_id
+          AND user_word.word_id = kept.word_id
+          AND user_word.id > kept.id
+        """
+    )
+    op.create_unique_constraint(
+        "uq_user_word_user_id_word_id", "user_word", ["user_id", "word_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_user_word_user_id_word_id", "user_word", type_="unique")
@@ -0,0 +1,107 @@
+"""add word enValue unique
+
+Revision ID: 8e5f0b6c2d41
+Revises: 4c1d2e7a9b3f
+Create Date: 2026-10-18 15:13:37
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e5f0b6c2d41"
+down_revision: Union[str, None] = "4c1d2e7a9b3f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # every duplicated word is merged into the oldest row with the same enValue
+    op.execute(
+        """
+        CREATE TEMPORARY TABLE word_duplicate ON COMMIT DROP AS
+        SELECT word.id AS duplicate_id, kept.id AS kept_id
+        FROM word
+        JOIN (
+            SELECT "enValue", MIN(id) AS id
+            FROM word
+            GROUP BY "enValue"
+            HAVING COUNT(*) > 1
+        ) AS kept ON word."enValue" = kept."enValue" AND word.id <> kept.id
+        """
+    )
+
+    op.drop_constraint("uq_user_word_user_id_word_id", "user_word", type_="unique")
+    op.execute(
+        """
+        UPDATE user_word
+        SET word_id = word_duplicate.kept_id
+        FROM word_duplicate
+        WHERE user_word.word_id = word_duplicate.duplicate_id
+        """
+    )
+    op.execute(
+        """
+        WITH merged AS (
+            SELECT MIN(id) AS id,
+                   SUM(frequency) AS frequency,
+                   MAX(progress) AS progress,
+                   MAX(latest_study) AS latest_study
+            FROM user_word
+            GROUP BY user_id, word_id
+            HAVING COUNT(*) > 1
+        )
+        UPDATE user_word
+        SET frequency = merged.frequency,
+            progress = merged.progress,
+            latest_study = merged.latest_study
+        FROM merged
+        WHERE user_word.id = merged.id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM user_word
+        USING user_word AS kept
+        WHERE user_word.user_id = kept.user_id
+          AND user_word.word_id = kept.word_id
+          AND user_word.id > kept.id
+        """
+    )
+    op.create_unique_constraint(
+        "uq_user_word_user_id_word_id", "user_word", ["user_id", "word_id"]
+    )
+
+    op.execute(
+        """
+        UPDATE user_word_stop_list
+        SET word_id = word_duplicate.kept_id
+        FROM word_duplicate
+        WHERE user_word_stop_list.word_id = word_duplicate.duplicate_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM user_word_stop_list
+        USING user_word_stop_list AS kept
+        WHERE user_word_stop_list.user_id = kept.user_id
+          AND user_word_stop_list.word_id = kept.word_id
+          AND user_word_stop_list.id > kept.id
+        """
+    )
+
+    op.execute(
+        """
+        DELETE FROM word
+        USING word_duplicate
+        WHERE word.id = word_duplicate.duplicate_id
+        """
+    )
+    op.create_unique_constraint("uq_word_en_value", "word", ["enValue"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_word_en_value", "word", type_="unique")
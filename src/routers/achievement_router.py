@@ -13,6 +13,7 @@ from src.schemes.achievement_schemas import (
 from src.services.minio_uploader import MinioUploader
 from src.services.services_config import mc
 from src.services.user_service import UserService
+from src.services.achievement_catalog import achievement_catalog
 from src.services.achievement_service import AchievementService
 from src.services.user_achievement_service import UserAchievementService
 
@@ -25,6 +26,7 @@ from src.utils.exceptions import (
 )
 from src.utils.logger import achievement_router_logger
 from src.utils.dependenes.user_service_fabric import user_service_fabric
+from src.utils.dependenes.unit_of_work_fabric import RequestUnitOfWork
 from src.utils.dependenes.achievement_service_fabric import achievement_service_fabric
 from src.utils.dependenes.user_achievement_fabric import user_achievement_service_fabric
 
@@ -55,13 +57,13 @@ async def add_achievement(
         raise AchievementAlreadyExistsException()
 
     achievement = await achivement_service.add_one(achievement_data.model_dump())
-    users = await user_service.get_users()
-
+    achievement_catalog.invalidate()
     achievements = await achivement_service.get_all()
 
-    await user_achivement_service.update_user_achievements(
-        users=users, achievements=achievements
-    )
+    async for users in user_service.iter_users():
+        await user_achivement_service.update_user_achievements(
+            users=users, achievements=achievements
+        )
 
     return achievement
 
@@ -80,6 +82,7 @@ async def upload_achievement_icon(
     achievement_service: Annotated[
         AchievementService, Depends(achievement_service_fabric)
     ],
+    uow: RequestUnitOfWork,
     user: User = Depends(auth_utils.get_admin_user),
 ):
 
@@ -101,6 +104,8 @@ async def upload_achievement_icon(
     bytes_file = BytesIO(filedata)
     bytes_file.seek(0)
 
+    await uow.release()
+
     found_subtopic_icon_bucket = mc.bucket_exists(MINIO_BUCKET_ACHIEVEMENT_ICONS)
     if not found_subtopic_icon_bucket:
         await MinioUploader.create_bucket(MINIO_BUCKET_ACHIEVEMENT_ICONS)
@@ -134,6 +139,7 @@ async def upload_achievement_complete_icon(
     achievement_service: Annotated[
         AchievementService, Depends(achievement_service_fabric)
     ],
+    uow: RequestUnitOfWork,
     user: User = Depends(auth_utils.get_admin_user),
 ):
 
@@ -155,6 +161,8 @@ async def upload_achievement_complete_icon(
     bytes_file = BytesIO(filedata)
     bytes_file.seek(0)
 
+    await uow.release()
+
     found_subtopic_icon_bucket = mc.bucket_exists(MINIO_BUCKET_ACHIEVEMENT_ICONS)
     if not found_subtopic_icon_bucket:
         await MinioUploader.create_bucket(MINIO_BUCKET_ACHIEVEMENT_ICONS)
@@ -3,10 +3,11 @@ from datetime import datetime
 from dateutil.relativedelta import relativedelta
 
 from fastapi.security import HTTPBearer
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
+from src.database.db_config import pool_stats
 from src.database.models import User
-from src.schemes.admin_schemas import AdminCreate, AdminEmailLogin
+from src.schemes.admin_schemas import AdminCreate, AdminEmailLogin, DBPoolStats
 
 from src.schemes.enums.enums import Providers
 from src.schemes.user_schemas import UserData, UserDump
@@ -17,6 +18,7 @@ from src.services.user_service import UserService
 
 from src.utils import auth as auth_utils
 from src.utils.dependenes.sub_service_fabric import sub_service_fabric
+from src.utils.dependenes.unit_of_work_fabric import RequestUnitOfWork
 from src.utils.dependenes.user_service_fabric import user_service_fabric
 
 from src.config.instance import (
@@ -24,7 +26,6 @@ from src.config.instance import (
     ALLOWED_AUDIO_SECONDS,
     ALLOWED_VIDEO_SECONDS,
     DEFAULT_ENERGY,
-    METRIC_URL,
 )
 from src.config import fastapi_docs_config as doc_data
 from src.utils.exceptions import (
@@ -48,8 +49,10 @@ admin_router_v1 = APIRouter(prefix="/api/users", tags=["Admins"])
     description=doc_data.ADMIN_REGISTER_DESCRIPTION,
 )
 async def create_admin(
+    response: Response,
     admin_data: AdminCreate,
     user_service: Annotated[UserService, Depends(user_service_fabric)],
+    uow: RequestUnitOfWork,
 ):
     if await user_service.get_user_by_provider(
         unique=admin_data.email, provider=Providers.admin.value, user_field=User.email
@@ -63,11 +66,13 @@ async def create_admin(
         data=admin_data, provider=Providers.admin.value
     )
 
+    await uow.release()
+
     user.metrics = await get_user_metric(
         user_id=user.id,
         user_days=user.days,
         uwords_uid=user.uwords_uid,
-        server_url=METRIC_URL,
+        response=response,
     )
 
     return user
@@ -183,3 +188,15 @@ async def give_user_sub(
             "subscription_type": sub_id,
         },
     )
+
+
+@admin_router_v1.get(
+    "/admin/db-pool",
+    response_model=DBPoolStats,
+    name=doc_data.DB_POOL_STATS_TITLE,
+    description=doc_data.DB_POOL_STATS_DESCRIPTION,
+)
+async def get_db_pool_stats(
+    user: User = Depends(auth_utils.get_admin_user),
+):
+    return pool_stats()
@@ -1,10 +1,10 @@
 import logging
 from typing import Annotated
 from fastapi.security import HTTPBearer
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Response, status, Depends
 
 from src.config import fastapi_docs_config as doc_data
-from src.config.instance import METRIC_URL, TELEGRAM_CODE_LEN, EMAIL_CODE_EXP
+from src.config.instance import TELEGRAM_CODE_LEN, EMAIL_CODE_EXP
 
 from src.database.models import User
 from src.database.redis_config import redis_connection
@@ -37,11 +37,12 @@ from src.utils.exceptions import (
     UserNotFoundException,
     UserWrongCodeException,
 )
-from src.utils.metric import get_user_data, get_user_metric
+from src.utils.metric import get_user_metric
 from src.utils import tokens as token_utils
 from src.utils.email import generate_telegram_verification_code
 
 from src.utils.dependenes.user_service_fabric import user_service_fabric
+from src.utils.dependenes.unit_of_work_fabric import RequestUnitOfWork
 from src.utils.dependenes.feedback_service_fabric import feedback_service_fabric
 from src.utils.dependenes.user_achievement_fabric import user_achievement_service_fabric
 from src.utils.logger import auth_router_logger
@@ -57,8 +58,10 @@ auth_router_v1 = APIRouter(prefix="/api/users", tags=["Users"])
     description=doc_data.USER_REGISTER_DESCRIPTION,
 )
 async def register_user(
+    response: Response,
     user_data: UserCreateEmail,
     user_service: Annotated[UserService, Depends(user_service_fabric)],
+    uow: RequestUnitOfWork,
     user_achievements_service: Annotated[
         UserAchievementService, Depends(user_achievement_service_fabric)
     ],
@@ -73,11 +76,13 @@ async def register_user(
         data=user_data, provider=Providers.email.value
     )
 
+    await uow.release()
+
     user.metrics = await get_user_metric(
         user_id=user.id,
         user_days=user.days,
         uwords_uid=user.uwords_uid,
-        server_url=METRIC_URL,
+        response=response,
     )
 
     await user_service.check_user_achievemets(
@@ -99,8 +104,10 @@ async def register_user(
     description=doc_data.USER_REGISTER_VK_DESCRIPTION,
 )
 async def register_vk_user(
+    response: Response,
     user_data: UserCreateVk,
     user_service: Annotated[UserService, Depends(user_service_fabric)],
+    uow: RequestUnitOfWork,
     user_achievements_service: Annotated[
         UserAchievementService, Depends(user_achievement_service_fabric)
     ],
@@ -124,11 +131,13 @@ async def register_vk_user(
             provider=Providers.vk.value,
         )
 
+        await uow.release()
+
         user.metrics = await get_user_metric(
             user_id=user.id,
             user_days=user.days,
             uwords_uid=user.uwords_uid,
-            server_url=METRIC_URL,
+            response=response,
         )
 
         await user_service.check_user_achievemets(
@@ -150,8 +159,10 @@ async def register_vk_user(
     description=doc_data.USER_REGISTER_GOOGLE_DESCRIPTION,
 )
 async def register_google_user(
+    response: Response,
     user_data: UserCreateGoogle,
     user_service: Annotated[UserService, Depends(user_service_fabric)],
+    uow: RequestUnitOfWork,
     user_achievements_service: Annotated[
         UserAchievementService, Depends(user_achievement_service_fabric)
     ],
@@ -171,11 +182,13 @@ async def register_google_user(
         provider=Providers.google.value,
     )
 
+    await uow.release()
+
     user.metrics = await get_user_metric(
         user_id=user.id,
         user_days=user.days,
         uwords_uid=user.uwords_uid,
-        server_url=METRIC_URL,
+        response=response,
     )
 
     await user_service.check_user_achievemets(
@@ -256,7 +269,9 @@ async def refresh_token(user: User = Depends(auth_utils.get_current_user_by_refr
     description=doc_data.USER_ME_DESCRIPTION,
 )
 async def get_user_me(
+    response: Response,
     user_service: Annotated[UserService, Depends(user_service_fabric)],
+    uow: RequestUnitOfWork,
     user_achievements_service: Annotated[
         UserAchievementService, Depends(user_achievement_service_fabric)
     ],
@@ -264,11 +279,13 @@ async def get_user_me(
 ):
     await user_service.update_user_state(user.id)
 
+    await uow.release()
+
     user.metrics = await get_user_metric(
         user_id=user.id,
         user_days=user.days,
         uwords_uid=user.uwords_uid,
-        server_url=METRIC_URL,
+        response=response,
     )
 
     user.achievements = await user_achievements_service.get_user_achievements_dump(
@@ -285,19 +302,23 @@ async def get_user_me(
     description=doc_data.USER_ME_UPDATE_DESCRIPTION,
 )
 async def update_user_me(
+    response: Response,
     user_data: UserUpdate,
     user_service: Annotated[UserService, Depends(user_service_fabric)],
+    uow: RequestUnitOfWork,
     user: User = Depends(auth_utils.get_active_current_user),
 ):
     user = await user_service.update_user(
         user_id=user.id, user_data=user_data.model_dump(exclude_none=True)
     )
 
+    await uow.release()
+
     user.metrics = await get_user_metric(
         user_id=user.id,
         user_days=user.days,
         uwords_uid=user.uwords_uid,
-        server_url=METRIC_URL,
+        response=response,
     )
 
     return user
@@ -327,8 +348,10 @@ async def delete_user(
     description=doc_data.USER_PROFILE_DESCRIPTION,
 )
 async def get_user_profile(
+    response: Response,
     user_id: int,
     user_service: Annotated[UserService, Depends(user_service_fabric)],
+    uow: RequestUnitOfWork,
     user: User = Depends(auth_utils.get_active_current_user),
 ):
     await user_service.update_user_state(user.id)
@@ -338,11 +361,13 @@ async def get_user_profile(
     if not user_:
         raise UserNotFoundException()
 
+    await uow.release()
+
     user_.metrics = await get_user_metric(
         user_id=user_.id,
         user_days=user_.days,
         uwords_uid=user_.uwords_uid,
-        server_url=METRIC_URL,
+        response=response,
     )
 
     return user_
@@ -23,6 +23,7 @@ from src.utils.dependenes.chroma_service_fabric import (
     topic_service_fabric,
     subtopic_service_fabric,
 )
+from src.utils.dependenes.unit_of_work_fabric import RequestUnitOfWork
 
 from src.config import fastapi_docs_config as doc_data
 from src.config.instance import MINIO_BUCKET_SUBTOPIC_ICONS, MINIO_HOST
@@ -86,6 +87,7 @@ async def upload_subtopic_icon(
     subtopic_id: int,
     subtopic_icon: Annotated[UploadFile, File(description="A file read as UploadFile")],
     subtopic_service: Annotated[TopicService, Depends(subtopic_service_fabric)],
+    uow: RequestUnitOfWork,
     user: User = Depends(auth_utils.get_admin_user),
 ):
 
@@ -106,6 +108,8 @@ async def upload_subtopic_icon(
     bytes_file = BytesIO(filedata)
     bytes_file.seek(0)
 
+    await uow.release()
+
     found_subtopic_icon_bucket = mc.bucket_exists(MINIO_BUCKET_SUBTOPIC_ICONS)
     if not found_subtopic_icon_bucket:
         await MinioUploader.create_bucket(MINIO_BUCKET_SUBTOPIC_ICONS)
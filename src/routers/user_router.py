@@ -64,7 +64,7 @@ async def get_user_topics(
     user: User = Depends(auth_utils.get_active_current_user),
 ):
     user_words = await user_words_service.get_user_words(user_id=user.id)
-    subtopics = await subtopic_service.get_all()
+    subtopics = await subtopic_service.get_all_flat()
 
     return await user_words_service.get_user_topic(
         subtopics=subtopics, user_words=user_words
@@ -151,7 +151,7 @@ async def complete_user_words_learning(
             status_code=status.HTTP_404_NOT_FOUND, detail="Energy limit ran out"
         )
 
-    await user_words_service.update_progress_word(
+    event = await user_words_service.update_progress_word(
         user_id=user.id, uwords_uid=user.uwords_uid, words_ids=schema.words_ids
     )
 
@@ -161,8 +161,9 @@ async def complete_user_words_learning(
 
     await user_service.update_learning_days(uid=user.id)
 
-    await user_service.check_user_achievemets(
+    await user_service.apply_achievement_event(
         user_id=user.id,
+        event=event,
         user_achievement_service=user_achievements_service,
     )
 
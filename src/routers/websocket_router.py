@@ -1,3 +1,4 @@
+import json
 import asyncio
 from typing import Annotated
 
@@ -5,14 +6,17 @@ from fastapi.websockets import WebSocket
 from fastapi import APIRouter, Depends, HTTPException
 
 from src.schemes.error_schemas import ErrorCreate
-from src.services.error_service import ErrorService
+from src.services.error_service import ERROR_CHANNEL_PATTERN, ErrorService
 from src.utils.dependenes.error_service_fabric import error_service_fabric
+from src.utils.pubsub import PubSubHub
 
 from src.config import fastapi_docs_config as doc_data
 
 add_error_router = APIRouter(prefix="/api/v1/error", tags=["Errors"])
 websocket_router_v1 = APIRouter(prefix="/api/v1/websockets", tags=["Errors"])
 
+error_hub = PubSubHub(pattern=ERROR_CHANNEL_PATTERN)
+
 
 @add_error_router.post(
     "/add",
@@ -38,6 +42,15 @@ async def trigger_error():
     division_by_zero = 1 / 0
 
 
+def error_message(message: str, description: str) -> dict:
+    return {"msg": f"Отчет об ошибке: {message}, {description}"}
+
+
+async def wait_disconnect(websocket: WebSocket) -> None:
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
 @websocket_router_v1.websocket("/errors")
 async def websocket_endpoint(
     websocket: WebSocket,
@@ -45,16 +58,38 @@ async def websocket_endpoint(
     error_service: Annotated[ErrorService, Depends(error_service_fabric)],
 ):
     await websocket.accept()
-    while True:
-        errors = await error_service.get_user_errors(user_id)
+
+    # subscribe before reading the backlog so nothing falls in between
+    async with error_hub.listen(channel=ErrorService.channel(user_id=user_id)) as queue:
+        errors = await error_service.get_unsent_errors(user_id=user_id)
         for error in errors:
-            if not error.is_send:
-                await websocket.send_json(
-                    data={
-                        "msg": f"Отчет об ошибке: {error.message}, {error.description}"
-                    }
+            await websocket.send_json(
+                data=error_message(error.message, error.description)
+            )
+        await error_service.mark_sent(error_ids=[error.id for error in errors])
+
+        sent = {error.id for error in errors}
+        disconnect = asyncio.create_task(wait_disconnect(websocket))
+
+        try:
+            while True:
+                received = asyncio.create_task(queue.get())
+                await asyncio.wait(
+                    {received, disconnect}, return_when=asyncio.FIRST_COMPLETED
                 )
 
-                await error_service.update_error_status(error_id=error.id)
+                if disconnect.done():
+                    received.cancel()
+                    return
+
+                error = json.loads(received.result())
+                if error["id"] in sent:
+                    continue
+
+                await websocket.send_json(
+                    data=error_message(error["message"], error["description"])
+                )
+                await error_service.mark_sent(error_ids=[error["id"]])
 
-        await asyncio.sleep(30)
+        finally:
+            disconnect.cancel()
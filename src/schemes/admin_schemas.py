@@ -27,3 +27,11 @@ class BotWords(BaseModel):
 class BotPromo(BaseModel):
     uwords_uid: str = Field(examples=["1"])
     promo: str = Field(examples=["promo123"])
+
+
+class DBPoolStats(BaseModel):
+    pooled: bool = Field(examples=[True])
+    size: Optional[int] = Field(examples=[10], default=None)
+    checked_in: Optional[int] = Field(examples=[8], default=None)
+    checked_out: Optional[int] = Field(examples=[2], default=None)
+    overflow: Optional[int] = Field(examples=[-8], default=None)
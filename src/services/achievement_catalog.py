@@ -0,0 +1,58 @@
+import time
+from typing import Dict, List, NamedTuple
+
+from src.config.instance import ACHIEVEMENT_CATALOG_TTL
+from src.database.models import Achievement
+from src.services.achievement_service import AchievementService
+from src.utils.load_plan import LoadPlan
+
+
+CATALOG_PLAN = LoadPlan(
+    columns=(Achievement.id, Achievement.category, Achievement.target)
+)
+
+
+class CatalogEntry(NamedTuple):
+    id: int
+    category: str
+    target: int
+
+
+class AchievementCatalog:
+    """Achievements sorted by category and target, kept in process memory.
+
+    The catalog changes only when an admin adds an achievement, so it is read
+    once per ttl seconds instead of on every event. invalidate() makes the
+    next load re-read it.
+    """
+
+    def __init__(self, ttl: float = ACHIEVEMENT_CATALOG_TTL):
+        self.ttl = ttl
+        self.loaded_at = 0.0
+        self.by_id: Dict[int, CatalogEntry] = {}
+        self.by_category: Dict[str, List[CatalogEntry]] = {}
+
+    async def load(self, achievement_service: AchievementService):
+        if time.monotonic() - self.loaded_at < self.ttl:
+            return self
+
+        rows = await achievement_service.get_all(plan=CATALOG_PLAN)
+        entries = sorted(
+            (CatalogEntry(row.id, row.category, row.target) for row in rows),
+            key=lambda entry: (entry.category, entry.target),
+        )
+
+        by_category: Dict[str, List[CatalogEntry]] = {}
+        for entry in entries:
+            by_category.setdefault(entry.category, []).append(entry)
+
+        self.by_id = {entry.id: entry for entry in entries}
+        self.by_category = by_category
+        self.loaded_at = time.monotonic()
+        return self
+
+    def invalidate(self) -> None:
+        self.loaded_at = 0.0
+
+
+achievement_catalog = AchievementCatalog()
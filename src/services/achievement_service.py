@@ -1,5 +1,6 @@
-from typing import Dict, Union
+from typing import Dict, Optional, Union
 from src.database.models import Achievement, UserAchievement
+from src.utils.load_plan import LoadPlan
 from src.utils.repository import AbstractRepository
 
 
@@ -13,8 +14,8 @@ class AchievementService:
     async def get(self, title) -> Union[Achievement, None]:
         return await self.repo.get_one(title)
 
-    async def get_all(self) -> list[Achievement]:
-        return await self.repo.get_all_by_filter()
+    async def get_all(self, plan: Optional[LoadPlan] = None) -> list[Achievement]:
+        return await self.repo.get_all_by_filter(plan=plan)
 
     async def update_one(self, achievement_id: int, update_data: dict) -> Achievement:
         return await self.repo.update_one(
@@ -1,25 +1,37 @@
 import os
+import asyncio
 import uuid
-import json
-import ffmpeg
 import logging
 import aiohttp
-import requests
 from gtts import gTTS
 from io import BytesIO
 from pathlib import Path
 from typing import Optional, Union, Tuple, List
-from speech_recognition import AudioFile
+from concurrent.futures import ThreadPoolExecutor
 
 from src.schemes.error_schemas import ErrorCreate
-from src.services.services_config import sr
 from src.services.error_service import ErrorService
+from src.services.speech_service import speech_backend
 from src.services.minio_uploader import MinioUploader
+from src.utils.audio import (
+    PCM,
+    Audio,
+    AudioChunk,
+    Span,
+    convert_audio,
+    decode_audio,
+    detect_speech,
+    pack_speech,
+    segment_audio,
+    slice_chunks,
+    write_chunks,
+)
+from src.utils.stt import transcribe
 from src.utils.logger import audio_service_logger
 
 from src.config.instance import (
-    HUGGING_FACE_TOKEN,
-    HUGGING_FACE_URL,
+    AUDIO_SEGMENT_SECONDS,
+    STT_WORKERS,
     MINIO_BUCKET_VOICEOVER,
     MINIO_HOST,
     UPLOAD_DIR,
@@ -30,14 +42,33 @@ from src.config.instance import (
 
 class AudioService:
     @staticmethod
-    async def convert_audio(
-        path: str, title: str, error_service: ErrorService, user_id: int
-    ) -> Union[str, None]:
+    async def decode_audio(
+        path: str,
+        title: str,
+        error_service: ErrorService,
+        user_id: int,
+        directory: Optional[str] = None,
+        max_seconds: Optional[float] = None,
+    ) -> Optional[Audio]:
+        # decoded in memory, or to a WAV in directory when temp files are on
         try:
-            out_path = UPLOAD_DIR / f"{title}_converted.wav"
+            if directory is None:
+                audio = await asyncio.to_thread(
+                    decode_audio, path=str(path), max_seconds=max_seconds
+                )
+                audio_service_logger.info(
+                    f"[DECODE] path: {path} seconds: {audio.seconds:.0f}"
+                )
+                return audio
+
+            out_path = os.path.join(directory, f"{title}_converted.wav")
             audio_service_logger.info(f"OUT_PATH: {out_path}")
-            ffmpeg.input(path).output(str(out_path), ac=1).run()
-            return str(out_path)
+            return await asyncio.to_thread(
+                convert_audio,
+                path=str(path),
+                outpath=out_path,
+                max_seconds=max_seconds,
+            )
 
         except Exception as e:
             audio_service_logger.error(f"[CONVERT] Error: {e}")
@@ -49,43 +80,70 @@ class AudioService:
             await error_service.add_one(error=error)
             return None
 
+    @staticmethod
+    async def detect_speech(
+        audio: Audio, error_service: ErrorService, user_id: int
+    ) -> Optional[List[Span]]:
+        try:
+            spans = await asyncio.to_thread(detect_speech, audio=audio)
+            audio_service_logger.info(f"[VAD] spans: {len(spans)}")
+            return spans
+
+        except Exception as e:
+            # the caller falls back to fixed cuts of the whole file
+            audio_service_logger.error(f"[VAD] Error: {e}")
+
+            error = ErrorCreate(
+                user_id=user_id,
+                message="[VAD] Ошибка поиска речи в аудио!",
+                description=str(e),
+            )
+
+            await error_service.add_one(error=error)
+            return None
+
     @staticmethod
     async def cut_audio(
-        path: str,
+        audio: Audio,
         error_service: ErrorService,
         user_id: int,
-        duration: int,
+        duration: float,
         allowed_iterations: Optional[int] = None,
-    ) -> List[str]:
-        files = []
+        spans: Optional[List[Span]] = None,
+    ) -> List[AudioChunk]:
+        chunks = []
 
         try:
-            index = 0
-
-            while index * 30 < duration:
-                if allowed_iterations:
-                    if index > allowed_iterations:
-                        break
-
-                filename, _ = os.path.splitext(path)
+            max_seconds = (
+                allowed_iterations * AUDIO_SEGMENT_SECONDS
+                if allowed_iterations
+                else None
+            )
 
-                outpath = f"{filename}_{index + 1}.wav"
+            if isinstance(audio, PCM):
+                packed = pack_speech(
+                    spans=[(0.0, duration)] if spans is None else spans,
+                    max_seconds=max_seconds,
+                )
+                chunks = slice_chunks(audio=audio, chunks=packed)
 
-                audio_service_logger.info(f"[AUDIO] path: {path} new_path: {outpath}")
+            elif spans is None:
+                files = await asyncio.to_thread(
+                    segment_audio,
+                    path=audio,
+                    duration=duration,
+                    max_seconds=max_seconds,
+                )
+                chunks = [AudioChunk(path=file) for file in files]
 
-                if (index + 1) * 30 < duration:
-                    ffmpeg.input(str(path), ss=index * 30).output(
-                        str(outpath), t=30, ac=1
-                    ).run()
-                else:
-                    ffmpeg.input(str(path), ss=index * 30).output(
-                        str(outpath), ac=1
-                    ).run()
+            else:
+                packed = pack_speech(spans=spans, max_seconds=max_seconds)
+                files = await asyncio.to_thread(write_chunks, path=audio, chunks=packed)
+                chunks = [AudioChunk(path=file) for file in files]
 
-                files.append(outpath)
-                index += 1
+            audio_service_logger.info(f"[AUDIO] chunks: {len(chunks)}")
 
-            return files
+            return chunks
 
         except Exception as e:
             audio_service_logger.error(f"[CUT] Error: {e}")
@@ -98,56 +156,35 @@ class AudioService:
 
             await error_service.add_one(error=error)
 
-            return files
+            return chunks
 
     @staticmethod
-    def speech_to_text(filepath: str) -> str:
+    async def transcribe(
+        chunks: List[AudioChunk], error_service: ErrorService, user_id: int
+    ) -> str:
         try:
-            with open(file=filepath, mode="rb") as audio:
-                audio_data = audio.read()
-
-            response = requests.post(
-                url=HUGGING_FACE_URL,
-                headers={
-                    "Authorization": f"Bearer {HUGGING_FACE_TOKEN}",
-                },
-                data=audio_data,
+            with ThreadPoolExecutor(max_workers=STT_WORKERS) as executor:
+                text, language = await asyncio.to_thread(
+                    transcribe,
+                    chunks=chunks,
+                    backend=speech_backend,
+                    executor=executor,
+                )
+
+            audio_service_logger.info(
+                f"[STT] chunks: {len(chunks)} language: {language or 'ambiguous'}"
             )
-
-            if response.status_code != 200:
-                audio_service_logger.error(f"[STT HF] Error: {response.text}")
-
-            data: dict = json.loads(response.text)
-
-            return data.get("text")
+            return text
 
         except Exception as e:
-            audio_service_logger.error(f"[STT HF] Error: {e}")
-            return " "
-
-    @staticmethod
-    def speech_to_text_ru(filepath: str) -> str:
-        try:
-            with AudioFile(filepath) as source:
-                audio_data = sr.record(source)
-                text = sr.recognize_google(audio_data, language="ru-RU")
-
-                return text.lower()
+            audio_service_logger.error(f"[STT] Error: {e}")
 
-        except Exception as e:
-            return " "
-
-    @staticmethod
-    def speech_to_text_en(filepath: str) -> str:
-        try:
-            with AudioFile(filepath) as source:
-                audio_data = sr.record(source)
-                text = sr.recognize_google(audio_data, language="en-US")
-
-                return text.lower()
+            error = ErrorCreate(
+                user_id=user_id, message="[STT] ERROR", description=str(e)
+            )
 
-        except Exception as e:
-            return " "
+            await error_service.add_one(error=error)
+            return ""
 
     @staticmethod
     async def upload_youtube_audio(
@@ -193,7 +230,7 @@ class AudioService:
             tts = gTTS(text=word, lang="en", slow=False)
 
             bytes_file = BytesIO()
-            tts.write_to_fp(bytes_file)
+            await asyncio.to_thread(tts.write_to_fp, bytes_file)
             bytes_file.seek(0)
 
             object_name = f'{"_".join(word.lower().split())}.mp3'
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Tuple, List, Dict
 from google.cloud.vision import Image
@@ -40,7 +41,9 @@ class ImageSafetyVision:
     ) -> Tuple[bool, List[Dict[str, str]]]:
         image = Image(content=image_content)
 
-        response = google_vision.safe_search_detection(image=image)
+        response = await asyncio.to_thread(
+            google_vision.safe_search_detection, image=image
+        )
         safe = response.safe_search_annotation
 
         is_safe = True
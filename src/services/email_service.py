@@ -1,5 +1,5 @@
-import ssl
-import smtplib
+from typing import Optional
+
 from pydantic import EmailStr
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -8,13 +8,11 @@ from fastapi import HTTPException, status
 
 from src.database.redis_config import redis_connection
 from src.utils.email import generate_email_verification_code
+from src.utils.smtp_sender import SMTPSender, smtp_sender
 
 from src.config.instance import (
     EMAIL_CODE_ATTEMPTS,
-    EMAIL_PASSWORD,
     SENDER_EMAIL,
-    EMAIL_PORT,
-    SMTP_SERVER,
     EMAIL_CODE_LEN,
 )
 
@@ -57,19 +55,25 @@ class EmailService:
             )
 
     @staticmethod
-    def send_email(email: str, theme: str, text: str) -> None:
-        context = ssl.create_default_context()
-
+    def build_message(
+        email: str, theme: str, text: str, sender_email: Optional[str] = SENDER_EMAIL
+    ) -> MIMEMultipart:
         message = MIMEMultipart("alternative")
 
         message["Subject"] = theme
-        message["From"] = SENDER_EMAIL
+        message["From"] = sender_email
         message["To"] = email
 
         message.attach(MIMEText(text, "plain"))
 
-        with smtplib.SMTP_SSL(SMTP_SERVER, int(EMAIL_PORT), context=context) as server:
-            server.login(user=SENDER_EMAIL, password=EMAIL_PASSWORD)
-            server.sendmail(
-                from_addr=SENDER_EMAIL, to_addrs=email, msg=message.as_string()
+        return message
+
+    @staticmethod
+    def send_email(
+        email: str, theme: str, text: str, sender: SMTPSender = smtp_sender
+    ) -> None:
+        sender.send(
+            EmailService.build_message(
+                email=email, theme=theme, text=text, sender_email=sender.address
             )
+        )
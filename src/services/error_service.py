@@ -1,15 +1,48 @@
+import json
+from typing import Iterable
+
+from redis import Redis, RedisError
+
 from src.database.models import Error
+from src.database.redis_config import redis_connection
 from src.schemes.error_schemas import ErrorCreate, ErrorDump
 
 from src.utils.repository import AbstractRepository
+from src.utils.logger import error_service_logger
+
+
+ERROR_CHANNEL_PATTERN: str = "errors:*"
 
 
 class ErrorService:
-    def __init__(self, repo: AbstractRepository):
+    def __init__(self, repo: AbstractRepository, redis: Redis = redis_connection):
         self.repo = repo
+        self.redis = redis
+
+    @staticmethod
+    def channel(user_id: int) -> str:
+        return f"errors:{user_id}"
 
     async def add_one(self, error: ErrorCreate) -> Error:
-        await self.repo.add_one(dict(error))
+        db_error: Error = await self.repo.add_one(dict(error))
+
+        # the row stays is_send=False until a socket delivers it, a lost
+        # publish is picked up on the next connect
+        try:
+            self.redis.publish(
+                self.channel(user_id=error.user_id),
+                json.dumps(
+                    {
+                        "id": db_error.id,
+                        "message": db_error.message,
+                        "description": db_error.description,
+                    }
+                ),
+            )
+        except RedisError as e:
+            error_service_logger.error(f"[ADD] Redis error: {e}")
+
+        return db_error
 
     async def get_all(self) -> list[Error]:
         return await self.repo.get_all_by_filter()
@@ -19,7 +52,18 @@ class ErrorService:
             [Error.user_id == user_id], Error.id.desc()
         )
 
+    async def get_unsent_errors(self, user_id: int) -> list[Error]:
+        return await self.repo.get_all_by_filter(
+            [Error.user_id == user_id, Error.is_send == False], Error.id.asc()
+        )
+
     async def update_error_status(self, error_id: int) -> Error:
         return await self.repo.update_one(
             filters=[Error.id == error_id], values={"is_send": True}
         )
+
+    async def mark_sent(self, error_ids: Iterable[int]) -> None:
+        data = [{"id": error_id, "is_send": True} for error_id in error_ids]
+
+        if data:
+            await self.repo.update_many(data=data)
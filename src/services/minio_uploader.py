@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import BinaryIO
 
@@ -38,7 +39,8 @@ class MinioUploader:
         bucket_name: str, object_name: str, data: BinaryIO, lenght: int, type: str
     ) -> None:
         try:
-            mc.put_object(
+            await asyncio.to_thread(
+                mc.put_object,
                 bucket_name=bucket_name,
                 object_name=object_name,
                 data=data,
@@ -0,0 +1,94 @@
+import time
+import smtplib
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Union
+
+from redis import Redis, RedisError
+
+from src.config.instance import NOTIFICATION_BATCH_SIZE, NOTIFICATION_STATS_TTL
+from src.database.models import User
+from src.database.redis_config import redis_connection
+from src.services.email_service import EmailService
+from src.utils.load_plan import LoadPlan
+from src.utils.repository import AbstractRepository
+from src.utils.smtp_sender import SMTPSender, smtp_sender
+from src.utils.logger import notification_service_logger
+
+
+STREAK_THEME: str = "Uwords - Stroke Days"
+STREAK_TEXT: str = (
+    "Hello, Dear {username}!\n\nTime to learn! Otherwise your progress will be reset!"
+)
+
+RECIPIENTS_PLAN = LoadPlan(columns=(User.id, User.email, User.username))
+
+
+class NotificationService:
+    def __init__(self, repo: AbstractRepository):
+        self.repo = repo
+
+    async def iter_streak_recipients(
+        self, now: Optional[datetime] = None, batch_size: int = NOTIFICATION_BATCH_SIZE
+    ) -> AsyncIterator[List[List[str]]]:
+        # users whose last study was one full day ago, [email, username] pairs
+        now = now or datetime.now()
+
+        async for rows in self.repo.iter_pages(
+            filters=[
+                User.is_active == True,
+                User.email != None,
+                User.latest_study <= now - timedelta(days=1),
+                User.latest_study > now - timedelta(days=2),
+            ],
+            page_size=batch_size,
+            plan=RECIPIENTS_PLAN,
+        ):
+            yield [[row.email, row.username] for row in rows]
+
+    @staticmethod
+    def send_streak_batch(
+        recipients: List[List[str]], sender: SMTPSender = smtp_sender
+    ) -> Dict[str, Union[int, float]]:
+        start = time.perf_counter()
+        sent = failed = 0
+
+        for email, username in recipients:
+            try:
+                EmailService.send_email(
+                    email=email,
+                    theme=STREAK_THEME,
+                    text=STREAK_TEXT.format(username=username),
+                    sender=sender,
+                )
+                sent += 1
+            except (smtplib.SMTPException, OSError) as e:
+                notification_service_logger.error(f"[SEND] {email}: {e}")
+                failed += 1
+
+        seconds = time.perf_counter() - start
+
+        return {
+            "sent": sent,
+            "failed": failed,
+            "seconds": round(seconds, 3),
+            "per_second": round(sent / seconds, 2) if seconds else 0.0,
+        }
+
+    @staticmethod
+    def record_stats(
+        stats: Dict[str, Union[int, float]],
+        day: Optional[str] = None,
+        redis: Redis = redis_connection,
+    ) -> None:
+        key = f"notifications:stats:{day or datetime.now().date().isoformat()}"
+
+        try:
+            pipeline = redis.pipeline(transaction=False)
+            pipeline.hincrby(key, "batches", 1)
+            pipeline.hincrby(key, "sent", stats["sent"])
+            pipeline.hincrby(key, "failed", stats["failed"])
+            pipeline.hincrbyfloat(key, "seconds", stats["seconds"])
+            pipeline.expire(key, NOTIFICATION_STATS_TTL)
+            pipeline.execute()
+        except RedisError as e:
+            notification_service_logger.error(f"[STATS] Redis error: {e}")
@@ -4,21 +4,23 @@ from minio import Minio
 from nltk.corpus import stopwords
 from check_swear import SwearingCheck
 from better_profanity import profanity
-from speech_recognition import Recognizer
 from google.cloud.vision import ImageAnnotatorClient
 from transformers import MarianMTModel, MarianTokenizer
 
+from src.services.translation_service import MarianTranslator
 from src.config.instance import (
     MINIO_ENDPOINT,
     MINIO_ROOT_USER,
     MINIO_ROOT_PASSWORD,
+    LEMMA_CACHE_SIZE,
     TRANSLATION_EN_RU,
     TRANSLATION_RU_EN,
 )
+from src.utils.cache import LRUCache
 
 
-sr: Recognizer = Recognizer()
 ma = pymorphy3.analyzer.MorphAnalyzer()
+lemma_cache = LRUCache(maxsize=LEMMA_CACHE_SIZE)
 
 mc = Minio(
     MINIO_ENDPOINT,
@@ -36,6 +38,7 @@ swear_check = SwearingCheck()
 STOPWORDS_EN = list(stopwords.words("english"))
 STOPWORDS_RU = list(stopwords.words("russian"))
 STOPWORDS = STOPWORDS_EN + STOPWORDS_RU
+STOPWORDS_INDEX = frozenset(STOPWORDS)
 
 google_vision = ImageAnnotatorClient()
 
@@ -44,3 +47,6 @@ model_ru_en = MarianMTModel.from_pretrained(TRANSLATION_RU_EN)
 
 tokenizer_en_ru = MarianTokenizer.from_pretrained(TRANSLATION_EN_RU)
 model_en_ru = MarianMTModel.from_pretrained(TRANSLATION_EN_RU)
+
+translator_ru_en = MarianTranslator(tokenizer=tokenizer_ru_en, model=model_ru_en)
+translator_en_ru = MarianTranslator(tokenizer=tokenizer_en_ru, model=model_en_ru)
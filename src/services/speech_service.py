@@ -0,0 +1,202 @@
+import json
+import math
+import time
+import hashlib
+import threading
+from typing import Dict, List, Optional, Sequence, Type
+
+import numpy as np
+import requests
+from speech_recognition import AudioData, Recognizer
+
+from src.config.instance import (
+    AUDIO_SAMPLE_RATE,
+    HUGGING_FACE_TOKEN,
+    HUGGING_FACE_URL,
+    STT_BACKEND,
+    STT_FAKE_LATENCY,
+    STT_WHISPER_BATCH_SIZE,
+    STT_WHISPER_MODEL,
+    STT_WHISPER_THREADS,
+)
+from src.utils.audio import AudioChunk
+from src.utils.logger import audio_service_logger
+from src.utils.stt import Recognition, SpeechBackend
+
+
+class GoogleSpeech(SpeechBackend):
+    def __init__(self):
+        self.recognizer = Recognizer()
+
+    def recognize(self, chunk: AudioChunk, language: Optional[str]) -> Recognition:
+        try:
+            audio_data = AudioData(chunk.pcm(), sample_rate=chunk.rate, sample_width=2)
+            text, confidence = self.recognizer.recognize_google(
+                audio_data, language=language, with_confidence=True
+            )
+
+            return text.lower(), confidence
+
+        except Exception as e:
+            return " ", 0.0
+
+
+class HuggingFaceSpeech(SpeechBackend):
+    # Whisper behind the inference API finds the language by itself
+    languages = (None,)
+
+    def recognize(self, chunk: AudioChunk, language: Optional[str]) -> Recognition:
+        try:
+            response = requests.post(
+                url=HUGGING_FACE_URL,
+                headers={
+                    "Authorization": f"Bearer {HUGGING_FACE_TOKEN}",
+                },
+                data=chunk.wav(),
+            )
+
+            if response.status_code != 200:
+                audio_service_logger.error(f"[STT HF] Error: {response.text}")
+
+            data: dict = json.loads(response.text)
+
+            return (data.get("text") or " ").lower(), 0.5
+
+        except Exception as e:
+            audio_service_logger.error(f"[STT HF] Error: {e}")
+            return " ", 0.0
+
+
+class WhisperSpeech(SpeechBackend):
+    """faster-whisper int8 on the CPU, no network round trips.
+
+    The model is loaded on the first chunk a worker process recognizes and
+    kept for the life of the process. A batch of chunks is decoded as the
+    clips of one array, so batch_size chunks share a forward pass.
+    """
+
+    def __init__(
+        self,
+        model_name: str = STT_WHISPER_MODEL,
+        threads: int = STT_WHISPER_THREADS,
+        batch_size: int = STT_WHISPER_BATCH_SIZE,
+    ):
+        self.model_name = model_name
+        self.threads = threads
+        self.batch_size = batch_size
+        self.pipeline = None
+        self.lock = threading.Lock()
+
+    def load(self):
+        with self.lock:
+            if self.pipeline is None:
+                # imported here, only workers running this backend need it
+                from faster_whisper import BatchedInferencePipeline, WhisperModel
+
+                model = WhisperModel(
+                    self.model_name,
+                    device="cpu",
+                    compute_type="int8",
+                    cpu_threads=self.threads,
+                )
+                self.pipeline = BatchedInferencePipeline(model=model)
+                audio_service_logger.info(f"[STT WHISPER] Loaded {self.model_name}")
+
+        return self.pipeline
+
+    def recognize(self, chunk: AudioChunk, language: Optional[str]) -> Recognition:
+        return self.recognize_batch([chunk], language)[0]
+
+    def recognize_batch(
+        self, chunks: Sequence[AudioChunk], language: Optional[str]
+    ) -> List[Recognition]:
+        try:
+            pipeline = self.load()
+            # uploads are decoded at AUDIO_SAMPLE_RATE, the rate Whisper expects
+            audios = [chunk.samples().astype(np.float32) / 32768 for chunk in chunks]
+
+            # faster-whisper slices the array with the clips, so they are
+            # sample offsets; the segments it returns are timed in seconds
+            clips, offset = [], 0
+            for audio in audios:
+                clips.append({"start": offset, "end": offset + len(audio)})
+                offset += len(audio)
+            ends = [clip["end"] / AUDIO_SAMPLE_RATE for clip in clips]
+
+            segments, _ = pipeline.transcribe(
+                np.concatenate(audios),
+                language=language.split("-")[0] if language else None,
+                clip_timestamps=clips,
+                batch_size=self.batch_size,
+                vad_filter=False,
+            )
+
+            texts: List[List[str]] = [[] for _ in chunks]
+            logprobs: List[List[float]] = [[] for _ in chunks]
+            for segment in segments:
+                middle = (segment.start + segment.end) / 2
+                index = next(
+                    (i for i, end in enumerate(ends) if middle < end), len(ends) - 1
+                )
+                texts[index].append(segment.text.strip())
+                logprobs[index].append(segment.avg_logprob)
+
+            return [
+                (
+                    (" ".join(text).lower() or " "),
+                    math.exp(sum(logprob) / len(logprob)) if logprob else 0.0,
+                )
+                for text, logprob in zip(texts, logprobs)
+            ]
+
+        except Exception as e:
+            audio_service_logger.error(f"[STT WHISPER] Error: {e}")
+            return [(" ", 0.0) for _ in chunks]
+
+
+class FakeSpeech(SpeechBackend):
+    """Deterministic stand-in for benchmarks and CI.
+
+    The words depend only on the chunk's samples: eight of them with a high
+    confidence in the upload's language, two garbled ones in any other.
+    """
+
+    WORDS: Dict[Optional[str], List[str]] = {
+        "ru-RU": ["привет", "дом", "книга", "вода", "город", "время", "слово", "день"],
+        "en-US": ["hello", "house", "book", "water", "city", "time", "word", "day"],
+    }
+
+    def __init__(self, language: str = "en-US", latency: float = STT_FAKE_LATENCY):
+        self.language = language
+        self.latency = latency
+
+    def recognize(self, chunk: AudioChunk, language: Optional[str]) -> Recognition:
+        time.sleep(self.latency)
+        digest = hashlib.sha1(chunk.pcm()).digest()
+
+        words = self.WORDS.get(language, self.WORDS[self.language])
+        if language in (self.language, None):
+            return " ".join(words[byte % len(words)] for byte in digest[:8]), 0.9
+
+        return " ".join(words[byte % len(words)] for byte in digest[:2]), 0.4
+
+
+SPEECH_BACKENDS: Dict[str, Type[SpeechBackend]] = {
+    "google": GoogleSpeech,
+    "huggingface": HuggingFaceSpeech,
+    "whisper": WhisperSpeech,
+    "fake": FakeSpeech,
+}
+
+
+def make_speech_backend(name: str = STT_BACKEND) -> SpeechBackend:
+    if name not in SPEECH_BACKENDS:
+        raise ValueError(
+            f"Unknown STT backend {name!r}, expected one of {sorted(SPEECH_BACKENDS)}"
+        )
+
+    return SPEECH_BACKENDS[name]()
+
+
+# one per process: a worker loads a local model once, not per upload
+speech_backend = make_speech_backend()
@@ -1,31 +1,38 @@
-import string
-from typing import Union, List, Dict
+from collections import Counter
+from typing import Optional, Union, List, Dict
 from deep_translator.google import GoogleTranslator
+from src.config.instance import (
+    TEXT_STREAM_CHUNK_SIZE,
+    TEXT_STREAM_THRESHOLD,
+    TRANSLATION_BATCH_SIZE,
+)
 from src.schemes.error_schemas import ErrorCreate
 from src.services.error_service import ErrorService
+from src.services.translation_cache import EN_RU, RU_EN, TranslationCache
 from src.services.services_config import (
     ma,
-    STOPWORDS,
-    model_en_ru,
-    model_ru_en,
-    tokenizer_en_ru,
-    tokenizer_ru_en,
+    lemma_cache,
+    STOPWORDS_INDEX,
+    translator_en_ru,
+    translator_ru_en,
 )
 from langdetect import detect
+from src.utils import text as text_utils
+from src.utils.batching import chunked
 from src.utils.logger import text_service_logger
 
 
 class TextService:
+    @staticmethod
+    def lemma_cache_stats() -> Dict[str, Union[int, float]]:
+        return lemma_cache.stats()
+
     @staticmethod
     async def remove_spec_chars(
         text: str, error_service: ErrorService, user_id: int
     ) -> Union[str, None]:
         try:
-            spec_chars = string.punctuation + "\n\xa0«»\t—…" + string.digits
-            text_without_spec_chars = "".join(
-                [char for char in text if char not in spec_chars]
-            )
-            return " ".join(text_without_spec_chars.split())
+            return text_utils.remove_spec_chars(text)
 
         except Exception as e:
             text_service_logger.error(f"[SPEC CHARS] Error: {e}")
@@ -41,7 +48,7 @@ class TextService:
         text: str, error_service: ErrorService, user_id: int
     ) -> Union[List[str], None]:
         try:
-            return [word for word in text.split() if word not in STOPWORDS]
+            return [word for word in text.split() if word not in STOPWORDS_INDEX]
 
         except Exception as e:
             text_service_logger.error(f"[REMOVE STOPS] Error: {e}")
@@ -58,10 +65,15 @@ class TextService:
         words: List[str], error_service: ErrorService, user_id: int
     ) -> Union[List[str], None]:
         try:
-            norm_words = []
+            norm_words = text_utils.normalize_tokens(
+                words=words,
+                normalizer=lambda word: ma.parse(word)[0].normal_form,
+                cache=lemma_cache,
+            )
 
-            for word in words:
-                norm_words.append(ma.parse(word)[0].normal_form)
+            text_service_logger.info(
+                f"[NORM WORDS] Lemma cache: {TextService.lemma_cache_stats()}"
+            )
 
             return norm_words
 
@@ -80,15 +92,7 @@ class TextService:
         words: List[str], error_service: ErrorService, user_id: int
     ) -> Union[Dict[str, int], None]:
         try:
-            freq_dict = {}
-
-            for word in words:
-                if word not in freq_dict.keys():
-                    freq_dict[word] = 1
-                else:
-                    freq_dict[word] += 1
-
-            return dict(sorted(freq_dict.items(), key=lambda x: x[1], reverse=True))
+            return dict(Counter(words).most_common())
 
         except Exception as e:
             text_service_logger.error(f"[CREATE FREQ] Error: {e}")
@@ -101,134 +105,223 @@ class TextService:
             return None
 
     @staticmethod
-    async def get_translated_clear_text(text, error_service, user_id):
-        text_language = detect(text=text)
+    async def count_words(
+        text: str, error_service: ErrorService, user_id: int
+    ) -> Union[Dict[str, int], None]:
+        try:
+            counts = Counter(
+                text_utils.iter_clean_tokens(text=text, stopwords=STOPWORDS_INDEX)
+            )
 
-        text_without_spec_chars = await TextService.remove_spec_chars(
-            text=text, error_service=error_service, user_id=user_id
-        )
+            norm_words = await TextService.normalize_words(
+                words=counts, error_service=error_service, user_id=user_id
+            )
 
-        words = await TextService.remove_stop_words(
-            text=text_without_spec_chars,
-            error_service=error_service,
-            user_id=user_id,
-        )
+            return text_utils.merge_counts(counts=counts, lemmas=norm_words)
 
-        norm_words = await TextService.normalize_words(
-            words=words, error_service=error_service, user_id=user_id
-        )
+        except Exception as e:
+            text_service_logger.error(f"[COUNT WORDS] Error: {e}")
+
+            error = ErrorCreate(
+                user_id=user_id, message="[COUNT WORDS]", description=str(e)
+            )
+
+            await error_service.add_one(error=error)
+            return None
 
-        freq_dict = await TextService.create_freq_dict(
-            words=norm_words, error_service=error_service, user_id=user_id
+    @staticmethod
+    async def get_translated_clear_text(
+        text: str,
+        error_service: ErrorService,
+        user_id: int,
+        translation_cache: Optional[TranslationCache] = None,
+    ) -> List[Dict[str, Union[str, int]]]:
+        if len(text) > TEXT_STREAM_THRESHOLD:
+            return await TextService.get_translated_clear_text_stream(
+                text=text,
+                error_service=error_service,
+                user_id=user_id,
+                translation_cache=translation_cache,
+            )
+
+        text_language = detect(text=text)
+
+        freq_dict = await TextService.count_words(
+            text=text, error_service=error_service, user_id=user_id
         )
 
         if text_language == "ru":
             translated_words = await TextService.translate_ru_en(
-                words=freq_dict, error_service=error_service, user_id=user_id
+                words=freq_dict,
+                error_service=error_service,
+                user_id=user_id,
+                translation_cache=translation_cache,
             )
 
         else:
             translated_words = await TextService.translate_en_ru(
-                words=freq_dict, error_service=error_service, user_id=user_id
+                words=freq_dict,
+                error_service=error_service,
+                user_id=user_id,
+                translation_cache=translation_cache,
             )
 
         return translated_words
 
     @staticmethod
-    async def translate_en_ru(
-        words: Dict[str, int],
+    async def get_translated_clear_text_stream(
+        text: str,
         error_service: ErrorService,
         user_id: int,
+        translation_cache: Optional[TranslationCache] = None,
+        chunk_size: int = TEXT_STREAM_CHUNK_SIZE,
     ) -> List[Dict[str, Union[str, int]]]:
-        translated_words = []
+        """Chunked variant of get_translated_clear_text for very large texts.
 
-        for word in words:
-            try:
-                inputs = tokenizer_en_ru(word, return_tensors="pt", padding=True)
+        Token stages only ever hold one chunk, counts are merged per lemma and
+        new lemmas are translated in bounded batches as soon as a chunk is done.
+        """
+        direction = RU_EN if detect(text=text[:chunk_size]) == "ru" else EN_RU
 
-                translated = model_en_ru.generate(
-                    **inputs, max_length=50, num_beams=5, no_repeat_ngram_size=2
-                )
+        freq_dict = Counter()
+        translations: Dict[str, Optional[str]] = {}
 
-                translated_text: str = tokenizer_en_ru.decode(
-                    translated[0],
-                    skip_special_tokens=True,
-                    clean_up_tokenization_spaces=True,
+        for counts in text_utils.iter_chunk_counts(
+            text=text, stopwords=STOPWORDS_INDEX, chunk_size=chunk_size
+        ):
+            norm_words = await TextService.normalize_words(
+                words=counts, error_service=error_service, user_id=user_id
+            )
+            chunk_freq = text_utils.merge_counts(counts=counts, lemmas=norm_words)
+            freq_dict.update(chunk_freq)
+
+            new_words = [word for word in chunk_freq if word not in translations]
+
+            for batch in chunked(new_words, TRANSLATION_BATCH_SIZE):
+                translations.update(
+                    await TextService.translate_words(
+                        words=batch,
+                        direction=direction,
+                        error_service=error_service,
+                        user_id=user_id,
+                        translation_cache=translation_cache,
+                    )
                 )
+                for word in batch:
+                    translations.setdefault(word, None)
 
-                translated_text = translated_text.replace(".", "")
-
-                data = {
-                    "ruValue": translated_text.capitalize(),
-                    "enValue": word.capitalize(),
-                    "frequency": words[word],
-                }
-
-                translated_words.append(data)
-
-                text_service_logger.info(
-                    f"[TRANSLATE] EN: {word} -> RU: {translated_text}"
-                )
+        translated_words = []
 
-            except Exception as e:
-                text_service_logger.error(f"[TRANSLATE] Error: {e}")
+        for word, frequency in freq_dict.most_common():
+            if not translations.get(word):
+                continue
 
-                error = ErrorCreate(
-                    user_id=user_id, message="[TRANSLATE]", description=str(e)
-                )
+            en_value, ru_value = word, translations[word]
+            if direction == RU_EN:
+                en_value, ru_value = ru_value, en_value
 
-                await error_service.add_one(error=error)
-                continue
+            translated_words.append(
+                {
+                    "ruValue": ru_value.capitalize(),
+                    "enValue": en_value.capitalize(),
+                    "frequency": frequency,
+                }
+            )
 
         return translated_words
 
     @staticmethod
-    async def translate_ru_en(
-        words: Dict[str, int],
+    async def translate_words(
+        words: List[str],
+        direction: str,
         error_service: ErrorService,
         user_id: int,
-    ) -> List[Dict[str, Union[str, int]]]:
-        translated_words = []
+        translation_cache: Optional[TranslationCache] = None,
+    ) -> Dict[str, str]:
+        translator = translator_en_ru if direction == EN_RU else translator_ru_en
+
+        if translation_cache:
+            translations = await translation_cache.translate(
+                words=words, direction=direction, translator=translator
+            )
+        else:
+            translations = translator.translate(words=words)
+
+        source, target = direction.upper().split("_")
+        translated_words = {}
 
         for word in words:
-            try:
-                inputs = tokenizer_ru_en(word, return_tensors="pt", padding=True)
+            translated_text = translations.get(word)
 
-                translated = model_ru_en.generate(
-                    **inputs, max_length=50, num_beams=5, no_repeat_ngram_size=2
-                )
+            if isinstance(translated_text, Exception):
+                text_service_logger.error(f"[TRANSLATE] Error: {translated_text}")
 
-                translated_text: str = tokenizer_ru_en.decode(
-                    translated[0],
-                    skip_special_tokens=True,
-                    clean_up_tokenization_spaces=True,
+                error = ErrorCreate(
+                    user_id=user_id,
+                    message="[TRANSLATE]",
+                    description=str(translated_text),
                 )
 
-                translated_text = translated_text.replace(".", "")
+                await error_service.add_one(error=error)
+                continue
 
-                data = {
-                    "ruValue": word.capitalize(),
-                    "enValue": translated_text.capitalize(),
-                    "frequency": words[word],
-                }
+            translated_words[word] = translated_text.replace(".", "")
 
-                translated_words.append(data)
+            text_service_logger.info(
+                f"[TRANSLATE] {source}: {word} -> {target}: {translated_words[word]}"
+            )
 
-                text_service_logger.info(
-                    f"[TRANSLATE] RU: {word} -> EN: {translated_text}"
-                )
+        return translated_words
 
-            except Exception as e:
-                text_service_logger.error(f"[TRANSLATE] Error: {e}")
+    @staticmethod
+    async def translate_en_ru(
+        words: Dict[str, int],
+        error_service: ErrorService,
+        user_id: int,
+        translation_cache: Optional[TranslationCache] = None,
+    ) -> List[Dict[str, Union[str, int]]]:
+        translations = await TextService.translate_words(
+            words=list(words),
+            direction=EN_RU,
+            error_service=error_service,
+            user_id=user_id,
+            translation_cache=translation_cache,
+        )
 
-                error = ErrorCreate(
-                    user_id=user_id, message="[TRANSLATE]", description=str(e)
-                )
+        return [
+            {
+                "ruValue": translations[word].capitalize(),
+                "enValue": word.capitalize(),
+                "frequency": words[word],
+            }
+            for word in words
+            if word in translations
+        ]
 
-                await error_service.add_one(error=error)
-                continue
+    @staticmethod
+    async def translate_ru_en(
+        words: Dict[str, int],
+        error_service: ErrorService,
+        user_id: int,
+        translation_cache: Optional[TranslationCache] = None,
+    ) -> List[Dict[str, Union[str, int]]]:
+        translations = await TextService.translate_words(
+            words=list(words),
+            direction=RU_EN,
+            error_service=error_service,
+            user_id=user_id,
+            translation_cache=translation_cache,
+        )
 
-        return translated_words
+        return [
+            {
+                "ruValue": word.capitalize(),
+                "enValue": translations[word].capitalize(),
+                "frequency": words[word],
+            }
+            for word in words
+            if word in translations
+        ]
 
     @staticmethod
     async def translate(
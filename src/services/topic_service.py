@@ -2,6 +2,7 @@ import logging
 from typing import Union, Dict, List
 
 from src.database.models import Topic, SubTopic
+from src.utils.load_plan import NO_RELATIONSHIPS
 from src.utils.repository import AbstractRepository
 from src.utils.logger import topic_service_logger
 
@@ -23,6 +24,9 @@ class TopicService:
     async def get_all(self) -> Union[List[Topic], List[SubTopic], List]:
         return await self.repo.get_all_by_filter()
 
+    async def get_all_flat(self) -> Union[List[Topic], List[SubTopic], List]:
+        return await self.repo.get_all_by_filter(plan=NO_RELATIONSHIPS)
+
     async def update_icon(self, subtopic_id: int, subtopic_data: Dict) -> SubTopic:
         try:
             return await self.repo.update_one_db(
@@ -40,3 +44,7 @@ class TopicService:
         if res:
             return res["documents"][0][0]
         return ""
+
+    async def get_word_subtopic(self, word: str) -> Union[SubTopic, None]:
+        subtopic_title = await self.check_word(word)
+        return await self.get([SubTopic.title == subtopic_title])
@@ -0,0 +1,153 @@
+from collections import Counter
+from typing import Dict, List, Union
+
+from redis import Redis, RedisError
+
+from src.config.instance import TRANSLATION_CACHE_SIZE, TRANSLATION_CACHE_TTL
+from src.database.models import Word
+from src.database.redis_config import redis_connection
+from src.utils.cache import LRUCache
+from src.utils.load_plan import LoadPlan
+from src.utils.repository import AbstractRepository
+from src.utils.logger import text_service_logger
+
+
+EN_RU: str = "en_ru"
+RU_EN: str = "ru_en"
+
+
+class TranslationCache:
+    """Layered word translation cache: process LRU -> Redis -> Word rows -> model.
+
+    The LRU and the counters are shared by every instance in the process.
+    """
+
+    memory = LRUCache(maxsize=TRANSLATION_CACHE_SIZE)
+    counters = Counter()
+
+    def __init__(self, repo: AbstractRepository, redis: Redis = redis_connection):
+        self.repo = repo
+        self.redis = redis
+
+    @staticmethod
+    def redis_key(direction: str, word: str) -> str:
+        return f"translation:{direction}:{word}"
+
+    @classmethod
+    def stats(cls) -> Dict[str, Union[int, float]]:
+        lookups = sum(cls.counters.values())
+        model_calls = cls.counters["model"]
+
+        return {
+            **cls.counters,
+            "lookups": lookups,
+            "hit_rate": round(1 - model_calls / lookups, 4) if lookups else 0.0,
+            "memory_size": len(cls.memory),
+        }
+
+    async def translate(
+        self, words: List[str], direction: str, translator
+    ) -> Dict[str, Union[str, Exception]]:
+        translations: Dict[str, Union[str, Exception]] = {}
+
+        found = self.memory.get_many((direction, word) for word in words)
+        for (_, word), translated in found.items():
+            translations[word] = translated
+        self.counters["memory"] += len(found)
+
+        misses = [word for word in words if word not in translations]
+
+        found = self.get_redis(words=misses, direction=direction)
+        translations.update(found)
+        self.counters["redis"] += len(found)
+
+        misses = [word for word in misses if word not in found]
+
+        db_found = await self.get_db(words=misses, direction=direction)
+        translations.update(db_found)
+        self.counters["db"] += len(db_found)
+
+        misses = [word for word in misses if word not in db_found]
+
+        model_found = {}
+        if misses:
+            for word, translated in translator.translate(words=misses).items():
+                translations[word] = translated
+                if not isinstance(translated, Exception):
+                    model_found[word] = translated
+        self.counters["model"] += len(misses)
+
+        self.set_redis(translations={**db_found, **model_found}, direction=direction)
+        self.memory.set_many(
+            {
+                (direction, word): translated
+                for word, translated in translations.items()
+                if not isinstance(translated, Exception)
+            }
+        )
+
+        text_service_logger.info(f"[TRANSLATION CACHE] Stats: {self.stats()}")
+
+        return translations
+
+    def get_redis(self, words: List[str], direction: str) -> Dict[str, str]:
+        if not words:
+            return {}
+
+        try:
+            values = self.redis.mget(
+                [self.redis_key(direction=direction, word=word) for word in words]
+            )
+        except RedisError as e:
+            text_service_logger.error(f"[TRANSLATION CACHE] Redis error: {e}")
+            return {}
+
+        return {
+            word: value.decode("utf-8")
+            for word, value in zip(words, values)
+            if value is not None
+        }
+
+    def set_redis(self, translations: Dict[str, str], direction: str) -> None:
+        if not translations:
+            return
+
+        try:
+            pipeline = self.redis.pipeline(transaction=False)
+            for word, translated in translations.items():
+                pipeline.set(
+                    self.redis_key(direction=direction, word=word),
+                    translated,
+                    ex=TRANSLATION_CACHE_TTL,
+                )
+            pipeline.execute()
+        except RedisError as e:
+            text_service_logger.error(f"[TRANSLATION CACHE] Redis error: {e}")
+
+    async def get_db(self, words: List[str], direction: str) -> Dict[str, str]:
+        if not words:
+            return {}
+
+        values = {word.capitalize(): word for word in words}
+
+        if direction == EN_RU:
+            source, target = Word.enValue, Word.ruValue
+        else:
+            source, target = Word.ruValue, Word.enValue
+
+        try:
+            rows = await self.repo.get_all_by_filter(
+                filters=[source.in_(values)],
+                plan=LoadPlan(columns=(source, target)),
+            )
+        except Exception as e:
+            text_service_logger.error(f"[TRANSLATION CACHE] DB error: {e}")
+            return {}
+
+        found = {}
+        for row in rows:
+            word = values.get(getattr(row, source.key))
+            if word and word not in found:
+                found[word] = getattr(row, target.key)
+
+        return found
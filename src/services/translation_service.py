@@ -0,0 +1,76 @@
+import torch
+from typing import Dict, List, Union
+from transformers import MarianMTModel, MarianTokenizer
+
+from src.config.instance import (
+    TRANSLATION_BATCH_SIZE,
+    TRANSLATION_MAX_LENGTH,
+    TRANSLATION_NUM_BEAMS,
+)
+from src.utils.batching import length_buckets
+from src.utils.logger import text_service_logger
+
+
+class MarianTranslator:
+    def __init__(
+        self,
+        tokenizer: MarianTokenizer,
+        model: MarianMTModel,
+        batch_size: int = TRANSLATION_BATCH_SIZE,
+    ):
+        self.tokenizer = tokenizer
+        self.model = model
+        self.batch_size = batch_size
+
+    def generate(self, words: List[str]) -> List[str]:
+        with torch.inference_mode():
+            inputs = self.tokenizer(words, return_tensors="pt", padding=True)
+
+            translated = self.model.generate(
+                **inputs,
+                max_length=TRANSLATION_MAX_LENGTH,
+                num_beams=TRANSLATION_NUM_BEAMS,
+                no_repeat_ngram_size=2,
+            )
+
+        return self.tokenizer.batch_decode(
+            translated,
+            skip_special_tokens=True,
+            clean_up_tokenization_spaces=True,
+        )
+
+    def token_lengths(self, words: List[str]) -> Dict[str, int]:
+        # padding follows the longest input of a batch in tokens, which the
+        # character length of a word only approximates
+        try:
+            input_ids = self.tokenizer(words, add_special_tokens=False)["input_ids"]
+            return {word: len(ids) for word, ids in zip(words, input_ids)}
+
+        except Exception as e:
+            text_service_logger.error(f"[TOKEN LENGTHS] Error: {e}")
+            return {word: len(word) for word in words}
+
+    def translate(self, words: List[str]) -> Dict[str, Union[str, Exception]]:
+        """Translate words in batches bucketed by token length.
+
+        A failed batch is retried word by word, so one bad input only costs
+        its own translation: it is returned as the raised exception.
+        """
+        translations: Dict[str, Union[str, Exception]] = {}
+        lengths = self.token_lengths(words)
+
+        for batch in length_buckets(words, self.batch_size, key=lengths.get):
+            try:
+                translations.update(zip(batch, self.generate(batch)))
+                continue
+
+            except Exception as e:
+                text_service_logger.error(f"[TRANSLATE BATCH] Error: {e}")
+
+            for word in batch:
+                try:
+                    translations[word] = self.generate([word])[0]
+                except Exception as e:
+                    translations[word] = e
+
+        return translations
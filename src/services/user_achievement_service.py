@@ -1,4 +1,6 @@
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Union
+
+from sqlalchemy import case, func
 from src.config.instance import (
     ACHIEVEMENT_AUDIO,
     ACHIEVEMENT_LEARNED,
@@ -13,9 +15,112 @@ from src.schemes.achievement_schemas import (
     UserAchievementDump,
     UserAchievementsCategory,
 )
+from src.services.achievement_catalog import AchievementCatalog
 from src.utils.repository import AbstractRepository
 
 
+# metric event counter that moves the achievements of each category
+ACHIEVEMENT_COUNTERS: Dict[str, str] = {
+    ACHIEVEMENT_WORDS: "add_userwords_amount",
+    ACHIEVEMENT_LEARNED: "learned_amount",
+    ACHIEVEMENT_AUDIO: "speech_seconds",
+    ACHIEVEMENT_VIDEO: "video_seconds",
+}
+
+PROGRESS_COLUMNS = (
+    UserAchievement.id,
+    UserAchievement.achievement_id,
+    UserAchievement.progress,
+    UserAchievement.is_completed,
+)
+
+
+def achievement_progress(progress: int, target: int) -> Dict:
+    if progress >= target:
+        return {"is_completed": True, "progress": target, "progress_percent": 100}
+
+    return {
+        "is_completed": False,
+        "progress": progress,
+        "progress_percent": round((progress / target) * 100),
+    }
+
+
+def changed_progress(
+    rows: List, totals: Dict[str, int], catalog: AchievementCatalog
+) -> List[Dict]:
+    # update_many data for the rows whose progress or completion moves
+    updates = []
+
+    for row in rows:
+        entry = catalog.by_id.get(row.achievement_id)
+        if entry is None or entry.category not in totals:
+            continue
+
+        values = achievement_progress(totals[entry.category], entry.target)
+        if (
+            values["progress"] != row.progress
+            or values["is_completed"] != row.is_completed
+        ):
+            updates.append({"id": row.id, **values})
+
+    return updates
+
+
+def progress_is_consistent(rows: List, catalog: AchievementCatalog) -> bool:
+    """Whether the rows of each category agree on the user's total.
+
+    Open rows hold the total and completed ones their target, so the open
+    rows of a category share one progress no lower than any completed
+    target. A row added with progress 0 after others were earned breaks
+    that and needs a resync from the metric totals.
+    """
+    open_progress: Dict[str, set] = {}
+    completed_target: Dict[str, int] = {}
+
+    for row in rows:
+        entry = catalog.by_id[row.achievement_id]
+        if row.is_completed:
+            completed_target[entry.category] = max(
+                completed_target.get(entry.category, 0), entry.target
+            )
+        else:
+            open_progress.setdefault(entry.category, set()).add(row.progress or 0)
+
+    return all(
+        len(progress) == 1 and min(progress) >= completed_target.get(category, 0)
+        for category, progress in open_progress.items()
+    )
+
+
+def increment_values(deltas: Dict[str, int], catalog: AchievementCatalog) -> Dict:
+    # SET clause adding each category's delta to the stored progress, so
+    # concurrent events are serialized by the row lock instead of racing
+    entries = [
+        (entry, delta)
+        for category, delta in deltas.items()
+        for entry in catalog.by_category.get(category, [])
+    ]
+    delta = case(
+        {entry.id: delta for entry, delta in entries},
+        value=UserAchievement.achievement_id,
+    )
+    target = case(
+        {entry.id: entry.target for entry, _ in entries},
+        value=UserAchievement.achievement_id,
+    )
+    progress = func.coalesce(UserAchievement.progress, 0) + delta
+    reached = progress >= target
+
+    return {
+        "progress": case((reached, target), else_=progress),
+        "is_completed": reached,
+        "progress_percent": case(
+            (reached, 100), else_=func.round(progress * 100.0 / target)
+        ),
+    }
+
+
 class UserAchievementService:
     def __init__(self, repo: AbstractRepository):
         self.repo = repo
@@ -113,19 +218,84 @@ class UserAchievementService:
             UserAchievementsCategory(title="Видео", achievements=video),
         ]
 
+    async def add_many(self, user_achievements: List[Dict]) -> None:
+        await self.repo.add_many(data=user_achievements, returning=False)
+
+    async def update_many(self, update_data: List[Dict]) -> None:
+        await self.repo.update_many(data=update_data)
+
+    async def get_progress_rows(
+        self, user_id: int, achievement_ids: Optional[List[int]] = None
+    ) -> List:
+        filters = [UserAchievement.user_id == user_id]
+        if achievement_ids is not None:
+            filters.append(UserAchievement.achievement_id.in_(achievement_ids))
+
+        return await self.repo.get_columns_by_filter(
+            columns=PROGRESS_COLUMNS, filters=filters
+        )
+
+    async def apply_event(
+        self, user_id: int, event: Dict, catalog: AchievementCatalog
+    ) -> Optional[int]:
+        # progress moved by a metric event, None when the rows need a resync
+        deltas = {
+            category: event[counter]
+            for category, counter in ACHIEVEMENT_COUNTERS.items()
+            if event.get(counter, 0) > 0
+        }
+        achievement_ids = [
+            entry.id
+            for category in deltas
+            for entry in catalog.by_category.get(category, [])
+        ]
+        if not achievement_ids:
+            return 0
+
+        rows = await self.get_progress_rows(
+            user_id=user_id, achievement_ids=achievement_ids
+        )
+        if len(rows) < len(achievement_ids):
+            return None
+
+        if not progress_is_consistent(rows=rows, catalog=catalog):
+            return None
+
+        changed = 0
+        async for updated in self.repo.update_in_batches(
+            filters=[
+                UserAchievement.user_id == user_id,
+                UserAchievement.achievement_id.in_(achievement_ids),
+                UserAchievement.is_completed.is_(False),
+            ],
+            values=increment_values(deltas=deltas, catalog=catalog),
+        ):
+            changed += updated
+
+        return changed
+
     async def update_user_achievements(
         self, users: List[User], achievements: List[Achievement]
     ):
+        existing = set(
+            await self.repo.get_columns_by_filter(
+                columns=[UserAchievement.user_id, UserAchievement.achievement_id],
+                filters=[
+                    UserAchievement.user_id.in_([user.id for user in users]),
+                    UserAchievement.achievement_id.in_(
+                        [achievement.id for achievement in achievements]
+                    ),
+                ],
+            )
+        )
 
-        for achievement in achievements:
-            for user in users:
-                if not await self.repo.get_one(
-                    filters=[
-                        UserAchievement.achievement_id == achievement.id,
-                        UserAchievement.user_id == user.id,
-                    ]
-                ):
-                    user_achievemets_data = UserAchievementCreate(
-                        user_id=user.id, achievement_id=achievement.id
-                    )
-                    await self.repo.add_one(data=user_achievemets_data.model_dump())
+        await self.add_many(
+            user_achievements=[
+                UserAchievementCreate(
+                    user_id=user.id, achievement_id=achievement.id
+                ).model_dump()
+                for achievement in achievements
+                for user in users
+                if (user.id, achievement.id) not in existing
+            ]
+        )
@@ -1,17 +1,16 @@
-from typing import List, Union
+from typing import AsyncIterator, Dict, List, Optional, Union
 from datetime import datetime
 import uuid
 from dateutil.parser import parse
 from fastapi import HTTPException, status
+from sqlalchemy import and_, func, or_
 
 from src.config.instance import (
-    ACHIEVEMENT_AUDIO,
-    ACHIEVEMENT_LEARNED,
-    ACHIEVEMENT_VIDEO,
-    ACHIEVEMENT_WORDS,
-    METRIC_URL,
+    ALLOWED_AUDIO_SECONDS,
+    ALLOWED_VIDEO_SECONDS,
+    DEFAULT_ENERGY,
 )
-from src.database.models import Achievement, User, UserAchievement
+from src.database.models import Achievement, Subscription, User, UserAchievement
 from src.schemes.achievement_schemas import UserAchievementCreate
 from src.schemes.admin_schemas import AdminEmailLogin
 
@@ -25,7 +24,12 @@ from src.schemes.user_schemas import (
 )
 from src.schemes.util_schemas import TokenInfo
 from src.services.achievement_service import AchievementService
-from src.services.user_achievement_service import UserAchievementService
+from src.services.achievement_catalog import achievement_catalog
+from src.services.user_achievement_service import (
+    ACHIEVEMENT_COUNTERS,
+    UserAchievementService,
+    changed_progress,
+)
 from src.utils import password as password_utils
 from src.utils import tokens as token_utils
 from src.utils.dependenes.achievement_service_fabric import achievement_service_fabric
@@ -37,7 +41,8 @@ from src.utils.exceptions import (
     UserWithGoogleNotFoundException,
     UserWithVkNotFoundException,
 )
-from src.utils.metric import get_user_data
+from src.utils.metric import PENDING_TOTALS, metric_client
+from src.utils.load_plan import NO_RELATIONSHIPS
 from src.utils.repository import AbstractRepository
 from src.utils.logger import user_service_logger
 
@@ -62,32 +67,66 @@ class UserService:
             user_service_logger.error(f"[GET USER by UWORDS UID] Error: {e}")
             return None
 
-    async def get_users_with_sub(self) -> List[User]:
+    async def update_users_in_batches(self, name: str, filters, values) -> int:
+        total = 0
         try:
-            return await self.repo.get_all_by_filter(
-                filters=[User.subscription_type != None]
-            )
+            async for updated in self.repo.update_in_batches(
+                filters=filters, values=values
+            ):
+                total += updated
+                user_service_logger.info(f"[{name}] Updated {total} users")
         except Exception as e:
-            user_service_logger.error(f"[GET USER with SUB] Error: {e}")
-            return None
+            user_service_logger.error(f"[{name}] Error: {e}")
+        return total
+
+    async def reset_limits(self) -> int:
+        # rows already at the defaults are not rewritten
+        return await self.update_users_in_batches(
+            name="RESET LIMITS",
+            filters=[
+                User.subscription_type == None,
+                or_(
+                    User.allowed_audio_seconds.is_distinct_from(ALLOWED_AUDIO_SECONDS),
+                    User.allowed_video_seconds.is_distinct_from(ALLOWED_VIDEO_SECONDS),
+                    User.energy.is_distinct_from(DEFAULT_ENERGY),
+                ),
+            ],
+            values={
+                "allowed_audio_seconds": ALLOWED_AUDIO_SECONDS,
+                "allowed_video_seconds": ALLOWED_VIDEO_SECONDS,
+                "energy": DEFAULT_ENERGY,
+            },
+        )
 
-    async def get_users_without_sub(self) -> List[User]:
-        try:
-            return await self.repo.get_all_by_filter(
-                filters=[User.subscription_type == None]
-            )
-        except Exception as e:
-            user_service_logger.error(f"[GET USER without SUB] Error: {e}")
-            return None
+    async def expire_subscriptions(self) -> int:
+        # subscription_expired is set on every purchase, rows without it fall
+        # back to the acquisition date plus the tariff's months
+        now = datetime.now()
+        return await self.update_users_in_batches(
+            name="EXPIRE SUBSCRIPTIONS",
+            filters=[
+                User.subscription_type == Subscription.id,
+                or_(
+                    User.subscription_expired <= now,
+                    and_(
+                        User.subscription_expired == None,
+                        User.subscription_acquisition
+                        + func.make_interval(0, Subscription.months)
+                        <= now,
+                    ),
+                ),
+            ],
+            values={"subscription_type": None},
+        )
 
-    async def get_users(self) -> List[User]:
+    async def iter_users(self) -> AsyncIterator[List[User]]:
         try:
-            return await self.repo.get_all_by_filter(
-                filters=[User.is_active == True], order=User.id.asc()
-            )
+            async for users in self.repo.iter_pages(
+                filters=[User.is_active == True], plan=NO_RELATIONSHIPS
+            ):
+                yield users
         except Exception as e:
-            user_service_logger.error(f"[GET USERS] Error: {e}")
-            return None
+            user_service_logger.error(f"[ITER USERS] Error: {e}")
 
     async def get_user_by_provider(
         self, unique: str, provider: str, user_field
@@ -280,70 +319,63 @@ class UserService:
         user_id: int,
         user_achievement_service: UserAchievementService,
     ):
+        # full resync from the metric totals, also creates missing rows
         user = await self.get_user_by_id(user_id=user_id)
+        catalog = await achievement_catalog.load(achievement_service_fabric())
+
+        rows = await user_achievement_service.get_progress_rows(user_id=user_id)
+        existing = {row.achievement_id for row in rows}
+        missing = [
+            UserAchievementCreate(
+                user_id=user_id, achievement_id=achievement_id
+            ).model_dump()
+            for achievement_id in catalog.by_id
+            if achievement_id not in existing
+        ]
+
+        if missing:
+            await user_achievement_service.add_many(user_achievements=missing)
+            rows = await user_achievement_service.get_progress_rows(user_id=user_id)
 
-        achievement_service = achievement_service_fabric()
-        achievements = await achievement_service.get_all()
+        try:
+            metric = await metric_client.get_user_data(uwords_uid=user.uwords_uid)
 
-        for achievement in achievements:
-            if await user_achievement_service.get_one_by_achievement_id(
-                user_id=user_id, achievement_id=achievement.id
-            ):
-                continue
+            totals = {
+                category: metric[PENDING_TOTALS[counter]]
+                for category, counter in ACHIEVEMENT_COUNTERS.items()
+                if metric.get(PENDING_TOTALS[counter]) is not None
+            }
+            updates = changed_progress(rows=rows, totals=totals, catalog=catalog)
 
-            user_achievemets_data = UserAchievementCreate(
-                user_id=user_id, achievement_id=achievement.id
-            )
+            if updates:
+                await user_achievement_service.update_many(update_data=updates)
 
-            await user_achievement_service.add_one(
-                user_achievement=user_achievemets_data.model_dump()
-            )
+        except Exception as e:
+            user_service_logger.error(f"[ACHIEVEMENT USER] Error: {e}")
 
-        user_achievements = await user_achievement_service.get_user_achievements(
-            user_id=user_id
-        )
+    async def apply_achievement_event(
+        self,
+        user_id: int,
+        event: Optional[Dict],
+        user_achievement_service: UserAchievementService,
+    ):
+        # moves only the achievements the event's counters touch
+        if not event:
+            return
 
         try:
-            metric = await get_user_data(
-                uwords_uid=user.uwords_uid, server_url=METRIC_URL
+            catalog = await achievement_catalog.load(achievement_service_fabric())
+            changed = await user_achievement_service.apply_event(
+                user_id=user_id, event=event, catalog=catalog
             )
-
-            for user_achievement in user_achievements:
-                progress = user_achievement.progress
-
-                if user_achievement.achievement.category == ACHIEVEMENT_WORDS:
-                    progress = metric["alltime_userwords_amount"]
-                elif user_achievement.achievement.category == ACHIEVEMENT_LEARNED:
-                    progress = metric["alltime_learned_amount"]
-                elif user_achievement.achievement.category == ACHIEVEMENT_AUDIO:
-                    progress = metric["alltime_speech_seconds"]
-                elif user_achievement.achievement.category == ACHIEVEMENT_VIDEO:
-                    progress = metric["alltime_video_seconds"]
-
-                if user_achievement.progress >= user_achievement.achievement.target:
-                    await user_achievement_service.update_one(
-                        user_achievement_id=user_achievement.id,
-                        update_data={
-                            "is_completed": True,
-                            "progress": user_achievement.achievement.target,
-                            "progress_percent": 100,
-                        },
-                    )
-
-                else:
-                    await user_achievement_service.update_one(
-                        user_achievement_id=user_achievement.id,
-                        update_data={
-                            "is_completed": False,
-                            "progress": progress,
-                            "progress_percent": round(
-                                (progress / user_achievement.achievement.target) * 100
-                            ),
-                        },
-                    )
-
         except Exception as e:
-            user_service_logger.error(f"[ACHIEVEMENT USER] Error: {e}")
+            user_service_logger.error(f"[ACHIEVEMENT EVENT] Error: {e}")
+            return
+
+        if changed is None:
+            await self.check_user_achievemets(
+                user_id=user_id, user_achievement_service=user_achievement_service
+            )
 
     async def update_onboarding_complete(self, user_id: int) -> User:
         user = await self.repo.get_one([User.id == user_id])
@@ -1,14 +1,15 @@
 import logging
 from datetime import datetime, timedelta
 import random
-from typing import Optional, Union, List, Dict
+from typing import Iterable, Optional, Set, Tuple, Union, List, Dict
 from dateutil.relativedelta import relativedelta
 
 from src.schemes.error_schemas import ErrorCreate
 from src.schemes.topic_schemas import SubtopicWords, TopicWords
 
 from src.services.user_word_stop_list_service import UserWordStopListService
-from src.utils.metric import send_user_data
+from src.utils.metric import metric_client
+from src.utils.load_plan import LoadPlan
 from src.utils.repository import AbstractRepository
 
 from src.database.models import UserWord, Word, SubTopic
@@ -24,7 +25,6 @@ from src.services.user_achievement_service import UserAchievementService
 
 from src.config.instance import (
     DEFAULT_SUBTOPIC_ICON,
-    METRIC_URL,
     STUDY_DELAY,
     DEFAULT_SUBTOPIC,
     STUDY_MAX_PROGRESS,
@@ -35,13 +35,20 @@ from src.config.instance import (
 from src.utils.logger import user_service_logger
 
 
+# the word's own columns only, not every other user's UserWord of that word
+USER_WORD_PLAN = LoadPlan(selectin=(UserWord.word,), raiseload=True)
+PICTURES_PLAN = LoadPlan(columns=(Word.pictureLink,))
+
+
 class UserWordService:
     def __init__(self, repo: AbstractRepository):
         self.repo = repo
 
     async def get_user_words(self, user_id: int) -> List[UserWord]:
         return await self.repo.get_all_by_filter(
-            [UserWord.user_id == user_id], UserWord.frequency.desc()
+            [UserWord.user_id == user_id],
+            UserWord.frequency.desc(),
+            plan=USER_WORD_PLAN,
         )
 
     async def get_user_words_by_filter(
@@ -53,7 +60,8 @@ class UserWordService:
                     filters=[
                         UserWord.user_id == user_id,
                         UserWord.word.has(Word.topic == topic_title),
-                    ]
+                    ],
+                    plan=USER_WORD_PLAN,
                 )
 
             return await self.repo.get_all_by_filter(
@@ -61,7 +69,8 @@ class UserWordService:
                     UserWord.user_id == user_id,
                     UserWord.word.has(Word.topic == topic_title),
                     UserWord.word.has(Word.subtopic == subtopic_title),
-                ]
+                ],
+                plan=USER_WORD_PLAN,
             )
 
         except Exception as e:
@@ -224,8 +233,13 @@ class UserWordService:
         try:
             filters = [UserWord.user_id == user_id]
 
-            words_for_pictures = await self.repo.get_all_by_filter(filters=filters)
-            words_pictures = [word_for_pictures.word.pictureLink for word_for_pictures in words_for_pictures]
+            words_pictures = [
+                row.pictureLink
+                for row in await self.repo.get_all_by_filter(
+                    filters=[*filters, UserWord.word_id == Word.id],
+                    plan=PICTURES_PLAN,
+                )
+            ]
 
             if topic_title:
                 filters.append(UserWord.word.has(Word.topic == topic_title))
@@ -234,7 +248,7 @@ class UserWordService:
                 filters.append(UserWord.word.has(Word.subtopic == subtopic_title))
 
             user_words: List[UserWord] = await self.repo.get_all_by_filter(
-                filters=filters, order=UserWord.progress.desc()
+                filters=filters, order=UserWord.progress.desc(), plan=USER_WORD_PLAN
             )
 
             if subtopic_title == DEFAULT_SUBTOPIC:
@@ -285,120 +299,74 @@ class UserWordService:
 
     async def update_progress_word(
         self, user_id: int, uwords_uid: str, words_ids: List[int]
-    ) -> None:
+    ) -> Optional[Dict]:
         try:
             time_now = datetime.now()
             learned = 0
 
-            for word_id in words_ids:
-                user_word: UserWord = await self.repo.get_one(
-                    [UserWord.user_id == user_id, UserWord.id == word_id]
-                )
+            user_words: List[UserWord] = await self.repo.get_many_by_ids(
+                ids=words_ids, filters=[UserWord.user_id == user_id]
+            )
+
+            updates = []
+            for user_word in user_words:
                 if user_word.progress >= STUDY_MAX_PROGRESS:
                     continue
 
-                upd_user_word: UserWord = await self.repo.update_one(
-                    [UserWord.user_id == user_id, UserWord.id == word_id],
-                    {"latest_study": time_now, "progress": user_word.progress + 1},
+                updates.append(
+                    {
+                        "id": user_word.id,
+                        "latest_study": time_now,
+                        "progress": user_word.progress + 1,
+                    }
                 )
-                if upd_user_word.progress == STUDY_MAX_PROGRESS:
+                if user_word.progress + 1 == STUDY_MAX_PROGRESS:
                     learned += 1
 
+            await self.repo.update_many(data=updates)
+
             data = {"uwords_uid": uwords_uid, "learned_amount": learned}
 
-            await send_user_data(data=data, server_url=METRIC_URL)
+            metric_client.send(data=data)
+            return data
 
         except BaseException as e:
             user_service_logger.error(f"[UPLOAD USER WORD] ERROR: {e}")
 
-    async def upload_user_word(
-        self,
-        new_word: Dict,
-        user_id: int,
-        word_service: WordService,
-        subtopic_service: TopicService,
-        error_service: ErrorService,
-        user_word_stop_list_service: UserWordStopListService,
-    ) -> Union[int, int]:
-        try:
-            time_now = datetime.now()
+    async def get_user_word_ids(
+        self, user_id: int, word_ids: Iterable[int]
+    ) -> Set[int]:
+        user_words = await self.repo.get_columns_by_filter(
+            columns=[UserWord.word_id],
+            filters=[UserWord.user_id == user_id, UserWord.word_id.in_(list(word_ids))],
+        )
+        return {user_word.word_id for user_word in user_words}
+
+    @staticmethod
+    def filter_user_words(
+        user_words: List[Dict]
+    ) -> Tuple[Dict[str, int], Dict[str, str]]:
+        frequencies: Dict[str, int] = {}
+        ru_values: Dict[str, str] = {}
 
+        for new_word in user_words:
             en_value = new_word.get("enValue", None)
             ru_value = new_word.get("ruValue", None)
-            frequency = new_word.get("frequency", 0)
-
-            is_new_global = 0
-            is_new_user = 0
 
             if CensoreFilter.is_censore(text=ru_value):
                 user_service_logger.info(f"[UPLOAD WORD] CENSORE: {ru_value}")
-                return 0, 0
+                continue
 
             if CensoreFilter.is_censore(text=en_value):
                 user_service_logger.info(f"[UPLOAD WORD] CENSORE: {en_value}")
-                return 0, 0
-
-            word = await word_service.get_word(en_value=en_value)
-
-            if word:
-                stop_word_list = await user_word_stop_list_service.get_user_word_stop(
-                    user_id=user_id, word_id=word.id
-                )
-
-                if stop_word_list:
-                    if time_now < stop_word_list.delete_at + relativedelta(months=1):
-                        return 0, 0
-
-                    else:
-                        await user_word_stop_list_service.delete_one(
-                            user_word_stop_id=stop_word_list.id
-                        )
-
-            if not word:
-                subtopic_title = await subtopic_service.check_word(en_value)
-                subtopic = await subtopic_service.get(
-                    [SubTopic.title == subtopic_title]
-                )
-                word = await word_service.upload_new_word(
-                    en_value=en_value,
-                    ru_value=ru_value,
-                    topic_title=subtopic.topic_title,
-                    subtopic_title=subtopic_title,
-                )
-
-                if not word:
-                    return 0, 0
-
-                is_new_global = 1
-
-            user_word = await self.get_user_word_by_word_id(
-                user_id=user_id, word_id=word.id
-            )
-            if not user_word:
-                await self.repo.add_one(
-                    {"word_id": word.id, "user_id": user_id, "frequency": frequency}
-                )
-                is_new_user = 1
-            else:
-                user_word_frequency = user_word.frequency + frequency
-                await self.repo.update_one(
-                    [UserWord.user_id == user_id, UserWord.word_id == word.id],
-                    {
-                        "frequency": user_word_frequency,
-                    },
-                )
-
-            return is_new_global, is_new_user
-
-        except BaseException as e:
-            user_service_logger.error(f"[UPLOAD USER WORD] ERROR: {e}")
+                continue
 
-            error = ErrorCreate(
-                user_id=user_id, message="[CREATE FREQ]", description=str(e)
+            frequencies[en_value] = frequencies.get(en_value, 0) + new_word.get(
+                "frequency", 0
             )
+            ru_values.setdefault(en_value, ru_value)
 
-            await error_service.add_one(error=error)
-            return False
+        return frequencies, ru_values
 
     async def upload_user_words(
         self,
@@ -415,20 +383,82 @@ class UserWordService:
         try:
             await MinioUploader.check_buckets()
 
+            time_now = datetime.now()
+            frequencies, ru_values = self.filter_user_words(user_words=user_words)
+
+            word_ids = await word_service.get_word_ids(en_values=frequencies)
+            user_word_stops = await user_word_stop_list_service.get_user_word_stops(
+                user_id=user_id, word_ids=word_ids.values()
+            )
+
+            expired_stop_ids = []
+            for en_value, word_id in list(word_ids.items()):
+                user_word_stop = user_word_stops.get(word_id)
+
+                if not user_word_stop:
+                    continue
+
+                if time_now < user_word_stop.delete_at + relativedelta(months=1):
+                    del frequencies[en_value]
+                    del word_ids[en_value]
+                else:
+                    expired_stop_ids.append(user_word_stop.id)
+
+            if expired_stop_ids:
+                await user_word_stop_list_service.delete_many(
+                    user_word_stop_ids=expired_stop_ids
+                )
+
+            new_words = {
+                en_value: ru_values[en_value]
+                for en_value in frequencies
+                if en_value not in word_ids
+            }
+            uploaded_words = await word_service.upload_new_words(
+                words=new_words, subtopic_service=subtopic_service
+            )
+
             add_words_amount = 0
-            add_userwords_amount = 0
 
-            for user_word in user_words:
-                is_new_global, is_new_user = await self.upload_user_word(
-                    new_word=user_word,
-                    user_id=user_id,
-                    word_service=word_service,
-                    subtopic_service=subtopic_service,
-                    error_service=error_service,
-                    user_word_stop_list_service=user_word_stop_list_service,
+            for en_value, uploaded in uploaded_words.items():
+                if isinstance(uploaded, BaseException):
+                    error = ErrorCreate(
+                        user_id=user_id,
+                        message="[CREATE FREQ]",
+                        description=str(uploaded),
+                    )
+
+                    await error_service.add_one(error=error)
+                    continue
+
+                word, created = uploaded
+
+                if word:
+                    word_ids[en_value] = word.id
+                    add_words_amount += created
+
+            word_frequencies = {
+                word_ids[en_value]: frequency
+                for en_value, frequency in frequencies.items()
+                if en_value in word_ids
+            }
+
+            existing_word_ids = await self.get_user_word_ids(
+                user_id=user_id, word_ids=word_frequencies
+            )
+            add_userwords_amount = len(word_frequencies.keys() - existing_word_ids)
+
+            if word_frequencies:
+                await self.repo.upsert_many(
+                    data=[
+                        {"word_id": word_id, "user_id": user_id, "frequency": frequency}
+                        for word_id, frequency in word_frequencies.items()
+                    ],
+                    index_elements=[UserWord.user_id, UserWord.word_id],
+                    set_=lambda excluded: {
+                        "frequency": UserWord.frequency + excluded.frequency
+                    },
                 )
-                add_words_amount += is_new_global
-                add_userwords_amount += is_new_user
 
             data = {
                 "uwords_uid": uwords_uid,
@@ -436,10 +466,11 @@ class UserWordService:
                 "add_userwords_amount": add_userwords_amount,
             }
 
-            await send_user_data(data=data, server_url=METRIC_URL)
+            metric_client.send(data=data)
 
-            await user_service.check_user_achievemets(
+            await user_service.apply_achievement_event(
                 user_id=user_id,
+                event=data,
                 user_achievement_service=user_achievement_service,
             )
 
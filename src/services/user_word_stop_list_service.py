@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, Union
+from typing import Dict, Iterable, List, Union
 
 from src.database.models import UserWordStopList
 from src.utils.repository import AbstractRepository
@@ -29,5 +29,29 @@ class UserWordStopListService:
             user_word_stop_list_service_logger.error(f"[GET USER WORD] ERROR: {e}")
             return None
 
+    async def get_user_word_stops(
+        self, user_id: int, word_ids: Iterable[int]
+    ) -> Dict[int, UserWordStopList]:
+        user_word_stops = await self.repo.get_columns_by_filter(
+            columns=[
+                UserWordStopList.id,
+                UserWordStopList.word_id,
+                UserWordStopList.delete_at,
+            ],
+            filters=[
+                UserWordStopList.user_id == user_id,
+                UserWordStopList.word_id.in_(list(word_ids)),
+            ],
+        )
+
+        return {
+            user_word_stop.word_id: user_word_stop for user_word_stop in user_word_stops
+        }
+
+    async def delete_many(self, user_word_stop_ids: List[int]) -> None:
+        await self.repo.delete_one(
+            filters=[UserWordStopList.id.in_(user_word_stop_ids)]
+        )
+
     async def delete_one(self, user_word_stop_id: int) -> None:
         await self.repo.delete_one(filters=[UserWordStopList.id == user_word_stop_id])
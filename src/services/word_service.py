@@ -1,18 +1,25 @@
+import asyncio
 import logging
-from typing import Union
+from typing import Dict, Iterable, Optional, Tuple, Union
 
+from src.config.instance import WORD_ENRICHMENT_CONCURRENCY
 from src.database.models import Word
 
 from src.utils.repository import AbstractRepository
+from src.utils.single_flight import SingleFlight
 
 from src.services.audio_service import AudioService
 from src.services.image_service import ImageDownloader
+from src.services.topic_service import TopicService
 from src.utils.logger import word_service_logger
 
 
 class WordService:
-    def __init__(self, repo: AbstractRepository):
+    def __init__(
+        self, repo: AbstractRepository, single_flight: Optional[SingleFlight] = None
+    ):
         self.repo = repo
+        self.single_flight = single_flight or SingleFlight(prefix="word")
 
     async def get_word(self, en_value: str) -> Union[Word, None]:
         try:
@@ -27,29 +34,101 @@ class WordService:
             word_service_logger.error(f"[GET WORD] ERROR: {e}")
             return None
 
+    async def get_word_ids(self, en_values: Iterable[str]) -> Dict[str, int]:
+        words = await self.repo.get_columns_by_filter(
+            columns=[Word.id, Word.enValue],
+            filters=[Word.enValue.in_(list(en_values))],
+        )
+
+        word_ids: Dict[str, int] = {}
+        for word in sorted(words, key=lambda word: word.id):
+            word_ids.setdefault(word.enValue, word.id)
+
+        return word_ids
+
     async def upload_new_word(
-        self, en_value: str, ru_value: str, topic_title: str, subtopic_title: str
-    ) -> Union[Word, None]:
-        try:
-            picture_link = await ImageDownloader.download_picture(word=en_value)
-
-            if not picture_link:
-                return None
-
-            audio_link = await AudioService.word_to_speech(word=en_value)
-
-            word = await self.repo.add_one(
-                {
-                    "enValue": en_value,
-                    "ruValue": ru_value,
-                    "audioLink": audio_link,
-                    "pictureLink": picture_link,
-                    "topic": topic_title,
-                    "subtopic": subtopic_title,
-                }
+        self, en_value: str, ru_value: str, subtopic_service: TopicService
+    ) -> Tuple[Union[Word, None], bool]:
+        created = False
+
+        async def produce() -> Union[Word, None]:
+            nonlocal created
+
+            word = await self.get_word(en_value=en_value)
+            if word:
+                return word
+
+            word = await self.enrich_word(
+                en_value=en_value, ru_value=ru_value, subtopic_service=subtopic_service
             )
-            return word
+            created = word is not None
 
-        except BaseException as e:
-            word_service_logger.error(f"[UPLOAD WORD] ERROR: {e}")
+            return word or await self.get_word(en_value=en_value)
+
+        word = await self.single_flight.run(
+            key=en_value,
+            producer=produce,
+            lookup=lambda: self.get_word(en_value=en_value),
+        )
+
+        return word, created
+
+    async def enrich_word(
+        self, en_value: str, ru_value: str, subtopic_service: TopicService
+    ) -> Union[Word, None]:
+        picture_link, subtopic = await asyncio.gather(
+            ImageDownloader.download_picture(word=en_value),
+            subtopic_service.get_word_subtopic(word=en_value),
+            return_exceptions=True,
+        )
+
+        if isinstance(subtopic, BaseException):
+            raise subtopic
+
+        if not picture_link or isinstance(picture_link, BaseException):
+            word_service_logger.info(f"[UPLOAD WORD] No picture: {en_value}")
             return None
+
+        # only voiced once the word is kept, so no mp3 is left without a row
+        audio_link = await AudioService.word_to_speech(word=en_value)
+
+        return await self.repo.add_one_if_absent(
+            data={
+                "enValue": en_value,
+                "ruValue": ru_value,
+                "audioLink": audio_link,
+                "pictureLink": picture_link,
+                "topic": subtopic.topic_title,
+                "subtopic": subtopic.title,
+            },
+            index_elements=[Word.enValue],
+        )
+
+    async def upload_new_words(
+        self,
+        words: Dict[str, str],
+        subtopic_service: TopicService,
+        concurrency: int = WORD_ENRICHMENT_CONCURRENCY,
+    ) -> Dict[str, Union[Tuple[Union[Word, None], bool], BaseException]]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def upload(
+            en_value: str, ru_value: str
+        ) -> Tuple[Union[Word, None], bool]:
+            async with semaphore:
+                return await self.upload_new_word(
+                    en_value=en_value,
+                    ru_value=ru_value,
+                    subtopic_service=subtopic_service,
+                )
+
+        uploaded_words = await asyncio.gather(
+            *(upload(en_value, ru_value) for en_value, ru_value in words.items()),
+            return_exceptions=True,
+        )
+
+        for en_value, uploaded in zip(words, uploaded_words):
+            if isinstance(uploaded, BaseException):
+                word_service_logger.error(f"[UPLOAD WORD] {en_value} ERROR: {uploaded}")
+
+        return dict(zip(words, uploaded_words))
@@ -0,0 +1,313 @@
+import io
+import os
+import math
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import ffmpeg
+import numpy as np
+import soundfile
+
+from src.config.instance import (
+    AUDIO_SAMPLE_RATE,
+    AUDIO_SEGMENT_SECONDS,
+    AUDIO_VAD_FRAME_MS,
+    AUDIO_VAD_MARGIN_DB,
+    AUDIO_VAD_MIN_DB,
+    AUDIO_VAD_MIN_SILENCE,
+    AUDIO_VAD_MIN_SPEECH,
+    AUDIO_VAD_PADDING,
+)
+
+
+Span = Tuple[float, float]  # start and end in seconds
+
+
+class PCM(NamedTuple):
+    samples: np.ndarray  # mono int16
+    rate: int
+
+    @property
+    def seconds(self) -> float:
+        return len(self.samples) / self.rate
+
+
+Audio = Union[str, PCM]  # a WAV file or decoded samples
+
+
+class AudioChunk:
+    """A chunk for speech recognition.
+
+    In memory it is a tuple of views into the decoded upload, joined only
+    when a recognizer asks for the samples. With temp files on it is a WAV
+    file read back on demand.
+    """
+
+    def __init__(
+        self,
+        parts: Sequence[np.ndarray] = (),
+        rate: int = AUDIO_SAMPLE_RATE,
+        path: Optional[str] = None,
+    ):
+        self.parts = tuple(parts)
+        self.rate = rate
+        self.path = path
+
+    @property
+    def seconds(self) -> float:
+        if self.path:
+            return soundfile.info(self.path).duration
+        return sum(len(part) for part in self.parts) / self.rate
+
+    def samples(self) -> np.ndarray:
+        if self.path:
+            samples, _ = soundfile.read(self.path, dtype="int16")
+            return samples
+        if len(self.parts) == 1:
+            return self.parts[0]
+        return np.concatenate(self.parts)
+
+    def pcm(self) -> bytes:
+        # raw mono 16-bit little endian, the frame data recognizers take
+        return self.samples().tobytes()
+
+    def wav(self) -> bytes:
+        if self.path:
+            with open(file=self.path, mode="rb") as audio:
+                return audio.read()
+
+        buffer = io.BytesIO()
+        soundfile.write(buffer, self.samples(), self.rate, format="WAV")
+        return buffer.getvalue()
+
+
+def decode_audio(
+    path: str, rate: int = AUDIO_SAMPLE_RATE, max_seconds: Optional[float] = None
+) -> PCM:
+    """Decodes any file ffmpeg reads to mono 16-bit samples through a pipe.
+
+    max_seconds stops the decoding early, so memory stays bounded whatever
+    the length of the upload.
+    """
+    out, _ = (
+        ffmpeg.input(str(path), **input_limit(max_seconds))
+        .output("pipe:", format="s16le", acodec="pcm_s16le", ac=1, ar=rate)
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+    # a read-only view of ffmpeg's output, no copy
+    return PCM(samples=np.frombuffer(out, dtype=np.int16), rate=rate)
+
+
+def input_limit(max_seconds: Optional[float]) -> dict:
+    return {} if max_seconds is None else {"t": max_seconds}
+
+
+def convert_audio(
+    path: str,
+    outpath: str,
+    rate: int = AUDIO_SAMPLE_RATE,
+    max_seconds: Optional[float] = None,
+) -> str:
+    # the temp file fallback of decode_audio
+    ffmpeg.input(str(path), **input_limit(max_seconds)).output(
+        str(outpath), ac=1, ar=rate
+    ).overwrite_output().run(quiet=True)
+    return str(outpath)
+
+
+def audio_seconds(audio: Audio) -> float:
+    if isinstance(audio, PCM):
+        return audio.seconds
+    return soundfile.info(audio).duration
+
+
+def segment_audio(
+    path: str,
+    duration: float,
+    max_seconds: Optional[float] = None,
+    segment_seconds: int = AUDIO_SEGMENT_SECONDS,
+) -> List[str]:
+    """Cuts a file into mono WAV chunks {name}_1.wav, {name}_2.wav, ... at once.
+
+    One ffmpeg run decodes the input a single time and its segment muxer
+    starts a new file every segment_seconds. max_seconds stops the decoding
+    early instead of cutting chunks nobody is allowed to use.
+    """
+    seconds = duration if max_seconds is None else min(duration, max_seconds)
+    filename, _ = os.path.splitext(path)
+
+    (
+        ffmpeg.input(str(path), t=seconds)
+        .output(
+            # the muxer formats the name, a literal % has to be doubled
+            f"{filename.replace('%', '%%')}_%d.wav",
+            ac=1,
+            f="segment",
+            segment_time=segment_seconds,
+            segment_start_number=1,
+            reset_timestamps=1,
+        )
+        .overwrite_output()
+        .run(quiet=True)
+    )
+
+    paths = (
+        f"{filename}_{index}.wav"
+        for index in range(1, math.ceil(seconds / segment_seconds) + 1)
+    )
+    return [path for path in paths if os.path.exists(path)]
+
+
+def read_blocks(audio: Audio, blocksize: int) -> Iterator[np.ndarray]:
+    # float32 mono blocks, so a long file is never converted at once
+    if isinstance(audio, PCM):
+        for start in range(0, len(audio.samples), blocksize):
+            yield audio.samples[start : start + blocksize].astype(np.float32) / 32768
+        return
+
+    for block in soundfile.blocks(audio, blocksize=blocksize, dtype="float32"):
+        yield block.mean(axis=1) if block.ndim > 1 else block
+
+
+def frame_features(
+    audio: Audio, frame_ms: int = AUDIO_VAD_FRAME_MS
+) -> Tuple[np.ndarray, np.ndarray, float]:
+    # energy in dBFS and zero-crossing rate per frame, read block by block
+    rate = audio.rate if isinstance(audio, PCM) else soundfile.info(audio).samplerate
+    frame = max(int(rate * frame_ms / 1000), 1)
+    energies, crossings = [], []
+
+    for block in read_blocks(audio, blocksize=frame * 1000):
+        usable = len(block) // frame * frame
+        if not usable:
+            continue
+
+        frames = block[:usable].reshape(-1, frame)
+        rms = np.sqrt(np.mean(frames**2, axis=1))
+        energies.append(20 * np.log10(np.maximum(rms, 1e-10)))
+        signs = np.signbit(frames)
+        crossings.append(np.mean(signs[:, 1:] != signs[:, :-1], axis=1))
+
+    if not energies:
+        return np.empty(0), np.empty(0), frame / rate
+
+    return np.concatenate(energies), np.concatenate(crossings), frame / rate
+
+
+def detect_speech(
+    audio: Audio,
+    frame_ms: int = AUDIO_VAD_FRAME_MS,
+    margin_db: float = AUDIO_VAD_MARGIN_DB,
+    min_db: float = AUDIO_VAD_MIN_DB,
+    min_silence: float = AUDIO_VAD_MIN_SILENCE,
+    min_speech: float = AUDIO_VAD_MIN_SPEECH,
+    padding: float = AUDIO_VAD_PADDING,
+) -> List[Span]:
+    """Speech spans of the audio found from frame energy and zero crossings.
+
+    A frame is speech when it is margin_db above the noise floor (the 10th
+    percentile of frame energy), or half that with a high zero-crossing rate,
+    which keeps quiet fricatives. Pauses shorter than min_silence are bridged,
+    spans shorter than min_speech dropped and the rest padded.
+    """
+    energies, crossings, step = frame_features(audio, frame_ms=frame_ms)
+    if not len(energies):
+        return []
+
+    floor = np.percentile(energies, 10)
+    threshold = max(floor + margin_db, min_db)
+    voiced = energies > threshold
+    unvoiced = (energies > max(floor + margin_db / 2, min_db)) & (crossings > 0.3)
+    speech = np.concatenate(([False], voiced | unvoiced, [False]))
+
+    edges = np.flatnonzero(speech[1:] != speech[:-1])
+    spans: List[Span] = []
+
+    for start, end in zip(edges[::2] * step, edges[1::2] * step):
+        if spans and start - spans[-1][1] < min_silence:
+            spans[-1] = (spans[-1][0], end)
+        else:
+            spans.append((start, end))
+
+    total = len(energies) * step
+    return [
+        (max(start - padding, 0.0), min(end + padding, total))
+        for start, end in spans
+        if end - start >= min_speech
+    ]
+
+
+def pack_speech(
+    spans: List[Span],
+    chunk_seconds: float = AUDIO_SEGMENT_SECONDS,
+    max_seconds: Optional[float] = None,
+) -> List[List[Span]]:
+    # consecutive spans packed into chunks of at most chunk_seconds of audio,
+    # stopping once max_seconds of speech are packed. A span moves to a new
+    # chunk rather than being cut, unless it is longer than a chunk itself.
+    chunks: List[List[Span]] = []
+    length = budget = 0.0
+
+    for start, end in spans:
+        while end > start:
+            if max_seconds is not None and budget >= max_seconds:
+                return chunks
+
+            room = chunk_seconds - length
+            if (
+                not chunks
+                or room < 1e-6
+                or end - start <= chunk_seconds < length + end - start
+            ):
+                chunks.append([])
+                length, room = 0.0, chunk_seconds
+
+            take = min(end - start, room)
+            if max_seconds is not None:
+                take = min(take, max_seconds - budget)
+
+            chunks[-1].append((start, start + take))
+            length += take
+            budget += take
+            start += take
+
+    return chunks
+
+
+def speech_seconds(spans: List[Span]) -> float:
+    return sum(end - start for start, end in spans)
+
+
+def write_chunks(path: str, chunks: List[List[Span]]) -> List[str]:
+    """Writes each chunk's spans back to back as mono {name}_1.wav, {name}_2.wav, ..."""
+    filename, _ = os.path.splitext(path)
+    files = []
+
+    with soundfile.SoundFile(path) as source:
+        rate = source.samplerate
+
+        for index, chunk in enumerate(chunks, start=1):
+            parts = []
+            for start, end in chunk:
+                source.seek(int(start * rate))
+                data = source.read(int((end - start) * rate), dtype="float32")
+                parts.append(data.mean(axis=1) if data.ndim > 1 else data)
+
+            outpath = f"{filename}_{index}.wav"
+            soundfile.write(outpath, np.concatenate(parts), rate, subtype="PCM_16")
+            files.append(outpath)
+
+    return files
+
+
+def slice_chunks(audio: PCM, chunks: List[List[Span]]) -> List[AudioChunk]:
+    # views into the decoded samples, nothing is copied or written
+    return [
+        AudioChunk(
+            parts=[
+                audio.samples[int(start * audio.rate) : int(end * audio.rate)]
+                for start, end in chunk
+            ],
+            rate=audio.rate,
+        )
+        for chunk in chunks
+    ]
@@ -0,0 +1,24 @@
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Sequence, TypeVar
+
+
+T = TypeVar("T")
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    if size < 1:
+        raise ValueError(f"Chunk size must be positive, got {size}")
+
+    iterator = iter(items)
+
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def length_buckets(
+    items: Sequence[T], size: int, key: Callable[[T], int] = len
+) -> List[List[T]]:
+    return list(chunked(sorted(items, key=key), size))
@@ -1,6 +1,16 @@
+from typing import Annotated, Optional
+
+from fastapi import Depends
+
 from src.services.achievement_service import AchievementService
 from src.repositories.repositories import AchievementRepository
+from src.utils.dependenes.unit_of_work_fabric import unit_of_work_fabric
+from src.utils.unit_of_work import UnitOfWork
 
 
-def achievement_service_fabric():
-    return AchievementService(AchievementRepository())
+def achievement_service_fabric(
+    uow: Annotated[
+        Optional[UnitOfWork], Depends(unit_of_work_fabric, scope="function")
+    ] = None,
+):
+    return AchievementService(AchievementRepository(uow=uow))
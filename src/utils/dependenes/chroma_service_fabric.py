@@ -1,10 +1,24 @@
+from typing import Annotated, Optional
+
+from fastapi import Depends
+
 from src.services.topic_service import TopicService
 from src.repositories.repositories import TopicRepository, SubtopicRepository
+from src.utils.dependenes.unit_of_work_fabric import unit_of_work_fabric
+from src.utils.unit_of_work import UnitOfWork
 
 
-def topic_service_fabric():
-    return TopicService(TopicRepository())
+def topic_service_fabric(
+    uow: Annotated[
+        Optional[UnitOfWork], Depends(unit_of_work_fabric, scope="function")
+    ] = None,
+):
+    return TopicService(TopicRepository(uow=uow))
 
 
-def subtopic_service_fabric():
-    return TopicService(SubtopicRepository())
+def subtopic_service_fabric(
+    uow: Annotated[
+        Optional[UnitOfWork], Depends(unit_of_work_fabric, scope="function")
+    ] = None,
+):
+    return TopicService(SubtopicRepository(uow=uow))
@@ -1,6 +1,16 @@
+from typing import Annotated, Optional
+
+from fastapi import Depends
+
 from src.services.feedback_service import FeedbackService
 from src.repositories.repositories import FeedbackRepository
+from src.utils.dependenes.unit_of_work_fabric import unit_of_work_fabric
+from src.utils.unit_of_work import UnitOfWork
 
 
-def feedback_service_fabric():
-    return FeedbackService(FeedbackRepository())
+def feedback_service_fabric(
+    uow: Annotated[
+        Optional[UnitOfWork], Depends(unit_of_work_fabric, scope="function")
+    ] = None,
+):
+    return FeedbackService(FeedbackRepository(uow=uow))
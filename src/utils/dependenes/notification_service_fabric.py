@@ -0,0 +1,6 @@
+from src.services.notification_service import NotificationService
+from src.repositories.repositories import UserRepository
+
+
+def notification_service_fabric():
+    return NotificationService(UserRepository())
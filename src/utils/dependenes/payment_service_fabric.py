@@ -1,6 +1,16 @@
+from typing import Annotated, Optional
+
+from fastapi import Depends
+
 from src.repositories.repositories import PaymentRepository
 from src.services.payment_service import PaymentService
+from src.utils.dependenes.unit_of_work_fabric import unit_of_work_fabric
+from src.utils.unit_of_work import UnitOfWork
 
 
-def payment_service_fabric():
-    return PaymentService(PaymentRepository())
+def payment_service_fabric(
+    uow: Annotated[
+        Optional[UnitOfWork], Depends(unit_of_work_fabric, scope="function")
+    ] = None,
+):
+    return PaymentService(PaymentRepository(uow=uow))
@@ -1,6 +1,16 @@
+from typing import Annotated, Optional
+
+from fastapi import Depends
+
 from src.repositories.repositories import SubscriptionRepository
 from src.services.subscription_service import SubscriptionService
+from src.utils.dependenes.unit_of_work_fabric import unit_of_work_fabric
+from src.utils.unit_of_work import UnitOfWork
 
 
-def sub_service_fabric():
-    return SubscriptionService(SubscriptionRepository())
+def sub_service_fabric(
+    uow: Annotated[
+        Optional[UnitOfWork], Depends(unit_of_work_fabric, scope="function")
+    ] = None,
+):
+    return SubscriptionService(SubscriptionRepository(uow=uow))
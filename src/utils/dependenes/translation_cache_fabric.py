@@ -0,0 +1,6 @@
+from src.services.translation_cache import TranslationCache
+from src.repositories.repositories import WordRepository
+
+
+def translation_cache_fabric():
+    return TranslationCache(WordRepository())
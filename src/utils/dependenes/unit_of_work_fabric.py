@@ -0,0 +1,22 @@
+from typing import Annotated, AsyncIterator
+
+from fastapi import Depends, HTTPException
+
+from src.utils.unit_of_work import UnitOfWork
+
+
+async def unit_of_work_fabric() -> AsyncIterator[UnitOfWork]:
+    async with UnitOfWork() as uow:
+        try:
+            yield uow
+        except HTTPException:
+            # an error response keeps what the request wrote before it, as when
+            # every repository call committed on its own
+            await uow.commit()
+            raise
+
+
+# the same instance the service fabrics of the request get
+RequestUnitOfWork = Annotated[
+    UnitOfWork, Depends(unit_of_work_fabric, scope="function")
+]
@@ -1,6 +1,16 @@
+from typing import Annotated, Optional
+
+from fastapi import Depends
+
 from src.services.user_achievement_service import UserAchievementService
 from src.repositories.repositories import UserAchievementRepository
+from src.utils.dependenes.unit_of_work_fabric import unit_of_work_fabric
+from src.utils.unit_of_work import UnitOfWork
 
 
-def user_achievement_service_fabric():
-    return UserAchievementService(UserAchievementRepository())
+def user_achievement_service_fabric(
+    uow: Annotated[
+        Optional[UnitOfWork], Depends(unit_of_work_fabric, scope="function")
+    ] = None,
+):
+    return UserAchievementService(UserAchievementRepository(uow=uow))
@@ -1,6 +1,16 @@
+from typing import Annotated, Optional
+
+from fastapi import Depends
+
 from src.services.user_word_stop_list_service import UserWordStopListService
 from src.repositories.repositories import UserWordStopListRepository
+from src.utils.dependenes.unit_of_work_fabric import unit_of_work_fabric
+from src.utils.unit_of_work import UnitOfWork
 
 
-def user_word_stop_list_service_fabric():
-    return UserWordStopListService(UserWordStopListRepository())
+def user_word_stop_list_service_fabric(
+    uow: Annotated[
+        Optional[UnitOfWork], Depends(unit_of_work_fabric, scope="function")
+    ] = None,
+):
+    return UserWordStopListService(UserWordStopListRepository(uow=uow))
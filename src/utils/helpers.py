@@ -1,11 +1,14 @@
 import re
 import logging
 import mimetypes
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 from fastapi import HTTPException, status
 
 from src.config.instance import (
+    AUDIO_DECODE_SLACK,
+    AUDIO_MAX_SECONDS,
+    AUDIO_SEGMENT_SECONDS,
     ALLOWED_AUDIO_MIME_TYPES,
     ALLOWED_YOUTUBE_LINK_PATTERNS,
     ALLOWED_ICON_MIME_TYPES,
@@ -66,6 +69,23 @@ async def check_youtube_link(link: str) -> bool:
     )
 
 
+def get_max_decode_seconds(type: str, user: User) -> Optional[float]:
+    """Seconds of an upload worth decoding before the quota is known.
+
+    Subscribers have no quota, so their uploads are decoded in full (None).
+    Other users get the speech they have left times AUDIO_DECODE_SLACK, as
+    pauses are decoded too, up to AUDIO_MAX_SECONDS.
+    """
+    if user.subscription_type:
+        return None
+
+    remained_seconds = (
+        user.allowed_audio_seconds if type == "audio" else user.allowed_video_seconds
+    )
+    allowed = max(remained_seconds or 0, AUDIO_SEGMENT_SECONDS) * AUDIO_DECODE_SLACK
+    return min(allowed, AUDIO_MAX_SECONDS)
+
+
 async def get_allowed_iterations_and_metric_data(
     type: str, user: User, duration: int
 ) -> Tuple[int, Dict, Dict]:
@@ -0,0 +1,131 @@
+"""EXPLAIN the repository's canonical hot-path queries and flag sequential scans.
+
+Sequential scans are discouraged (enable_seqscan = off) so a small development
+table still shows whether an index *could* serve the query; a Seq Scan that
+survives means there is no usable index.
+
+Usage: python -m src.utils.index_advisor [--allow-seqscan]
+"""
+
+import sys
+import asyncio
+import argparse
+from typing import Any, Dict, Iterator, List, Tuple
+
+from sqlalchemy import Select, select, text
+from sqlalchemy.dialects import postgresql
+
+from src.database.db_config import async_session_maker, dispose_engine
+from src.database.models import (
+    Bill,
+    Error,
+    User,
+    UserAchievement,
+    UserWord,
+    UserWordStopList,
+    Word,
+)
+
+
+CANONICAL_QUERIES: List[Tuple[str, Select]] = [
+    (
+        "user words of a user",
+        select(UserWord)
+        .filter(UserWord.user_id == 1)
+        .order_by(UserWord.frequency.desc()),
+    ),
+    (
+        "user word of a user and word",
+        select(UserWord).filter(UserWord.user_id == 1, UserWord.word_id == 1),
+    ),
+    ("user words of words", select(UserWord).filter(UserWord.word_id.in_([1, 2]))),
+    ("words by enValue", select(Word).filter(Word.enValue.in_(["House", "Tree"]))),
+    ("words by ruValue", select(Word).filter(Word.ruValue.in_(["Дом", "Дерево"]))),
+    (
+        "words of a subtopic",
+        select(Word).filter(Word.topic == "Nature", Word.subtopic == "Trees"),
+    ),
+    (
+        "stop list of a user and words",
+        select(UserWordStopList).filter(
+            UserWordStopList.user_id == 1, UserWordStopList.word_id.in_([1, 2])
+        ),
+    ),
+    (
+        "user achievement",
+        select(UserAchievement).filter(
+            UserAchievement.user_id == 1, UserAchievement.achievement_id == 1
+        ),
+    ),
+    (
+        "users of achievements",
+        select(UserAchievement.user_id, UserAchievement.achievement_id).filter(
+            UserAchievement.achievement_id.in_([1, 2])
+        ),
+    ),
+    (
+        "errors of a user",
+        select(Error).filter(Error.user_id == 1).order_by(Error.id.desc()),
+    ),
+    ("bill by label", select(Bill).filter(Bill.label == "1")),
+    ("user by uwords uid", select(User).filter(User.uwords_uid == "uid")),
+]
+
+
+def iter_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from iter_nodes(child)
+
+
+def find_seq_scans(explain: List[Dict[str, Any]]) -> List[str]:
+    """Relations read by a Seq Scan node in EXPLAIN (FORMAT JSON) output."""
+    return [
+        node["Relation Name"]
+        for statement in explain
+        for node in iter_nodes(statement["Plan"])
+        if node["Node Type"] == "Seq Scan"
+    ]
+
+
+def to_sql(stmt: Select) -> str:
+    return str(
+        stmt.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+async def advise(allow_seqscan: bool = False) -> List[Tuple[str, List[str]]]:
+    report = []
+
+    async with async_session_maker() as session:
+        if not allow_seqscan:
+            await session.execute(text("SET LOCAL enable_seqscan = off"))
+
+        for name, stmt in CANONICAL_QUERIES:
+            res = await session.execute(text(f"EXPLAIN (FORMAT JSON) {to_sql(stmt)}"))
+            report.append((name, find_seq_scans(res.scalar_one())))
+
+        await session.rollback()
+
+    await dispose_engine()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--allow-seqscan", action="store_true")
+    args = parser.parse_args()
+
+    report = asyncio.run(advise(allow_seqscan=args.allow_seqscan))
+
+    for name, relations in report:
+        status = f"SEQ SCAN on {', '.join(relations)}" if relations else "ok"
+        print(f"{name:<32} {status}")
+
+    sys.exit(1 if any(relations for _, relations in report) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+from dataclasses import dataclass
+from typing import Any, List, Tuple
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import noload, raiseload, selectinload
+
+
+@dataclass(frozen=True)
+class LoadPlan:
+    """What a repository read loads instead of the models' lazy="selectin" graph.
+
+    columns   - project these columns, the read returns rows instead of entities
+    selectin  - relationships to load, a path is an attribute or a tuple of them
+    noload    - relationships left as empty collections / None
+    raiseload - raise on access to any relationship the plan does not name
+    """
+
+    columns: Tuple[Any, ...] = ()
+    selectin: Tuple[Any, ...] = ()
+    noload: Tuple[Any, ...] = ()
+    raiseload: bool = False
+
+    @property
+    def is_projection(self) -> bool:
+        return bool(self.columns)
+
+    def options(self) -> List:
+        options = []
+
+        for path in self.selectin:
+            path = path if isinstance(path, tuple) else (path,)
+            loader = selectinload(path[0])
+            for attribute in path[1:]:
+                loader = loader.selectinload(attribute)
+            # the wildcard only reaches the root entity, cut each path's tail too
+            options.append(loader.raiseload("*") if self.raiseload else loader)
+
+        options.extend(noload(attribute) for attribute in self.noload)
+
+        if self.raiseload:
+            options.append(raiseload("*"))
+
+        return options
+
+    def select(self, model) -> Select:
+        if self.is_projection:
+            return select(*self.columns)
+        return select(model).options(*self.options())
+
+
+# every relationship skipped, for reads that only touch the entity's own columns
+NO_RELATIONSHIPS = LoadPlan(raiseload=True)
@@ -52,4 +52,9 @@ word_service_logger = setup_logger("[SERVICES WORDS]", logging.INFO)
 auth_utils_logger = setup_logger("[AUTH UTILS]", logging.INFO)
 helpers_utils_logger = setup_logger("[HELPERS UTILS]", logging.INFO)
 metric_utils_logger = setup_logger("[METRIC UTILS]", logging.INFO)
+single_flight_utils_logger = setup_logger("[SINGLE FLIGHT UTILS]", logging.INFO)
+smtp_sender_utils_logger = setup_logger("[SMTP SENDER UTILS]", logging.INFO)
+pubsub_utils_logger = setup_logger("[PUBSUB UTILS]", logging.INFO)
+error_service_logger = setup_logger("[SERVICES ERROR]", logging.INFO)
+notification_service_logger = setup_logger("[SERVICES NOTIFICATION]", logging.INFO)
 achievement_router_logger = setup_logger("[ACHIEVEMENT ROUTER]", logging.INFO)
@@ -1,61 +1,443 @@
+import os
+import json
+import time
+import asyncio
 import aiohttp
+from pathlib import Path
 from urllib.parse import urlencode
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
-from src.config.instance import METRIC_TOKEN
+from fastapi import Response
+from redis import Redis, RedisError
+
+from src.config.instance import (
+    METRIC_BATCH_SIZE,
+    METRIC_CACHE_REFRESH_LEASE,
+    METRIC_CACHE_STALE_TTL,
+    METRIC_CACHE_TTL,
+    METRIC_FLUSH_INTERVAL,
+    METRIC_MAX_RETRIES,
+    METRIC_POOL_SIZE,
+    METRIC_RETRY_DELAY,
+    METRIC_SPOOL_DIR,
+    METRIC_TIMEOUT,
+    METRIC_TOKEN,
+    METRIC_URL,
+)
+from src.database.redis_config import redis_connection
 from src.schemes.user_schemas import UserMetric
+from src.utils.batching import chunked
 from src.utils.logger import metric_utils_logger
 
 
-async def send_user_data(data: dict, server_url: str):
-    async with aiohttp.ClientSession() as session:
+async def send_user_data(
+    data: dict, server_url: str, session: Optional[aiohttp.ClientSession] = None
+) -> bool:
+    if session is None:
+        async with aiohttp.ClientSession() as session:
+            return await send_user_data(
+                data=data, server_url=server_url, session=session
+            )
+
+    try:
+        async with session.post(
+            url=server_url,
+            headers={"Authorization": f"Bearer {METRIC_TOKEN}"},
+            json=data,
+        ) as response:
+            if response.status == 200:
+                metric_utils_logger.info(f"Successfully sent data to server")
+                return True
+            else:
+                response_text = await response.text()
+                metric_utils_logger.error(
+                    f"Failed to send data to server. Status code: {response.status}. Response: {response_text}"
+                )
+                return False
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        metric_utils_logger.error(f"Request exception occurred: {e}")
+        return False
+
+
+async def get_user_data(
+    uwords_uid: str, server_url: str, session: Optional[aiohttp.ClientSession] = None
+) -> dict:
+    if session is None:
+        async with aiohttp.ClientSession() as session:
+            return await get_user_data(
+                uwords_uid=uwords_uid, server_url=server_url, session=session
+            )
+
+    try:
+        query = urlencode(
+            {"uwords_uid": uwords_uid, "is_union": True, "metric_range": "alltime"}
+        )
+        async with session.get(
+            url=f"{server_url}?{query}",
+            headers={"Authorization": f"Bearer {METRIC_TOKEN}"},
+        ) as response:
+            if response.status == 200:
+                data = await response.json()
+                metric_utils_logger.info(
+                    f"Successfully retrieved additional user data: {data}"
+                )
+                return data
+            else:
+                response_text = await response.text()
+                metric_utils_logger.error(
+                    f"Failed to retrieve additional user data. Status code: {response.status}. Response: {response_text}"
+                )
+                return None
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        metric_utils_logger.error(f"Request exception occurred: {e}")
+        return None
+
+
+# event counters and the alltime totals the server reports for them
+PENDING_TOTALS: Dict[str, str] = {
+    "add_userwords_amount": "alltime_userwords_amount",
+    "learned_amount": "alltime_learned_amount",
+    "speech_seconds": "alltime_speech_seconds",
+    "video_seconds": "alltime_video_seconds",
+}
+
+METRIC_CACHE_AGE_HEADER: str = "X-Metric-Cache-Age"
+
+
+def coalesce(pending: Dict[str, dict], data: dict) -> None:
+    # counters of the same user are summed, anything else keeps the last value
+    current = pending.setdefault(data["uwords_uid"], {})
+
+    for key, value in data.items():
+        previous = current.get(key)
+        if (
+            isinstance(value, (int, float))
+            and not isinstance(value, bool)
+            and isinstance(previous, (int, float))
+        ):
+            current[key] = previous + value
+        else:
+            current[key] = value
+
+
+def add_counters(data: dict, counters: dict) -> dict:
+    data = dict(data)
+
+    for key, total in PENDING_TOTALS.items():
+        value = counters.get(key)
+        if value and data.get(total) is not None:
+            data[total] += value
+
+    return data
+
+
+class MetricCache:
+    """Redis copy of the metric totals of each user, served stale while refreshed.
+
+    An entry is fresh for ttl seconds; after that it is still served for up to
+    stale_ttl seconds while the one worker holding the refresh lease refetches
+    it. Delivered events are added to the copy, which is then marked stale.
+    """
+
+    def __init__(
+        self,
+        prefix: str = "metric",
+        redis: Redis = redis_connection,
+        ttl: int = METRIC_CACHE_TTL,
+        stale_ttl: int = METRIC_CACHE_STALE_TTL,
+        refresh_lease: int = METRIC_CACHE_REFRESH_LEASE,
+    ):
+        self.prefix = prefix
+        self.redis = redis
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.refresh_lease = refresh_lease
+
+    def key(self, uwords_uid: str) -> str:
+        return f"{self.prefix}:{uwords_uid}"
+
+    def get(self, uwords_uid: str) -> Optional[Tuple[dict, float]]:
         try:
-            async with session.post(
-                url=server_url,
-                headers={"Authorization": f"Bearer {METRIC_TOKEN}"},
-                json=data,
-            ) as response:
-                if response.status == 200:
-                    metric_utils_logger.info(f"Successfully sent data to server")
-                else:
-                    response_text = await response.text()
-                    metric_utils_logger.error(
-                        f"Failed to send data to server. Status code: {response.status}. Response: {response_text}"
-                    )
-        except aiohttp.ClientError as e:
-            metric_utils_logger.error(f"Request exception occurred: {e}")
-
-
-async def get_user_data(uwords_uid: str, server_url: str) -> dict:
-    async with aiohttp.ClientSession() as session:
+            raw = self.redis.get(self.key(uwords_uid))
+        except RedisError as e:
+            metric_utils_logger.error(f"[CACHE GET] Redis error: {e}")
+            return None
+
+        if raw is None:
+            return None
+
+        entry = json.loads(raw)
+        return entry["data"], max(time.time() - entry["fetched_at"], 0.0)
+
+    def set(self, uwords_uid: str, data: dict, fetched_at: Optional[float] = None):
+        entry = {"data": data, "fetched_at": fetched_at or time.time()}
+
+        try:
+            self.redis.set(self.key(uwords_uid), json.dumps(entry), ex=self.stale_ttl)
+        except RedisError as e:
+            metric_utils_logger.error(f"[CACHE SET] Redis error: {e}")
+
+    def invalidate(self, uwords_uid: str, counters: dict) -> None:
+        cached = self.get(uwords_uid)
+        if cached is None:
+            return
+
+        data, _ = cached
+        self.set(
+            uwords_uid,
+            add_counters(data, counters),
+            fetched_at=time.time() - self.ttl,
+        )
+
+    def acquire_refresh(self, uwords_uid: str) -> bool:
         try:
-            query = urlencode(
-                {"uwords_uid": uwords_uid, "is_union": True, "metric_range": "alltime"}
+            return bool(
+                self.redis.set(
+                    f"lease:{self.key(uwords_uid)}", 1, nx=True, px=self.refresh_lease
+                )
             )
-            async with session.get(
-                url=f"{server_url}?{query}",
-                headers={"Authorization": f"Bearer {METRIC_TOKEN}"},
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    metric_utils_logger.info(
-                        f"Successfully retrieved additional user data: {data}"
-                    )
-                    return data
-                else:
-                    response_text = await response.text()
-                    metric_utils_logger.error(
-                        f"Failed to retrieve additional user data. Status code: {response.status}. Response: {response_text}"
-                    )
-                    return None
-        except aiohttp.ClientError as e:
-            metric_utils_logger.error(f"Request exception occurred: {e}")
-            return None
+        except RedisError as e:
+            metric_utils_logger.error(f"[CACHE REFRESH] Redis error: {e}")
+            return False
+
+
+class MetricClient:
+    """Buffers metric events in process and ships them from the background.
+
+    send() only coalesces the event into a per-uwords_uid buffer, so request
+    latency does not depend on the metric server. The buffer is flushed every
+    flush_interval seconds or once batch_size users are pending, over one
+    pooled session. Events still failing after max_retries are appended to a
+    spool file and replayed by a later flush of any process. Reads add the
+    counters still buffered here, so a user sees their own progress at once,
+    and go through the cache when one is given.
+
+    The session and flush task belong to the running event loop; code that
+    runs its own loop (Celery tasks under async_to_sync) must await close()
+    before the loop ends.
+    """
+
+    def __init__(
+        self,
+        server_url: Optional[str] = METRIC_URL,
+        batch_size: int = METRIC_BATCH_SIZE,
+        flush_interval: float = METRIC_FLUSH_INTERVAL,
+        max_retries: int = METRIC_MAX_RETRIES,
+        retry_delay: float = METRIC_RETRY_DELAY,
+        pool_size: int = METRIC_POOL_SIZE,
+        spool_dir: Path = METRIC_SPOOL_DIR,
+        cache: Optional[MetricCache] = None,
+    ):
+        self.server_url = server_url
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.pool_size = pool_size
+        self.spool_dir = Path(spool_dir)
+        self.cache = cache
+
+        self.pending: Dict[str, dict] = {}
+        self.sending: Dict[str, dict] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.task: Optional[asyncio.Task] = None
+        self.flushing: Optional[asyncio.Task] = None
+        self.refreshing: Set[asyncio.Task] = set()
+
+    def bind(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+
+        if loop is not self.loop:
+            self.loop = loop
+            self.session = None
+            self.task = None
+            self.flushing = None
+            self.refreshing = set()
+
+        return loop
+
+    def get_session(self) -> aiohttp.ClientSession:
+        self.bind()
+
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(total=METRIC_TIMEOUT),
+            )
+
+        return self.session
+
+    def send(self, data: dict) -> None:
+        coalesce(self.pending, data)
+        loop = self.bind()
+
+        if self.task is None or self.task.done():
+            self.task = loop.create_task(self.run())
+
+        if len(self.pending) >= self.batch_size:
+            self.schedule_flush()
+
+    def schedule_flush(self) -> None:
+        # one flush at a time, a pending batch waits for the next one
+        if self.flushing is None or self.flushing.done():
+            self.flushing = self.loop.create_task(self.flush())
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.schedule_flush()
+
+    async def deliver(self, data: dict) -> bool:
+        session = self.get_session()
+
+        for attempt in range(self.max_retries):
+            if attempt:
+                await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+
+            if await send_user_data(
+                data=data, server_url=self.server_url, session=session
+            ):
+                # the server's totals hold the event now, read() must not
+                # add it on top while the rest of the flush is in flight
+                self.sending.pop(data["uwords_uid"], None)
+                if self.cache is not None:
+                    self.cache.invalidate(data["uwords_uid"], counters=data)
+                return True
+
+        return False
+
+    async def flush(self) -> int:
+        batch, self.pending = self.pending, {}
+        for data in self.claim_spool():
+            coalesce(batch, data)
+        self.sending = batch
+
+        if not batch:
+            return 0
+
+        events = list(batch.values())
+        sent = 0
+
+        for start, chunk in zip(
+            range(0, len(events), self.pool_size), chunked(events, self.pool_size)
+        ):
+            results = await asyncio.gather(*(self.deliver(data) for data in chunk))
+            sent += sum(results)
+
+            failed = [data for data, ok in zip(chunk, results) if not ok]
+            if failed:
+                # the server is down, keep the rest for a later flush
+                self.spool(failed + events[start + len(chunk) :])
+                break
+
+        self.sending = {}
+        metric_utils_logger.info(f"[FLUSH] Sent {sent}/{len(events)} events")
+        return sent
+
+    def spool_path(self) -> Path:
+        return self.spool_dir / f"metric-{os.getpid()}.jsonl"
+
+    def spool(self, events: List[dict]) -> None:
+        try:
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.spool_path(), "a", encoding="utf-8") as file:
+                file.writelines(json.dumps(data) + "\n" for data in events)
+            metric_utils_logger.error(f"[SPOOL] Spooled {len(events)} events")
+        except OSError as e:
+            metric_utils_logger.error(f"[SPOOL] Lost {len(events)} events: {e}")
+
+    def claim_spool(self) -> Iterable[dict]:
+        if not self.spool_dir.is_dir():
+            return
+
+        for path in self.spool_dir.glob("metric-*.jsonl"):
+            # renaming is atomic, so only one process replays a file
+            claimed = path.with_suffix(f".{os.getpid()}.replay")
+            try:
+                path.rename(claimed)
+                with open(claimed, encoding="utf-8") as file:
+                    lines = file.readlines()
+                claimed.unlink()
+            except OSError:
+                continue
+
+            for line in lines:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    metric_utils_logger.error(f"[SPOOL] Bad line in {path}")
+
+    async def fetch(self, uwords_uid: str) -> Optional[dict]:
+        data = await get_user_data(
+            uwords_uid=uwords_uid,
+            server_url=self.server_url,
+            session=self.get_session(),
+        )
+
+        if data and self.cache is not None:
+            self.cache.set(uwords_uid, data)
+
+        return data
+
+    async def read(self, uwords_uid: str) -> Tuple[Optional[dict], Optional[float]]:
+        # metric totals and their age in seconds, 0 when fetched right now
+        cached = self.cache.get(uwords_uid) if self.cache is not None else None
+
+        if cached is None:
+            data = await self.fetch(uwords_uid)
+            age = 0.0 if data else None
+        else:
+            data, age = cached
+            if age >= self.cache.ttl and self.cache.acquire_refresh(uwords_uid):
+                task = self.bind().create_task(self.fetch(uwords_uid))
+                self.refreshing.add(task)
+                task.add_done_callback(self.refreshing.discard)
+
+        if not data:
+            return data, age
+
+        # counters not yet accepted by the server are added on top of its totals
+        for batch in (self.sending, self.pending):
+            data = add_counters(data, batch.get(uwords_uid, {}))
+
+        return data, age
+
+    async def get_user_data(self, uwords_uid: str) -> Optional[dict]:
+        data, _ = await self.read(uwords_uid)
+        return data
+
+    async def close(self) -> None:
+        # state left from a finished loop is dropped by bind()
+        self.bind()
+
+        if self.task is not None:
+            self.task.cancel()
+        if self.flushing is not None:
+            await self.flushing
+
+        await self.flush()
+        await asyncio.gather(*self.refreshing)
+
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+        self.loop = self.session = self.task = self.flushing = None
+
+
+metric_client = MetricClient(cache=MetricCache())
 
 
 async def get_user_metric(
-    user_id: int, user_days: int, uwords_uid: str, server_url: str
+    user_id: int,
+    user_days: int,
+    uwords_uid: str,
+    response: Optional[Response] = None,
 ):
-    user_metric = await get_user_data(uwords_uid=uwords_uid, server_url=server_url)
+    user_metric, age = await metric_client.read(uwords_uid=uwords_uid)
+
+    if response is not None and age is not None:
+        response.headers[METRIC_CACHE_AGE_HEADER] = str(int(age))
 
     if user_metric:
         return UserMetric(
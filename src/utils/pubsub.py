@@ -0,0 +1,82 @@
+import asyncio
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set
+
+from redis import RedisError
+from redis.asyncio import Redis
+
+from src.config.instance import (
+    PUBSUB_QUEUE_SIZE,
+    PUBSUB_READY_TIMEOUT,
+    PUBSUB_RECONNECT_DELAY,
+)
+from src.database.redis_config import async_redis_connection
+from src.utils.logger import pubsub_utils_logger
+
+
+class PubSubHub:
+    """One Redis pattern subscription per process, fanned out to local queues.
+
+    Every listener gets its own bounded queue instead of its own Redis
+    connection, so thousands of sockets cost one subscription. A full queue
+    drops the message; publishers must keep a durable copy to catch up from.
+    """
+
+    def __init__(self, pattern: str, redis: Redis = async_redis_connection):
+        self.pattern = pattern
+        self.redis = redis
+        self.listeners: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self.ready = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    @asynccontextmanager
+    async def listen(self, channel: str) -> AsyncIterator[asyncio.Queue]:
+        queue = asyncio.Queue(maxsize=PUBSUB_QUEUE_SIZE)
+        self.listeners[channel].add(queue)
+
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+        # messages published before the subscription is live are not seen,
+        # so callers read their backlog only after this returns
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout=PUBSUB_READY_TIMEOUT)
+        except asyncio.TimeoutError:
+            pubsub_utils_logger.error(f"[LISTEN] {self.pattern} is not subscribed")
+
+        try:
+            yield queue
+        finally:
+            self.listeners[channel].discard(queue)
+            if not self.listeners[channel]:
+                del self.listeners[channel]
+
+    async def run(self) -> None:
+        delay = PUBSUB_RECONNECT_DELAY
+
+        # kept for the life of the process once the first listener arrives
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.psubscribe(self.pattern)
+
+                    async for message in pubsub.listen():
+                        if message["type"] == "psubscribe":
+                            self.ready.set()
+                            delay = PUBSUB_RECONNECT_DELAY
+                        elif message["type"] == "pmessage":
+                            self.dispatch(message["channel"], message["data"])
+
+            except (RedisError, OSError) as e:
+                pubsub_utils_logger.error(f"[RUN] Redis error: {e}")
+                self.ready.clear()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+
+    def dispatch(self, channel: bytes, data: bytes) -> None:
+        for queue in self.listeners.get(channel.decode("utf-8"), ()):
+            try:
+                queue.put_nowait(data)
+            except asyncio.QueueFull:
+                pubsub_utils_logger.error(f"[DISPATCH] Queue full, dropped {channel}")
@@ -1,18 +1,53 @@
 import os
 import abc
+import asyncio
 from abc import ABC
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import insert, select, delete, update
+from sqlalchemy import Select, insert, select, delete, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from src.config.instance import (
+    DB_BULK_CHUNK_SIZE,
+    DB_MAX_QUERY_PARAMS,
+    DB_STREAM_PAGE_SIZE,
+    DB_UPDATE_BATCH_SIZE,
+)
 from src.database.db_config import async_session_maker
+from src.utils.batching import chunked
+from src.utils.load_plan import LoadPlan
+from src.utils.unit_of_work import UnitOfWork
 
 
 class AbstractRepository(ABC):
+    def __init__(self, uow: Optional[UnitOfWork] = None):
+        self.uow = uow
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        if self.uow:
+            # a savepoint per call: services that log a failed query and go on
+            # would otherwise keep using an aborted request transaction
+            async with self.uow.session.begin_nested():
+                yield self.uow.session
+            return
+
+        async with async_session_maker() as session:
+            yield session
+
+    async def commit(self, session: AsyncSession) -> None:
+        # inside a unit of work the owner commits once at the end
+        if self.uow:
+            await session.flush()
+        else:
+            await session.commit()
+
     @abc.abstractmethod
     def add_one(self, data, path=None):
         raise NotImplemented()
 
     @abc.abstractmethod
-    def get_one(self, filters):
+    def get_one(self, filters, plan=None):
         raise NotImplemented()
 
     @abc.abstractmethod
@@ -28,66 +63,257 @@ class AbstractRepository(ABC):
         raise NotImplemented()
 
     @abc.abstractmethod
-    def get_all_by_filter(self, filters=None, order=None, limit=None):
+    def get_all_by_filter(self, filters=None, order=None, limit=None, plan=None):
+        raise NotImplemented()
+
+    @abc.abstractmethod
+    def add_many(self, data, returning=True):
+        raise NotImplemented()
+
+    @abc.abstractmethod
+    def update_many(self, data):
+        raise NotImplemented()
+
+    @abc.abstractmethod
+    def upsert_many(self, data, index_elements, set_, returning=False):
+        raise NotImplemented()
+
+    @abc.abstractmethod
+    def get_many_by_ids(self, ids, column=None, filters=None):
+        raise NotImplemented()
+
+    @abc.abstractmethod
+    def iter_pages(self, filters=None, page_size=None, plan=None):
+        raise NotImplemented()
+
+    @abc.abstractmethod
+    def update_in_batches(self, filters, values, batch_size=None):
         raise NotImplemented()
 
 
 class SQLAlchemyRepository(AbstractRepository):
     model = None
 
+    @staticmethod
+    def row_chunks(data):
+        # a multi-row VALUES binds one parameter per column of every row
+        data = list(data)
+        columns = max((len(row) for row in data), default=1)
+        size = max(1, min(DB_BULK_CHUNK_SIZE, DB_MAX_QUERY_PARAMS // columns))
+        return chunked(data, size)
+
+    def select(self, plan: Optional[LoadPlan] = None) -> Select:
+        return plan.select(self.model) if plan else select(self.model)
+
+    @staticmethod
+    def unpack(res, plan: Optional[LoadPlan] = None) -> list:
+        # projections return rows, entity reads return the first column
+        if plan and plan.is_projection:
+            return res.all()
+        return [row[0] for row in res.all()]
+
     async def add_one(self, data: dict):
-        async with async_session_maker() as session:
+        async with self.session() as session:
             session: AsyncSession
 
             stmt = insert(self.model).values(data).returning(self.model)
             res = await session.execute(stmt)
-            await session.commit()
+            await self.commit(session)
             return res.scalar_one_or_none()
 
     async def delete_one(self, filters):
-        async with async_session_maker() as session:
+        async with self.session() as session:
             session: AsyncSession
 
             stmt = delete(self.model).where(*filters)
             await session.execute(stmt)
-            await session.commit()
+            await self.commit(session)
 
-    async def get_one(self, filters):
-        async with async_session_maker() as session:
+    async def get_one(self, filters, plan: Optional[LoadPlan] = None):
+        async with self.session() as session:
             session: AsyncSession
 
-            stmt = select(self.model).filter(*filters)
+            stmt = self.select(plan).filter(*filters)
             res = await session.execute(stmt)
+            if plan and plan.is_projection:
+                return res.one_or_none()
             return res.scalar_one_or_none()
 
     async def update_one(self, filters, values):
-        async with async_session_maker() as session:
+        async with self.session() as session:
             session: AsyncSession
 
             stmt = (
                 update(self.model).filter(*filters).values(values).returning(self.model)
             )
             res = await session.execute(stmt)
-            await session.commit()
+            await self.commit(session)
             return res.scalar_one()
 
     async def update_one_db(self, filters, values):
         pass
 
-    async def get_all_by_filter(self, filters=None, order=None, limit=None):
-        async with async_session_maker() as session:
+    async def get_all_by_filter(
+        self, filters=None, order=None, limit=None, plan: Optional[LoadPlan] = None
+    ):
+        async with self.session() as session:
             session: AsyncSession
 
+            stmt = self.select(plan)
             if limit:
-                stmt = select(self.model).filter(*filters).order_by(order).limit(limit)
-            elif not filters:
-                stmt = select(self.model)
-            else:
-                stmt = select(self.model).filter(*filters).order_by(order)
+                stmt = stmt.filter(*filters).order_by(order).limit(limit)
+            elif filters:
+                stmt = stmt.filter(*filters).order_by(order)
+            res = await session.execute(stmt)
+            return self.unpack(res, plan)
+
+    async def get_columns_by_filter(self, columns, filters):
+        async with self.session() as session:
+            session: AsyncSession
+
+            stmt = select(*columns).filter(*filters)
             res = await session.execute(stmt)
-            res = [row[0] for row in res.all()]
+            return res.all()
+
+    async def add_one_if_absent(self, data: dict, index_elements):
+        async with self.session() as session:
+            session: AsyncSession
+
+            stmt = (
+                pg_insert(self.model)
+                .values(data)
+                .on_conflict_do_nothing(index_elements=index_elements)
+                .returning(self.model)
+            )
+            res = await session.execute(stmt)
+            await self.commit(session)
+            return res.scalar_one_or_none()
+
+    async def upsert_many(self, data, index_elements, set_, returning=False):
+        async with self.session() as session:
+            session: AsyncSession
+
+            res = []
+            for rows in self.row_chunks(data):
+                stmt = pg_insert(self.model).values(rows)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=index_elements, set_=set_(stmt.excluded)
+                )
+                if returning:
+                    stmt = stmt.returning(self.model)
+                    res.extend((await session.execute(stmt)).scalars().all())
+                else:
+                    await session.execute(stmt)
+            await self.commit(session)
             return res
 
+    async def add_many(self, data, returning=True):
+        async with self.session() as session:
+            session: AsyncSession
+
+            res = []
+            for rows in chunked(data, DB_BULK_CHUNK_SIZE):
+                if returning:
+                    stmt = insert(self.model).returning(self.model)
+                    res.extend((await session.scalars(stmt, rows)).all())
+                else:
+                    await session.execute(insert(self.model), rows)
+            await self.commit(session)
+            return res
+
+    async def update_many(self, data):
+        # rows are matched by primary key, e.g. [{"id": 1, "progress": 2}, ...]
+        async with self.session() as session:
+            session: AsyncSession
+
+            for rows in chunked(data, DB_BULK_CHUNK_SIZE):
+                await session.execute(update(self.model), rows)
+            await self.commit(session)
+
+    async def get_many_by_ids(self, ids, column=None, filters=None):
+        column = self.model.id if column is None else column
+
+        async with self.session() as session:
+            session: AsyncSession
+
+            res = []
+            for chunk in chunked(dict.fromkeys(ids), DB_BULK_CHUNK_SIZE):
+                stmt = select(self.model).filter(column.in_(chunk), *(filters or []))
+                res.extend((await session.execute(stmt)).scalars().all())
+            return res
+
+    async def iter_pages(
+        self,
+        filters=None,
+        page_size: Optional[int] = None,
+        plan: Optional[LoadPlan] = None,
+    ) -> AsyncIterator[List]:
+        # keyset pagination on id: every page is an index range scan in its own
+        # short session, so neither memory nor a held connection grows with
+        # the table; inside a unit of work a page is only a savepoint of the one
+        # request transaction, which holds its connection until the end; a
+        # projection plan has to select the id column
+        page_size = page_size or DB_STREAM_PAGE_SIZE
+        last_id = None
+
+        while True:
+            stmt = self.select(plan).filter(*(filters or []))
+            if last_id is not None:
+                stmt = stmt.filter(self.model.id > last_id)
+            stmt = stmt.order_by(self.model.id).limit(page_size)
+
+            async with self.session() as session:
+                session: AsyncSession
+                page = self.unpack(await session.execute(stmt), plan)
+
+            if not page:
+                return
+
+            yield page
+
+            if len(page) < page_size:
+                return
+            last_id = page[-1].id
+
+    async def update_in_batches(
+        self, filters, values, batch_size: Optional[int] = None
+    ) -> AsyncIterator[int]:
+        # one UPDATE ... WHERE id IN (next batch_size ids matching filters)
+        # per transaction, keyed on id so rows that still match after the
+        # update are not picked again; yields the rows updated per batch.
+        # Inside a unit of work every batch is only a savepoint: nothing is
+        # committed, and no row lock is released, before the unit of work ends
+        batch_size = batch_size or DB_UPDATE_BATCH_SIZE
+        last_id = None
+
+        while True:
+            ids = select(self.model.id).filter(*filters).correlate(None)
+            if last_id is not None:
+                ids = ids.filter(self.model.id > last_id)
+            ids = ids.order_by(self.model.id).limit(batch_size)
+
+            stmt = (
+                update(self.model)
+                .where(self.model.id.in_(ids.scalar_subquery()))
+                .values(values)
+                .returning(self.model.id)
+                .execution_options(synchronize_session=False)
+            )
+
+            async with self.session() as session:
+                session: AsyncSession
+                updated = (await session.execute(stmt)).scalars().all()
+                await self.commit(session)
+
+            if not updated:
+                return
+
+            yield len(updated)
+
+            if len(updated) < batch_size:
+                return
+            last_id = max(updated)
+
 
 class LocalFileRepository(AbstractRepository):
     async def update_one(self, filters, values):
@@ -96,10 +322,10 @@ class LocalFileRepository(AbstractRepository):
     async def update_one_db(self, filters, values):
         pass
 
-    async def get_all_by_filter(self, filters, order, limit=None):
+    async def get_all_by_filter(self, filters, order, limit=None, plan=None):
         pass
 
-    async def get_one(self, filters):
+    async def get_one(self, filters, plan=None):
         pass
 
     async def add_one(self, data, path=None):
@@ -109,45 +335,65 @@ class LocalFileRepository(AbstractRepository):
     async def delete_one(self, filters: str):
         os.remove(filters)
 
+    async def add_many(self, data, returning=True):
+        pass
+
+    async def update_many(self, data):
+        pass
+
+    async def upsert_many(self, data, index_elements, set_, returning=False):
+        pass
+
+    async def get_many_by_ids(self, ids, column=None, filters=None):
+        pass
 
-class ChromaRepository(AbstractRepository):
+    async def iter_pages(self, filters=None, page_size=None, plan=None):
+        pass
+
+    async def update_in_batches(self, filters, values, batch_size=None):
+        pass
+
+
+class ChromaRepository(SQLAlchemyRepository):
     collection = None
     model = None
 
     async def update_one(self, filters, values):
-        return self.collection.query(query_texts=[filters], n_results=values)
+        return await asyncio.to_thread(
+            self.collection.query, query_texts=[filters], n_results=values
+        )
 
     async def update_one_db(self, filters, values):
-        async with async_session_maker() as session:
+        async with self.session() as session:
             session: AsyncSession
 
             stmt = (
                 update(self.model).filter(*filters).values(values).returning(self.model)
             )
             res = await session.execute(stmt)
-            await session.commit()
+            await self.commit(session)
             return res.scalar_one()
 
-    async def get_all_by_filter(self, filters=None, order=None, limit=None):
-        async with async_session_maker() as session:
+    async def get_all_by_filter(
+        self, filters=None, order=None, limit=None, plan: Optional[LoadPlan] = None
+    ):
+        async with self.session() as session:
             session: AsyncSession
 
+            stmt = self.select(plan)
             if limit and filters and order:
-                stmt = select(self.model).filter(*filters).order_by(order).limit(limit)
+                stmt = stmt.filter(*filters).order_by(order).limit(limit)
             elif filters and order:
-                stmt = select(self.model).filter(*filters).order_by(order)
-            else:
-                stmt = select(self.model)
+                stmt = stmt.filter(*filters).order_by(order)
             res = await session.execute(stmt)
-            res = [row[0] for row in res.all()]
-            return res
+            return self.unpack(res, plan)
 
     async def add_one(self, data):
-        async with async_session_maker() as session:
+        async with self.session() as session:
             session: AsyncSession
             stmt = insert(self.model).values(data).returning(self.model)
             res = await session.execute(stmt)
-            await session.commit()
+            await self.commit(session)
             db_object = res.scalar_one_or_none()
 
         self.collection.add(
@@ -157,20 +403,46 @@ class ChromaRepository(AbstractRepository):
 
         return db_object
 
-    async def get_one(self, filters):
-        async with async_session_maker() as session:
+    async def get_one(self, filters, plan: Optional[LoadPlan] = None):
+        async with self.session() as session:
             session: AsyncSession
 
-            stmt = select(self.model).filter(*filters)
+            stmt = self.select(plan).filter(*filters)
             res = await session.execute(stmt)
+            if plan and plan.is_projection:
+                return res.one_or_none()
             return res.scalar_one_or_none()
 
     async def delete_one(self, filters):
         self.collection.delete(filters[1])
         del filters[1]
-        async with async_session_maker() as session:
+        async with self.session() as session:
             session: AsyncSession
 
             stmt = delete(self.model).where(*filters)
             await session.execute(stmt)
-            await session.commit()
+            await self.commit(session)
+
+    async def add_many(self, data, returning=True):
+        db_objects = await super().add_many(data, returning=True)
+
+        if db_objects:
+            self.collection.add(
+                documents=[db_object.title for db_object in db_objects],
+                ids=[str(db_object.id) for db_object in db_objects],
+            )
+
+        return db_objects
+
+    async def upsert_many(self, data, index_elements, set_, returning=False):
+        db_objects = await super().upsert_many(
+            data, index_elements, set_, returning=True
+        )
+
+        if db_objects:
+            self.collection.upsert(
+                documents=[db_object.title for db_object in db_objects],
+                ids=[str(db_object.id) for db_object in db_objects],
+            )
+
+        return db_objects
@@ -0,0 +1,133 @@
+import time
+import uuid
+import asyncio
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from redis import Redis, RedisError
+
+from src.config.instance import (
+    SINGLE_FLIGHT_EMPTY_TTL,
+    SINGLE_FLIGHT_ERROR_TTL,
+    SINGLE_FLIGHT_LEASE_TTL,
+    SINGLE_FLIGHT_POLL_INTERVAL,
+    SINGLE_FLIGHT_WAIT_TIMEOUT,
+)
+from src.database.redis_config import redis_connection
+from src.utils.logger import single_flight_utils_logger
+
+
+T = TypeVar("T")
+
+# Deletes the lease only while it still holds our token, so a leader whose lease
+# already expired can not release the lease of the worker that took over.
+RELEASE_SCRIPT: str = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """Lets one worker per key run an expensive producer while the others wait.
+
+    The leader holds a Redis lease (SET NX PX); followers poll `lookup` until the
+    leader's result is visible and take over if the lease expires first. A
+    leader that produced nothing leaves a marker for empty_ttl, one that raised
+    for the much shorter error_ttl; everyone asking for the key meanwhile gets
+    None instead of running the producer again.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        redis: Redis = redis_connection,
+        lease_ttl: int = SINGLE_FLIGHT_LEASE_TTL,
+        wait_timeout: float = SINGLE_FLIGHT_WAIT_TIMEOUT,
+        poll_interval: float = SINGLE_FLIGHT_POLL_INTERVAL,
+        empty_ttl: int = SINGLE_FLIGHT_EMPTY_TTL,
+        error_ttl: int = SINGLE_FLIGHT_ERROR_TTL,
+    ):
+        self.prefix = prefix
+        self.redis = redis
+        self.lease_ttl = lease_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.empty_ttl = empty_ttl
+        self.error_ttl = error_ttl
+
+    def lease_key(self, key: str) -> str:
+        return f"lease:{self.prefix}:{key}"
+
+    def failure_key(self, key: str) -> str:
+        return f"failed:{self.prefix}:{key}"
+
+    def failed(self, key: str) -> bool:
+        try:
+            return self.redis.get(self.failure_key(key)) is not None
+
+        except RedisError as e:
+            single_flight_utils_logger.error(f"[FAILED] Error: {e}")
+            return False
+
+    def mark_failed(self, key: str, reason: str, ttl: int) -> None:
+        try:
+            self.redis.set(self.failure_key(key), reason, px=ttl)
+
+        except RedisError as e:
+            single_flight_utils_logger.error(f"[MARK FAILED] Error: {e}")
+
+    def acquire(self, key: str, token: str) -> bool:
+        try:
+            return bool(
+                self.redis.set(self.lease_key(key), token, nx=True, px=self.lease_ttl)
+            )
+
+        except RedisError as e:
+            # without Redis every worker produces, the unique index keeps rows single
+            single_flight_utils_logger.error(f"[ACQUIRE] Error: {e}")
+            return True
+
+    def release(self, key: str, token: str) -> None:
+        try:
+            self.redis.eval(RELEASE_SCRIPT, 1, self.lease_key(key), token)
+
+        except RedisError as e:
+            single_flight_utils_logger.error(f"[RELEASE] Error: {e}")
+
+    async def run(
+        self,
+        key: str,
+        producer: Callable[[], Awaitable[T]],
+        lookup: Callable[[], Awaitable[Optional[T]]],
+    ) -> Optional[T]:
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.wait_timeout
+
+        while True:
+            if self.failed(key=key):
+                return None
+
+            if self.acquire(key=key, token=token):
+                try:
+                    value = await producer()
+                except Exception:
+                    self.mark_failed(key=key, reason="error", ttl=self.error_ttl)
+                    raise
+                else:
+                    if value is None:
+                        self.mark_failed(key=key, reason="empty", ttl=self.empty_ttl)
+                    return value
+                finally:
+                    # released after the marker, so followers see one or the other
+                    self.release(key=key, token=token)
+
+            await asyncio.sleep(self.poll_interval)
+
+            value = await lookup()
+            if value is not None:
+                return value
+
+            if time.monotonic() >= deadline:
+                single_flight_utils_logger.info(f"[WAIT] Timeout: {key}")
+                return None
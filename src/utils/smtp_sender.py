@@ -0,0 +1,123 @@
+import ssl
+import time
+import smtplib
+import threading
+from typing import Optional
+from email.message import Message
+
+from src.config.instance import (
+    EMAIL_PASSWORD,
+    EMAIL_PORT,
+    EMAIL_USE_SSL,
+    SENDER_EMAIL,
+    SMTP_IDLE_TIMEOUT,
+    SMTP_RATE_LIMIT,
+    SMTP_SERVER,
+)
+from src.utils.logger import smtp_sender_utils_logger
+
+
+class RateLimiter:
+    """Spaces calls at least 1 / rate seconds apart, rate <= 0 disables it."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0
+        self.next_at = 0.0
+
+    def wait(self) -> None:
+        now = time.monotonic()
+
+        if self.next_at > now:
+            time.sleep(self.next_at - now)
+            now = self.next_at
+
+        self.next_at = now + self.interval
+
+
+class SMTPSender:
+    """One logged-in SMTP connection per process, reused for every message.
+
+    The connection is opened lazily, so a forked worker never inherits its
+    parent's socket. It is NOOP-checked after idle_timeout seconds and
+    reopened once if the server dropped it.
+    """
+
+    def __init__(
+        self,
+        host: Optional[str] = SMTP_SERVER,
+        port: Optional[str] = EMAIL_PORT,
+        user: Optional[str] = SENDER_EMAIL,
+        password: Optional[str] = EMAIL_PASSWORD,
+        use_ssl: bool = EMAIL_USE_SSL,
+        rate: float = SMTP_RATE_LIMIT,
+        idle_timeout: float = SMTP_IDLE_TIMEOUT,
+        address: Optional[str] = SENDER_EMAIL,
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.address = address  # the From of every message sent
+        self.use_ssl = use_ssl
+        self.idle_timeout = idle_timeout
+        self.rate_limiter = RateLimiter(rate=rate)
+
+        self.lock = threading.Lock()
+        self.server: Optional[smtplib.SMTP] = None
+        self.last_used = 0.0
+        self.connections = 0
+
+    def connect(self) -> smtplib.SMTP:
+        if self.use_ssl:
+            server = smtplib.SMTP_SSL(
+                self.host, int(self.port), context=ssl.create_default_context()
+            )
+        else:
+            server = smtplib.SMTP(self.host, int(self.port))
+
+        if self.user and self.password:
+            server.login(user=self.user, password=self.password)
+
+        self.connections += 1
+        smtp_sender_utils_logger.info(f"[CONNECT] {self.host}:{self.port}")
+        return server
+
+    def connection(self) -> smtplib.SMTP:
+        if self.server and time.monotonic() - self.last_used > self.idle_timeout:
+            try:
+                if self.server.noop()[0] != 250:
+                    self.close()
+            except (smtplib.SMTPException, OSError):
+                self.close()
+
+        if self.server is None:
+            self.server = self.connect()
+
+        return self.server
+
+    def send(self, message: Message) -> None:
+        with self.lock:
+            self.rate_limiter.wait()
+
+            try:
+                self.connection().send_message(message)
+            except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+                smtp_sender_utils_logger.error(f"[SEND] Reconnecting: {e}")
+                self.close()
+                self.connection().send_message(message)
+
+            self.last_used = time.monotonic()
+
+    def close(self) -> None:
+        if self.server is None:
+            return
+
+        try:
+            self.server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+
+        self.server = None
+
+
+smtp_sender = SMTPSender()
@@ -0,0 +1,123 @@
+from concurrent.futures import Executor, Future
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.config.instance import STT_LANGUAGES, STT_PROBE_CHUNKS, STT_PROBE_SHARE
+from src.utils.audio import AudioChunk
+
+
+Recognition = Tuple[str, float]  # text and confidence of the best hypothesis
+
+
+class SpeechBackend:
+    """Recognizes speech in audio chunks, one language at a time.
+
+    Backends that detect the language themselves list None as their only
+    language and get every chunk once.
+    """
+
+    batch_size: int = 1  # chunks handed to one recognize_batch call
+    languages: Tuple[Optional[str], ...] = STT_LANGUAGES
+
+    def recognize(self, chunk: AudioChunk, language: Optional[str]) -> Recognition:
+        raise NotImplementedError
+
+    def recognize_batch(
+        self, chunks: Sequence[AudioChunk], language: Optional[str]
+    ) -> List[Recognition]:
+        return [self.recognize(chunk, language) for chunk in chunks]
+
+
+def probe_chunks(
+    chunks: Sequence[AudioChunk], probes: int = STT_PROBE_CHUNKS
+) -> List[AudioChunk]:
+    # the longest chunks carry the most speech, ties keep the upload order
+    return sorted(chunks, key=lambda chunk: -chunk.seconds)[:probes]
+
+
+def language_score(results: List[Recognition]) -> float:
+    # confidence alone says little, Google reports 0.5 when it has none
+    return sum(confidence * len(text.split()) for text, confidence in results)
+
+
+def choose_language(
+    probed: Dict[str, List[Recognition]], share: float = STT_PROBE_SHARE
+) -> Optional[str]:
+    """Language of the probe chunks, None when the probe is ambiguous.
+
+    A language wins when its score is at least share of all the scores.
+    A probe with no words recognized in any language is ambiguous too.
+    """
+    scores = {language: language_score(results) for language, results in probed.items()}
+    total = sum(scores.values())
+    if not total:
+        return None
+
+    language = max(scores, key=scores.get)
+    return language if scores[language] / total >= share else None
+
+
+def submit(
+    backend: SpeechBackend,
+    executor: Executor,
+    chunks: Sequence[AudioChunk],
+    language: Optional[str],
+) -> List[Tuple[Sequence[AudioChunk], Future]]:
+    return [
+        (batch, executor.submit(backend.recognize_batch, batch, language))
+        for batch in (
+            chunks[index : index + backend.batch_size]
+            for index in range(0, len(chunks), backend.batch_size)
+        )
+    ]
+
+
+def transcribe(
+    chunks: Sequence[AudioChunk],
+    backend: SpeechBackend,
+    executor: Executor,
+    probes: int = STT_PROBE_CHUNKS,
+) -> Tuple[str, Optional[str]]:
+    """Text of the chunks in the language of the upload, and that language.
+
+    The probe chunks are recognized in every language. Once the probe picks
+    one, the other chunks are sent in that language only; when it is
+    ambiguous they are sent in all of them and the longest text is kept.
+    """
+    if not chunks:
+        return "", None
+
+    probe = probe_chunks(chunks, probes=probes)
+    results: Dict[Optional[str], Dict[AudioChunk, Recognition]] = {}
+
+    pending = [
+        (language, batch, future)
+        for language in backend.languages
+        for batch, future in submit(backend, executor, probe, language)
+    ]
+    for language, batch, future in pending:
+        results.setdefault(language, {}).update(zip(batch, future.result()))
+
+    language = choose_language(
+        {language: list(probed.values()) for language, probed in results.items()}
+    )
+    chosen = [language] if language else list(backend.languages)
+    rest = [chunk for chunk in chunks if chunk not in probe]
+
+    pending = [
+        (current, batch, future)
+        for current in chosen
+        for batch, future in submit(backend, executor, rest, current)
+    ]
+    for current, batch, future in pending:
+        results[current].update(zip(batch, future.result()))
+
+    texts = [
+        " ".join(
+            text
+            for text, _ in (results[current][chunk] for chunk in chunks)
+            if text.strip()
+        )
+        for current in chosen
+    ]
+
+    return max(texts, key=len), language
@@ -0,0 +1,126 @@
+import re
+import string
+from collections import Counter
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from src.utils.cache import LRUCache
+
+
+SPEC_CHARS: str = string.punctuation + "\n\xa0«»\t—…" + string.digits
+
+# str.translate() falls back to a slow per-char path for non-ASCII text, so the
+# ASCII special chars are deleted with a bytes table on the UTF-8 encoding (ASCII
+# bytes never occur inside multibyte sequences) and the rest with str.replace().
+SPEC_CHARS_ASCII: bytes = bytes(ord(char) for char in SPEC_CHARS if char.isascii())
+SPEC_CHARS_UNICODE: Tuple[str, ...] = tuple(
+    char for char in SPEC_CHARS if not char.isascii()
+)
+
+# Chunks end on whitespace that strip_spec_chars() keeps: "\n", "\t" and "\xa0"
+# are deleted (not replaced) by it, so splitting on them would change the words.
+CHUNK_SEPARATOR = re.compile(r"[^\S\n\t\xa0]")
+MAX_WORD_LENGTH: int = 64  # chars a chunk may run past chunk_size to end a word
+
+
+def remove_spec_chars(text: str) -> str:
+    return " ".join(strip_spec_chars(text).split())
+
+
+def strip_spec_chars(text: str) -> str:
+    for char in SPEC_CHARS_UNICODE:
+        if char in text:
+            text = text.replace(char, "")
+
+    return (
+        text.encode("utf-8", "surrogatepass")
+        .translate(None, SPEC_CHARS_ASCII)
+        .decode("utf-8", "surrogatepass")
+    )
+
+
+def iter_clean_tokens(text: str, stopwords: FrozenSet[str]) -> Iterator[str]:
+    for word in strip_spec_chars(text).split():
+        if word not in stopwords:
+            yield word
+
+
+def rfind_separator(text: str, start: int, end: int) -> int:
+    # " " is by far the most common separator, so the regex only scans the part
+    # of the window after the last one
+    split = text.rfind(" ", start, end)
+    for match in CHUNK_SEPARATOR.finditer(text, max(split + 1, start), end):
+        split = match.start()
+
+    return split
+
+
+def iter_text_chunks(
+    text: str, chunk_size: int, max_chunk_size: Optional[int] = None
+) -> Iterator[str]:
+    # A run without separators is cut at max_chunk_size, so one huge "word"
+    # cannot pull the rest of the text into a single chunk.
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+
+    if max_chunk_size is None:
+        max_chunk_size = chunk_size + MAX_WORD_LENGTH
+
+    if max_chunk_size < chunk_size:
+        raise ValueError("max_chunk_size must not be less than chunk_size")
+
+    start, length = 0, len(text)
+
+    while start < length:
+        end = start + chunk_size
+
+        if end < length:
+            split = rfind_separator(text, start + 1, end)
+            if split == -1:
+                match = CHUNK_SEPARATOR.search(text, end, start + max_chunk_size)
+                split = match.start() if match else start + max_chunk_size
+            end = min(split, length)
+
+        yield text[start:end]
+        start = end
+
+
+def iter_chunk_counts(
+    text: str, stopwords: FrozenSet[str], chunk_size: int
+) -> Iterator[Counter]:
+    for chunk in iter_text_chunks(text=text, chunk_size=chunk_size):
+        counts = Counter(iter_clean_tokens(text=chunk, stopwords=stopwords))
+        if counts:
+            yield counts
+
+
+def merge_counts(counts: Dict[str, int], lemmas: Iterable[str]) -> Dict[str, int]:
+    freq_dict = Counter()
+
+    for (word, frequency), lemma in zip(counts.items(), lemmas):
+        freq_dict[lemma] += frequency
+
+    return dict(freq_dict.most_common())
+
+
+def normalize_tokens(
+    words: Iterable[str], normalizer: Callable[[str], str], cache: LRUCache
+) -> List[str]:
+    words = list(words)
+    unique_words = dict.fromkeys(words)
+
+    lemmas = cache.get_many(unique_words)
+    misses = {word: normalizer(word) for word in unique_words if word not in lemmas}
+
+    cache.set_many(misses)
+    lemmas.update(misses)
+
+    return [lemmas[word] for word in words]
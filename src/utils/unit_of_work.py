@@ -0,0 +1,47 @@
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.db_config import async_session_maker
+
+
+class UnitOfWork:
+    """One session and transaction shared by the repositories of a request or task.
+
+    Repositories built with a unit of work only flush, each call inside its own
+    savepoint; the transaction is committed once when the context exits cleanly
+    and rolled back otherwise.
+    """
+
+    def __init__(self, session_factory=async_session_maker):
+        self.session_factory = session_factory
+        self.session: Optional[AsyncSession] = None
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self.session = self.session_factory()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                await self.session.commit()
+            else:
+                await self.session.rollback()
+        finally:
+            await self.session.close()
+            self.session = None
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def release(self) -> None:
+        """Commit the work so far and give the connection back to the pool.
+
+        The session stays usable and checks a connection out again on its next
+        query. Call it before slow calls outside the database (metric server,
+        MinIO), so a request does not hold a pooled connection while waiting.
+        """
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
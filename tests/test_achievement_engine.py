@@ -0,0 +1,219 @@
+import pytest
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from src.config.instance import (
+    ACHIEVEMENT_AUDIO,
+    ACHIEVEMENT_LEARNED,
+    ACHIEVEMENT_WORDS,
+)
+from src.database.db_config import Base
+from src.database.models import User, UserAchievement
+from src.repositories.repositories import UserAchievementRepository
+from src.services.achievement_catalog import AchievementCatalog
+from src.services.user_achievement_service import UserAchievementService
+
+
+def row(id, achievement_id, progress, is_completed=False):
+    return SimpleNamespace(
+        id=id,
+        achievement_id=achievement_id,
+        progress=progress,
+        is_completed=is_completed,
+    )
+
+
+async def load_catalog():
+    achievement_service = MagicMock()
+    achievement_service.get_all = AsyncMock(
+        return_value=[
+            SimpleNamespace(id=3, category=ACHIEVEMENT_LEARNED, target=50),
+            SimpleNamespace(id=1, category=ACHIEVEMENT_LEARNED, target=10),
+            SimpleNamespace(id=2, category=ACHIEVEMENT_LEARNED, target=20),
+            SimpleNamespace(id=4, category=ACHIEVEMENT_WORDS, target=100),
+            SimpleNamespace(id=5, category=ACHIEVEMENT_AUDIO, target=60),
+        ]
+    )
+    return await AchievementCatalog(ttl=60).load(achievement_service)
+
+
+def user_achievement_service(rows):
+    repo = MagicMock()
+    repo.get_columns_by_filter = AsyncMock(return_value=rows)
+    repo.update_many = AsyncMock()
+    return UserAchievementService(repo)
+
+
+class SyncSession:
+    # the AsyncSession calls of the repository, over a sync sqlite Session
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def execute(self, *args, **kwargs):
+        return self.session.execute(*args, **kwargs)
+
+    async def flush(self):
+        self.session.flush()
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        with self.session.begin_nested():
+            yield
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        session.add(User(id=1, provider="google"))
+        session.flush()
+        yield session
+
+
+def seed(session, *rows):
+    # (id, achievement_id, progress, is_completed); the catalog is not read
+    # from the table, so no achievement rows are needed
+    session.add_all(
+        UserAchievement(
+            id=id,
+            user_id=1,
+            achievement_id=achievement_id,
+            progress=progress,
+            progress_percent=100 if is_completed else 0,
+            is_completed=is_completed,
+        )
+        for id, achievement_id, progress, is_completed in rows
+    )
+    session.flush()
+    return UserAchievementService(
+        UserAchievementRepository(uow=SimpleNamespace(session=SyncSession(session)))
+    )
+
+
+def stored(session):
+    session.expire_all()
+    return {
+        row.id: (row.progress, row.progress_percent, row.is_completed)
+        for row in session.execute(select(UserAchievement)).scalars()
+    }
+
+
+class TestAchievementCatalog:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_sorted_by_category_and_target_and_cached():
+        achievement_service = MagicMock()
+        achievement_service.get_all = AsyncMock(
+            return_value=[
+                SimpleNamespace(id=2, category=ACHIEVEMENT_LEARNED, target=20),
+                SimpleNamespace(id=1, category=ACHIEVEMENT_LEARNED, target=10),
+            ]
+        )
+        catalog = AchievementCatalog(ttl=60)
+
+        await catalog.load(achievement_service)
+        await catalog.load(achievement_service)
+
+        assert [entry.id for entry in catalog.by_category[ACHIEVEMENT_LEARNED]] == [
+            1,
+            2,
+        ]
+        achievement_service.get_all.assert_awaited_once()
+
+        catalog.invalidate()
+        await catalog.load(achievement_service)
+        assert achievement_service.get_all.await_count == 2
+
+
+class TestApplyEvent:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_adds_the_event_to_open_rows(session):
+        catalog = await load_catalog()
+        service = seed(
+            session, (11, 1, 10, True), (12, 2, 12, False), (13, 3, 12, False)
+        )
+
+        changed = await service.apply_event(
+            user_id=1,
+            event={"uwords_uid": "a", "learned_amount": 13},
+            catalog=catalog,
+        )
+
+        assert changed == 2
+        assert stored(session) == {
+            11: (10, 100, True),
+            12: (20, 100, True),
+            13: (25, 50, False),
+        }
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_concurrent_events_both_count(session):
+        catalog = await load_catalog()
+        service = seed(
+            session, (11, 1, 10, True), (12, 2, 12, False), (13, 3, 12, False)
+        )
+        snapshot = await service.get_progress_rows(user_id=1)
+
+        # another event lands between this one's read and its write
+        await service.apply_event(
+            user_id=1, event={"learned_amount": 3}, catalog=catalog
+        )
+        service.get_progress_rows = AsyncMock(return_value=snapshot)
+        await service.apply_event(
+            user_id=1, event={"learned_amount": 1}, catalog=catalog
+        )
+
+        assert stored(session)[13] == (16, 32, False)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_row_added_after_others_completed_asks_for_a_resync(session):
+        # targets 10 and 20 were earned, 50 was added later with progress 0
+        catalog = await load_catalog()
+        service = seed(session, (11, 1, 10, True), (12, 2, 20, True), (13, 3, 0, False))
+
+        changed = await service.apply_event(
+            user_id=1, event={"learned_amount": 1}, catalog=catalog
+        )
+
+        assert changed is None
+        assert stored(session)[13] == (0, 0, False)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_event_without_counters_reads_nothing():
+        catalog = await load_catalog()
+        service = user_achievement_service([])
+
+        changed = await service.apply_event(
+            user_id=1,
+            event={"uwords_uid": "a", "learned_amount": 0},
+            catalog=catalog,
+        )
+
+        assert changed == 0
+        service.repo.get_columns_by_filter.assert_not_awaited()
+        service.repo.update_many.assert_not_awaited()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_missing_rows_ask_for_a_full_resync():
+        catalog = await load_catalog()
+        service = user_achievement_service([row(14, 4, 0)])
+
+        changed = await service.apply_event(
+            user_id=1,
+            event={"uwords_uid": "a", "add_userwords_amount": 5, "speech_seconds": 30},
+            catalog=catalog,
+        )
+
+        assert changed is None
+        service.repo.update_many.assert_not_awaited()
@@ -54,7 +54,7 @@ class TestAchievementService:
         result = await service.get_all()
 
         assert result == expected_result
-        service.repo.get_all_by_filter.assert_called_once_with()
+        service.repo.get_all_by_filter.assert_called_once_with(plan=None)
 
     @pytest.mark.asyncio
     @pytest.mark.parametrize("achievement_id, update_data, expected_result", [
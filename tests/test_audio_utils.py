@@ -0,0 +1,173 @@
+import io
+import shutil
+
+import numpy as np
+import pytest
+import soundfile
+
+from src.utils.audio import (
+    PCM,
+    AudioChunk,
+    decode_audio,
+    detect_speech,
+    pack_speech,
+    segment_audio,
+    slice_chunks,
+    speech_seconds,
+    write_chunks,
+)
+
+
+RATE = 8000
+
+
+@pytest.fixture
+def wav(tmp_path):
+    path = tmp_path / "speech 100%.wav"
+    rate = 8000
+    soundfile.write(path, np.zeros((75 * rate, 2), dtype=np.float32), rate)
+    return str(path)
+
+
+@pytest.fixture
+def speech_wav(tmp_path):
+    # 200 Hz "speech" at 1-3 s, 5-9 s and 9.2-10 s over faint noise
+    rng = np.random.default_rng(0)
+    samples = rng.normal(0, 0.001, 12 * RATE).astype(np.float32)
+    t = np.arange(12 * RATE) / RATE
+    for start, end in [(1, 3), (5, 9), (9.2, 10)]:
+        span = (t >= start) & (t < end)
+        samples[span] += 0.3 * np.sin(2 * np.pi * 200 * t[span])
+
+    path = tmp_path / "speech.wav"
+    soundfile.write(path, samples, RATE)
+    return str(path)
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+class TestSegmentAudio:
+    @staticmethod
+    def test_cuts_mono_chunks_in_order(wav):
+        files = segment_audio(path=wav, duration=75)
+
+        assert [file.rsplit("_", 1)[1] for file in files] == ["1.wav", "2.wav", "3.wav"]
+        infos = [soundfile.info(file) for file in files]
+        assert [round(info.duration) for info in infos] == [30, 30, 15]
+        assert {info.channels for info in infos} == {1}
+
+    @staticmethod
+    def test_max_seconds_caps_decoding(wav):
+        files = segment_audio(path=wav, duration=75, max_seconds=40)
+
+        assert [round(soundfile.info(file).duration) for file in files] == [30, 10]
+
+
+class TestVoiceActivity:
+    @staticmethod
+    def test_finds_speech_and_bridges_short_pauses(speech_wav):
+        spans = detect_speech(audio=speech_wav, padding=0)
+
+        assert len(spans) == 2
+        for (start, end), (expected_start, expected_end) in zip(
+            spans, [(1, 3), (5, 10)]
+        ):
+            assert abs(start - expected_start) < 0.05
+            assert abs(end - expected_end) < 0.05
+
+    @staticmethod
+    def test_silence_has_no_speech(tmp_path):
+        path = tmp_path / "silence.wav"
+        soundfile.write(path, np.zeros(5 * RATE, dtype=np.float32), RATE)
+
+        assert detect_speech(audio=str(path)) == []
+
+    @staticmethod
+    def test_pack_moves_whole_spans_and_caps_speech():
+        spans = [(0, 4), (5, 9), (10, 13), (20, 50)]
+
+        assert pack_speech(spans, chunk_seconds=10) == [
+            [(0, 4), (5, 9)],
+            [(10, 13), (20, 27)],
+            [(27, 37)],
+            [(37, 47)],
+            [(47, 50)],
+        ]
+        capped = pack_speech(spans, chunk_seconds=10, max_seconds=9)
+        assert speech_seconds([span for chunk in capped for span in chunk]) == 9
+
+    @staticmethod
+    def test_chunks_hold_only_speech(speech_wav):
+        spans = detect_speech(audio=speech_wav)
+        files = write_chunks(speech_wav, pack_speech(spans, chunk_seconds=30))
+
+        assert len(files) == 1
+        assert abs(soundfile.info(files[0]).duration - speech_seconds(spans)) < 0.01
+
+
+class TestInMemoryAudio:
+    @staticmethod
+    @pytest.mark.skipif(
+        shutil.which("ffmpeg") is None, reason="ffmpeg is not installed"
+    )
+    def test_decodes_to_mono_pcm_without_files(wav, tmp_path):
+        before = set(tmp_path.iterdir())
+
+        audio = decode_audio(wav, rate=16000)
+
+        assert audio.samples.dtype == np.int16
+        assert audio.rate == 16000
+        assert round(audio.seconds) == 75
+        assert set(tmp_path.iterdir()) == before
+
+    @staticmethod
+    @pytest.mark.skipif(
+        shutil.which("ffmpeg") is None, reason="ffmpeg is not installed"
+    )
+    def test_max_seconds_caps_decoding(wav):
+        audio = decode_audio(wav, rate=16000, max_seconds=20)
+
+        assert len(audio.samples) == 20 * 16000
+
+    @staticmethod
+    def test_speech_in_memory_matches_the_file(speech_wav):
+        samples, rate = soundfile.read(speech_wav, dtype="int16")
+
+        assert detect_speech(audio=PCM(samples, rate)) == detect_speech(
+            audio=speech_wav
+        )
+
+    @staticmethod
+    def test_single_span_chunks_are_views(speech_wav):
+        samples, rate = soundfile.read(speech_wav, dtype="int16")
+        audio = PCM(samples, rate)
+
+        chunks = slice_chunks(audio, [[(0, 5)], [(5, 7), (8, 10)]])
+
+        assert np.shares_memory(chunks[0].samples(), samples)
+        assert [chunk.seconds for chunk in chunks] == [5, 4]
+        assert (
+            chunks[1].pcm()
+            == np.concatenate(
+                [samples[5 * rate : 7 * rate], samples[8 * rate : 10 * rate]]
+            ).tobytes()
+        )
+
+    @staticmethod
+    def test_chunk_encodes_wav_in_memory(speech_wav):
+        samples, rate = soundfile.read(speech_wav, dtype="int16")
+        chunk = AudioChunk(parts=[samples[:rate]], rate=rate)
+
+        decoded, decoded_rate = soundfile.read(io.BytesIO(chunk.wav()), dtype="int16")
+
+        assert decoded_rate == rate
+        assert np.array_equal(decoded, samples[:rate])
+
+    @staticmethod
+    def test_file_chunk_reads_back_the_same_samples(speech_wav):
+        samples, rate = soundfile.read(speech_wav, dtype="int16")
+        files = write_chunks(speech_wav, [[(1, 3)]])
+
+        chunk = AudioChunk(path=files[0], rate=rate)
+
+        assert chunk.seconds == 2
+        assert np.array_equal(chunk.samples(), samples[rate : 3 * rate])
@@ -0,0 +1,37 @@
+import pytest
+
+from src.utils.batching import chunked, length_buckets
+
+
+class TestBatching:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "items, size, expected_result",
+        [
+            ([1, 2, 3, 4, 5], 2, [[1, 2], [3, 4], [5]]),
+            ([1, 2, 3], 3, [[1, 2, 3]]),
+            ([], 4, []),
+        ],
+    )
+    def test_chunked(items, size, expected_result):
+        assert list(chunked(items, size)) == expected_result
+
+    @staticmethod
+    def test_chunked_invalid_size():
+        with pytest.raises(ValueError):
+            list(chunked([1, 2], 0))
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "items, size, expected_result",
+        [
+            (
+                ["house", "a", "time", "translation", "it"],
+                2,
+                [["a", "it"], ["time", "house"], ["translation"]],
+            ),
+            (["bb", "aa", "c"], 5, [["c", "bb", "aa"]]),
+        ],
+    )
+    def test_length_buckets(items, size, expected_result):
+        assert length_buckets(items, size) == expected_result
@@ -0,0 +1,46 @@
+from src.utils.cache import LRUCache
+
+
+class TestLRUCache:
+    @staticmethod
+    def test_evicts_least_recently_used():
+        cache = LRUCache(maxsize=2)
+
+        cache.set("house", "дом")
+        cache.set("time", "время")
+        cache.get("house")
+        cache.set("people", "люди")
+
+        assert "house" in cache
+        assert "people" in cache
+        assert "time" not in cache
+        assert len(cache) == 2
+
+    @staticmethod
+    def test_get_many_counts_hits_and_misses():
+        cache = LRUCache(maxsize=10)
+        cache.set_many({"house": "дом", "time": "время"})
+
+        result = cache.get_many(["house", "time", "people"])
+
+        assert result == {"house": "дом", "time": "время"}
+        assert cache.stats() == {
+            "size": 2,
+            "maxsize": 10,
+            "hits": 2,
+            "misses": 1,
+            "hit_rate": 0.6667,
+        }
+
+    @staticmethod
+    def test_clear_resets_stats():
+        cache = LRUCache(maxsize=10)
+        cache.set("house", "дом")
+        cache.get("house")
+        cache.get("time")
+
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.stats()["hits"] == 0
+        assert cache.stats()["misses"] == 0
@@ -0,0 +1,21 @@
+from src.database import db_config
+
+
+class TestDBConfig:
+    @staticmethod
+    def test_configure_engine_rebinds_sessions():
+        try:
+            db_config.configure_engine(pooled=False)
+
+            assert db_config.pool_stats() == {"pooled": False}
+            assert db_config.async_session_maker.kw["bind"] is db_config.engine
+
+            db_config.configure_engine(pooled=True)
+            stats = db_config.pool_stats()
+
+            assert stats["pooled"] is True
+            assert stats["checked_out"] == 0
+            assert db_config.async_session_maker.kw["bind"] is db_config.engine
+
+        finally:
+            db_config.configure_engine(pooled=db_config.DB_POOL_ENABLED)
@@ -0,0 +1,149 @@
+import json
+import asyncio
+import pytest
+from fnmatch import fnmatch
+from unittest.mock import AsyncMock, MagicMock
+
+from redis import RedisError
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.routers import websocket_router
+from src.schemes.error_schemas import ErrorCreate
+from src.services.error_service import ERROR_CHANNEL_PATTERN, ErrorService
+from src.utils.dependenes.error_service_fabric import error_service_fabric
+from src.utils.pubsub import PubSubHub
+
+
+class FakePubSub:
+    def __init__(self, broker):
+        self.broker = broker
+        self.queue = asyncio.Queue()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.broker.subscribers.remove(self)
+
+    async def psubscribe(self, pattern):
+        self.pattern = pattern
+        self.loop = asyncio.get_running_loop()
+        self.broker.subscribers.append(self)
+        await self.queue.put({"type": "psubscribe"})
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+
+class FakeBroker:
+    def __init__(self):
+        self.subscribers = []
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    def publish(self, channel, data):
+        message = {"type": "pmessage", "channel": channel.encode(), "data": data}
+        for subscriber in self.subscribers:
+            if fnmatch(channel, subscriber.pattern):
+                subscriber.loop.call_soon_threadsafe(
+                    subscriber.queue.put_nowait, message
+                )
+
+
+class TestPubSubHub:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_one_subscription_fans_out_per_channel():
+        broker = FakeBroker()
+        hub = PubSubHub(pattern=ERROR_CHANNEL_PATTERN, redis=broker)
+
+        async with hub.listen("errors:1") as first, hub.listen(
+            "errors:1"
+        ) as second, hub.listen("errors:2") as other:
+            broker.publish("errors:1", b"boom")
+            await asyncio.sleep(0.01)
+
+            assert len(broker.subscribers) == 1
+            assert first.get_nowait() == second.get_nowait() == b"boom"
+            assert other.empty()
+
+        assert hub.listeners == {}
+        hub.task.cancel()
+
+
+class TestErrorService:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_add_one_publishes_to_user_channel():
+        repo = MagicMock()
+        repo.add_one = AsyncMock(
+            return_value=MagicMock(id=5, message="m", description="d")
+        )
+        redis = MagicMock()
+
+        await ErrorService(repo, redis=redis).add_one(
+            ErrorCreate(user_id=1, message="m", description="d")
+        )
+
+        channel, data = redis.publish.call_args.args
+        assert channel == "errors:1"
+        assert json.loads(data) == {"id": 5, "message": "m", "description": "d"}
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_add_one_keeps_row_when_redis_is_down():
+        repo = MagicMock()
+        repo.add_one = AsyncMock(
+            return_value=MagicMock(id=5, message="m", description=None)
+        )
+        redis = MagicMock()
+        redis.publish.side_effect = RedisError("down")
+
+        error = await ErrorService(repo, redis=redis).add_one(
+            ErrorCreate(user_id=1, message="m")
+        )
+
+        assert error.id == 5
+
+
+class TestErrorWebSocket:
+    @staticmethod
+    def test_backlog_then_pushed_errors(monkeypatch):
+        broker = FakeBroker()
+        monkeypatch.setattr(
+            websocket_router,
+            "error_hub",
+            PubSubHub(pattern=ERROR_CHANNEL_PATTERN, redis=broker),
+        )
+
+        service = MagicMock()
+        service.get_unsent_errors = AsyncMock(
+            return_value=[MagicMock(id=1, message="old", description="d")]
+        )
+        service.mark_sent = AsyncMock()
+
+        app = FastAPI()
+        app.include_router(websocket_router.websocket_router_v1)
+        app.dependency_overrides[error_service_fabric] = lambda: service
+
+        with TestClient(app).websocket_connect(
+            "/api/v1/websockets/errors?user_id=1"
+        ) as socket:
+            assert socket.receive_json() == {"msg": "Отчет об ошибке: old, d"}
+
+            for error_id, message in [(1, "old"), (2, "new")]:
+                broker.publish(
+                    "errors:1",
+                    json.dumps(
+                        {"id": error_id, "message": message, "description": "d"}
+                    ),
+                )
+
+            assert socket.receive_json() == {"msg": "Отчет об ошибке: new, d"}
+
+        marked = [call.kwargs["error_ids"] for call in service.mark_sent.call_args_list]
+        assert marked == [[1], [2]]
+        service.get_unsent_errors.assert_awaited_once_with(user_id=1)
@@ -1,7 +1,14 @@
+from types import SimpleNamespace
+
 from fastapi import HTTPException
 import pytest
 
-from src.utils.helpers import check_mime_type, check_youtube_link
+from src.config.instance import AUDIO_MAX_SECONDS
+from src.utils.helpers import (
+    check_mime_type,
+    check_youtube_link,
+    get_max_decode_seconds,
+)
 
 
 class TestCheckMineType:
@@ -65,3 +72,30 @@ class TestCheckYoutubeLink:
     async def test_check_youtube_link_failure(link):
         with pytest.raises(HTTPException):
             await check_youtube_link(link)
+
+
+class TestGetMaxDecodeSeconds:
+    @staticmethod
+    def test_subscriber_upload_is_decoded_in_full():
+        user = SimpleNamespace(subscription_type="month")
+
+        assert get_max_decode_seconds(type="audio", user=user) is None
+
+    @staticmethod
+    def test_free_user_is_capped_at_the_maximum():
+        user = SimpleNamespace(
+            subscription_type=None,
+            allowed_audio_seconds=AUDIO_MAX_SECONDS,
+            allowed_video_seconds=0,
+        )
+
+        assert get_max_decode_seconds(type="audio", user=user) == AUDIO_MAX_SECONDS
+
+    @staticmethod
+    def test_free_user_decodes_around_the_speech_left():
+        user = SimpleNamespace(
+            subscription_type=None, allowed_audio_seconds=100, allowed_video_seconds=0
+        )
+
+        assert get_max_decode_seconds(type="audio", user=user) == 200
+        assert get_max_decode_seconds(type="video", user=user) == 60
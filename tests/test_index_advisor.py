@@ -0,0 +1,52 @@
+from src.utils.index_advisor import CANONICAL_QUERIES, find_seq_scans, to_sql
+
+
+class TestIndexAdvisor:
+    @staticmethod
+    def test_find_seq_scans_walks_nested_plans():
+        explain = [
+            {
+                "Plan": {
+                    "Node Type": "Nested Loop",
+                    "Plans": [
+                        {
+                            "Node Type": "Index Scan",
+                            "Relation Name": "user_word",
+                            "Index Name": "uq_user_word_user_id_word_id",
+                        },
+                        {
+                            "Node Type": "Hash",
+                            "Plans": [
+                                {"Node Type": "Seq Scan", "Relation Name": "word"}
+                            ],
+                        },
+                    ],
+                }
+            }
+        ]
+
+        assert find_seq_scans(explain) == ["word"]
+
+    @staticmethod
+    def test_find_seq_scans_index_only_plan():
+        explain = [
+            {
+                "Plan": {
+                    "Node Type": "Bitmap Heap Scan",
+                    "Relation Name": "error",
+                    "Plans": [
+                        {
+                            "Node Type": "Bitmap Index Scan",
+                            "Index Name": "ix_error_user_id_id",
+                        }
+                    ],
+                }
+            }
+        ]
+
+        assert find_seq_scans(explain) == []
+
+    @staticmethod
+    def test_canonical_queries_render_literal_sql():
+        for _, stmt in CANONICAL_QUERIES:
+            assert "%(" not in to_sql(stmt)
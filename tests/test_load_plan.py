@@ -0,0 +1,72 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session
+
+from src.database.db_config import Base
+from src.database.models import User, UserWord, UserWordStopList, Word
+from src.utils.load_plan import NO_RELATIONSHIPS, LoadPlan
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        session.add_all([User(id=1, provider="google"), User(id=2, provider="google")])
+        session.add(Word(id=1, enValue="House", ruValue="Дом"))
+        session.flush()
+        session.add_all(
+            [
+                UserWord(user_id=1, word_id=1, frequency=1),
+                UserWord(user_id=2, word_id=1, frequency=1),
+                UserWordStopList(user_id=2, word_id=1),
+            ]
+        )
+        session.commit()
+        session.expunge_all()
+        yield session
+
+
+class TestLoadPlan:
+    @staticmethod
+    def test_selectin_path_raises_on_the_rest(session):
+        plan = LoadPlan(selectin=(UserWord.word,), raiseload=True)
+
+        user_word = session.execute(
+            plan.select(UserWord).filter(UserWord.user_id == 1)
+        ).scalar_one()
+
+        assert user_word.word.enValue == "House"
+        assert "user_words_stop_list" not in user_word.word.__dict__
+        with pytest.raises(InvalidRequestError):
+            user_word.word.user_words_stop_list
+
+    @staticmethod
+    def test_noload_leaves_relationship_empty(session):
+        plan = LoadPlan(noload=(User.user_words_stop_list,))
+
+        user = session.execute(plan.select(User).filter(User.id == 2)).scalar_one()
+
+        assert user.user_words_stop_list == []
+
+    @staticmethod
+    def test_no_relationships(session):
+        user = session.execute(
+            NO_RELATIONSHIPS.select(User).filter(User.id == 2)
+        ).scalar_one()
+
+        with pytest.raises(InvalidRequestError):
+            user.user_achievements
+
+    @staticmethod
+    def test_projection_returns_rows(session):
+        plan = LoadPlan(columns=(Word.pictureLink, UserWord.user_id))
+
+        rows = session.execute(
+            plan.select(UserWord).filter(UserWord.word_id == Word.id)
+        ).all()
+
+        assert plan.is_projection
+        assert sorted(row.user_id for row in rows) == [1, 2]
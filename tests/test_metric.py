@@ -1,14 +1,27 @@
+import asyncio
 import aiohttp
 import pytest
+from aiohttp import web
+from fastapi import Response
+from aiohttp.test_utils import TestServer
 from unittest.mock import AsyncMock, patch
 from src.config.instance import METRIC_TOKEN
-from src.utils.metric import get_user_data, send_user_data
+from src.utils.metric import (
+    METRIC_CACHE_AGE_HEADER,
+    MetricCache,
+    MetricClient,
+    get_user_data,
+    get_user_metric,
+    send_user_data,
+)
 
 
 class TestMetric:
     @staticmethod
     @pytest.mark.asyncio
-    @pytest.mark.parametrize("status_code, expected_result", [(200, None), (500, None)])
+    @pytest.mark.parametrize(
+        "status_code, expected_result", [(200, True), (500, False)]
+    )
     @patch("aiohttp.ClientSession.post")
     async def test_send_user_data(mock_post, status_code, expected_result):
         mock_response = AsyncMock()
@@ -37,7 +50,7 @@ class TestMetric:
         result = await send_user_data(data, server_url)
 
         mock_post.assert_called_once_with(url=server_url, headers=headers, json=data)
-        assert result is None
+        assert result is False
 
     @staticmethod
     @pytest.mark.asyncio
@@ -59,7 +72,7 @@ class TestMetric:
 
         mock_get.assert_called_once_with(
             url=f"{server_url}?uwords_uid={uwords_uid}&is_union=True&metric_range=alltime",
-            headers=headers
+            headers=headers,
         )
         assert result == expected_result
 
@@ -77,6 +90,223 @@ class TestMetric:
 
         mock_get.assert_called_once_with(
             url=f"{server_url}?uwords_uid={uwords_uid}&is_union=True&metric_range=alltime",
-            headers=headers
+            headers=headers,
         )
         assert result is None
+
+
+class MetricServer:
+    def __init__(self):
+        self.received = []
+        self.reads = 0
+        self.status = 200
+        self.held = {}  # uwords_uid -> asyncio.Event its POST waits for
+
+        app = web.Application()
+        app.router.add_post("/metric", self.post)
+        app.router.add_get("/metric", self.get)
+        self.server = TestServer(app)
+
+    async def post(self, request):
+        data = await request.json()
+        if data["uwords_uid"] in self.held:
+            await self.held[data["uwords_uid"]].wait()
+        if self.status == 200:
+            self.received.append(data)
+        return web.Response(status=self.status)
+
+    async def get(self, request):
+        self.reads += 1
+        return web.json_response(
+            {"alltime_learned_amount": 10, "alltime_userwords_amount": 100}
+        )
+
+    def client(self, tmp_path, **kwargs):
+        return MetricClient(
+            server_url=str(self.server.make_url("/metric")),
+            flush_interval=3600,
+            retry_delay=0,
+            spool_dir=tmp_path,
+            **kwargs,
+        )
+
+
+class TestMetricClient:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_events_are_coalesced_per_user(tmp_path):
+        metric_server = MetricServer()
+        async with metric_server.server:
+            client = metric_server.client(tmp_path)
+
+            client.send({"uwords_uid": "a", "learned_amount": 1})
+            client.send({"uwords_uid": "a", "learned_amount": 2})
+            client.send({"uwords_uid": "b", "speech_seconds": 30})
+
+            assert metric_server.received == []
+            await client.close()
+
+        assert sorted(metric_server.received, key=lambda data: data["uwords_uid"]) == [
+            {"uwords_uid": "a", "learned_amount": 3},
+            {"uwords_uid": "b", "speech_seconds": 30},
+        ]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_failed_events_are_spooled_and_replayed(tmp_path):
+        metric_server = MetricServer()
+        async with metric_server.server:
+            client = metric_server.client(tmp_path)
+            metric_server.status = 500
+
+            client.send({"uwords_uid": "a", "learned_amount": 1})
+            assert await client.flush() == 0
+            assert list(tmp_path.glob("metric-*.jsonl"))
+
+            metric_server.status = 200
+            client.send({"uwords_uid": "a", "learned_amount": 2})
+            assert await client.flush() == 1
+            await client.close()
+
+        assert metric_server.received == [{"uwords_uid": "a", "learned_amount": 3}]
+        assert list(tmp_path.iterdir()) == []
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_batch_size_triggers_a_flush(tmp_path):
+        metric_server = MetricServer()
+        async with metric_server.server:
+            client = metric_server.client(tmp_path, batch_size=2)
+
+            client.send({"uwords_uid": "a", "learned_amount": 1})
+            client.send({"uwords_uid": "b", "learned_amount": 1})
+            await client.flushing
+
+            assert len(metric_server.received) == 2
+            await client.close()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_reads_include_buffered_counters(tmp_path):
+        metric_server = MetricServer()
+        async with metric_server.server:
+            client = metric_server.client(tmp_path)
+
+            client.send({"uwords_uid": "a", "learned_amount": 2})
+            data = await client.get_user_data(uwords_uid="a")
+
+            assert data["alltime_learned_amount"] == 12
+            assert data["alltime_userwords_amount"] == 100
+            assert metric_server.received == []
+            await client.close()
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None, nx=False, px=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+
+class TestMetricCache:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_fresh_entry_is_served_without_a_request(tmp_path):
+        metric_server = MetricServer()
+        async with metric_server.server:
+            client = metric_server.client(
+                tmp_path, cache=MetricCache(redis=FakeRedis())
+            )
+
+            first, first_age = await client.read(uwords_uid="a")
+            second, second_age = await client.read(uwords_uid="a")
+            await client.close()
+
+        assert first == second
+        assert first_age == 0.0 and second_age < 1
+        assert metric_server.reads == 1
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_and_refreshed_once(tmp_path):
+        metric_server = MetricServer()
+        cache = MetricCache(redis=FakeRedis(), ttl=30)
+        cache.set("a", {"alltime_learned_amount": 1}, fetched_at=1)
+
+        async with metric_server.server:
+            client = metric_server.client(tmp_path, cache=cache)
+
+            results = [await client.read(uwords_uid="a") for _ in range(3)]
+            await client.close()
+
+        assert [data["alltime_learned_amount"] for data, _ in results] == [1, 1, 1]
+        assert all(age > 30 for _, age in results)
+        assert metric_server.reads == 1
+        assert cache.get("a")[0]["alltime_learned_amount"] == 10
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_delivered_events_update_and_stale_the_entry(tmp_path):
+        metric_server = MetricServer()
+        cache = MetricCache(redis=FakeRedis(), ttl=30)
+        cache.set("a", {"alltime_learned_amount": 10})
+
+        async with metric_server.server:
+            client = metric_server.client(tmp_path, cache=cache)
+            client.send({"uwords_uid": "a", "learned_amount": 2})
+            await client.flush()
+            await client.close()
+
+        data, age = cache.get("a")
+        assert data["alltime_learned_amount"] == 12
+        assert age >= 30
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_delivered_event_is_counted_once_during_a_flush(tmp_path):
+        metric_server = MetricServer()
+        metric_server.held["b"] = asyncio.Event()
+        cache = MetricCache(redis=FakeRedis(), ttl=30)
+        cache.set("a", {"alltime_learned_amount": 10})
+
+        async with metric_server.server:
+            client = metric_server.client(tmp_path, cache=cache, pool_size=1)
+            client.send({"uwords_uid": "a", "learned_amount": 1})
+            client.send({"uwords_uid": "b", "learned_amount": 1})
+            flush = asyncio.create_task(client.flush())
+
+            while not metric_server.received:
+                await asyncio.sleep(0.01)
+            data, _ = await client.read(uwords_uid="a")
+
+            metric_server.held["b"].set()
+            await flush
+            await client.close()
+
+        assert data["alltime_learned_amount"] == 11
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_cache_age_header(tmp_path, monkeypatch):
+        metric_server = MetricServer()
+        async with metric_server.server:
+            client = metric_server.client(
+                tmp_path, cache=MetricCache(redis=FakeRedis())
+            )
+            monkeypatch.setattr("src.utils.metric.metric_client", client)
+            response = Response()
+
+            metric = await get_user_metric(
+                user_id=1, user_days=2, uwords_uid="a", response=response
+            )
+            await client.close()
+
+        assert metric.alltime_learned_amount == 10
+        assert response.headers[METRIC_CACHE_AGE_HEADER] == "0"
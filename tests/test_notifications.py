@@ -0,0 +1,156 @@
+import time
+import socket
+import pytest
+from unittest.mock import MagicMock
+
+from aiosmtpd.controller import Controller
+
+from src.services.notification_service import NotificationService
+from src.utils.smtp_sender import RateLimiter, SMTPSender
+
+
+class Handler:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("bounce"):
+            return "550 no such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.extend(envelope.rcpt_tos)
+        return "250 OK"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp():
+    handler = Handler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+def make_sender(controller, rate=0) -> SMTPSender:
+    return SMTPSender(
+        host=controller.hostname,
+        port=controller.port,
+        user=None,
+        password=None,
+        use_ssl=False,
+        rate=rate,
+        address="noreply@uwords.test",
+    )
+
+
+class TestSMTPSender:
+    @staticmethod
+    def test_batch_reuses_one_connection(smtp):
+        controller, handler = smtp
+        sender = make_sender(controller)
+        recipients = [[f"user{i}@uwords.test", f"user{i}"] for i in range(50)]
+
+        stats = NotificationService.send_streak_batch(recipients, sender=sender)
+        sender.close()
+
+        assert stats["sent"] == 50
+        assert stats["failed"] == 0
+        assert sender.connections == 1
+        assert len(handler.messages) == 50
+
+    @staticmethod
+    def test_refused_recipient_is_counted_and_connection_kept(smtp):
+        controller, handler = smtp
+        sender = make_sender(controller)
+        recipients = [
+            ["first@uwords.test", "first"],
+            ["bounce@uwords.test", "bounce"],
+            ["last@uwords.test", "last"],
+        ]
+
+        stats = NotificationService.send_streak_batch(recipients, sender=sender)
+        sender.close()
+
+        assert (stats["sent"], stats["failed"]) == (2, 1)
+        assert sender.connections == 1
+        assert handler.messages == ["first@uwords.test", "last@uwords.test"]
+
+    @staticmethod
+    def test_reconnects_after_dropped_connection(smtp):
+        controller, handler = smtp
+        sender = make_sender(controller)
+
+        NotificationService.send_streak_batch([["a@uwords.test", "a"]], sender=sender)
+        sender.server.sock.shutdown(socket.SHUT_RDWR)
+        NotificationService.send_streak_batch([["b@uwords.test", "b"]], sender=sender)
+        sender.close()
+
+        assert sender.connections == 2
+        assert handler.messages == ["a@uwords.test", "b@uwords.test"]
+
+
+class TestRateLimiter:
+    @staticmethod
+    def test_spaces_calls():
+        limiter = RateLimiter(rate=100)
+
+        start = time.monotonic()
+        for _ in range(11):
+            limiter.wait()
+
+        assert time.monotonic() - start >= 0.1
+
+    @staticmethod
+    def test_zero_rate_does_not_wait():
+        limiter = RateLimiter(rate=0)
+
+        start = time.monotonic()
+        for _ in range(1000):
+            limiter.wait()
+
+        assert time.monotonic() - start < 0.1
+
+
+class TestNotificationService:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_iter_streak_recipients_yields_pairs():
+        async def iter_pages(**kwargs):
+            yield [MagicMock(id=1, email="a@uwords.test", username="a")]
+            yield [MagicMock(id=7, email="b@uwords.test", username="b")]
+
+        repo = MagicMock()
+        repo.iter_pages = MagicMock(side_effect=iter_pages)
+
+        batches = [
+            batch
+            async for batch in NotificationService(repo).iter_streak_recipients(
+                batch_size=1
+            )
+        ]
+
+        assert batches == [[["a@uwords.test", "a"]], [["b@uwords.test", "b"]]]
+        assert repo.iter_pages.call_args.kwargs["page_size"] == 1
+
+    @staticmethod
+    def test_record_stats():
+        redis = MagicMock()
+        pipeline = redis.pipeline.return_value
+
+        NotificationService.record_stats(
+            stats={"sent": 9, "failed": 1, "seconds": 0.5},
+            day="2024-09-25",
+            redis=redis,
+        )
+
+        pipeline.hincrby.assert_any_call("notifications:stats:2024-09-25", "sent", 9)
+        pipeline.hincrby.assert_any_call("notifications:stats:2024-09-25", "failed", 1)
+        pipeline.execute.assert_called_once()
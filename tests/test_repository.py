@@ -0,0 +1,205 @@
+import pytest
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from src.database.models import UserWord, Word
+from src.utils import repository
+from src.utils.repository import SQLAlchemyRepository
+
+
+class UserWordRepository(SQLAlchemyRepository):
+    model = UserWord
+
+
+class FakeSession:
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def execute(self, stmt, params=None):
+        self.statements.append((stmt, params))
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = []
+        return result
+
+    async def scalars(self, stmt, params=None):
+        self.statements.append((stmt, params))
+        result = MagicMock()
+        result.all.return_value = [MagicMock(id=row["word_id"]) for row in params]
+        return result
+
+    async def commit(self):
+        self.commits += 1
+
+
+class PagedSession(FakeSession):
+    def __init__(self, pages):
+        super().__init__()
+        self.pages = pages
+
+    async def execute(self, stmt, params=None):
+        self.statements.append((stmt, params))
+        result = MagicMock()
+        result.all.return_value = [(MagicMock(id=i),) for i in self.pages.pop(0)]
+        return result
+
+
+class UpdatingSession(FakeSession):
+    def __init__(self, batches):
+        super().__init__()
+        self.batches = batches
+
+    async def execute(self, stmt, params=None):
+        self.statements.append((stmt, params))
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = self.batches.pop(0)
+        return result
+
+
+@pytest.fixture
+def session(monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(repository, "async_session_maker", lambda: session)
+    monkeypatch.setattr(repository, "DB_BULK_CHUNK_SIZE", 2)
+    return session
+
+
+def compile_sql(stmt, literal_binds=False):
+    return str(
+        stmt.compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={"literal_binds": literal_binds},
+        )
+    )
+
+
+class TestBulkRepository:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_get_many_by_ids_chunks_unique_ids(session):
+        await UserWordRepository().get_many_by_ids(
+            ids=[1, 2, 2, 3, 4, 5], filters=[UserWord.user_id == 7]
+        )
+
+        assert len(session.statements) == 3
+        assert all(
+            "user_word.id IN" in compile_sql(stmt) for stmt, _ in session.statements
+        )
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_update_many_is_one_executemany_per_chunk(session):
+        rows = [{"id": i, "progress": i} for i in range(3)]
+
+        await UserWordRepository().update_many(data=rows)
+
+        assert [params for _, params in session.statements] == [rows[:2], rows[2:]]
+        assert session.commits == 1
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_add_many_returns_inserted_rows(session):
+        rows = [{"word_id": i, "user_id": 1, "frequency": 1} for i in range(3)]
+
+        res = await UserWordRepository().add_many(data=rows)
+
+        assert [obj.id for obj in res] == [0, 1, 2]
+        assert len(session.statements) == 2
+        assert "RETURNING" in compile_sql(session.statements[0][0])
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_upsert_many_respects_parameter_limit(session, monkeypatch):
+        monkeypatch.setattr(repository, "DB_BULK_CHUNK_SIZE", 1000)
+        monkeypatch.setattr(repository, "DB_MAX_QUERY_PARAMS", 7)
+        rows = [{"word_id": i, "user_id": 1, "frequency": 1} for i in range(5)]
+
+        await UserWordRepository().upsert_many(
+            data=rows,
+            index_elements=[UserWord.user_id, UserWord.word_id],
+            set_=lambda excluded: {
+                "frequency": UserWord.frequency + excluded.frequency
+            },
+        )
+
+        assert len(session.statements) == 3
+        sql = compile_sql(session.statements[0][0])
+        assert "ON CONFLICT (user_id, word_id) DO UPDATE" in sql
+        assert "RETURNING" not in sql
+
+
+class TestKeysetPages:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_iter_pages_continues_after_last_id(monkeypatch):
+        session = PagedSession(pages=[[1, 2], [5, 8], [9]])
+        monkeypatch.setattr(repository, "async_session_maker", lambda: session)
+
+        pages = [
+            [row.id for row in page]
+            async for page in UserWordRepository().iter_pages(
+                filters=[UserWord.user_id == 7], page_size=2
+            )
+        ]
+
+        assert pages == [[1, 2], [5, 8], [9]]
+        sql = [compile_sql(stmt, literal_binds=True) for stmt, _ in session.statements]
+        assert "user_word.id >" not in sql[0]
+        assert "user_word.id > 2" in sql[1]
+        assert "user_word.id > 8" in sql[2]
+        assert all("ORDER BY user_word.id" in s and "LIMIT 2" in s for s in sql)
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_iter_pages_stops_on_empty_page(monkeypatch):
+        session = PagedSession(pages=[[1, 2], []])
+        monkeypatch.setattr(repository, "async_session_maker", lambda: session)
+
+        pages = [page async for page in UserWordRepository().iter_pages(page_size=2)]
+
+        assert len(pages) == 1
+        assert len(session.statements) == 2
+
+
+class TestBatchedUpdate:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_update_in_batches_keys_on_last_updated_id(monkeypatch):
+        session = UpdatingSession(batches=[[3, 1], [4, 9], [12]])
+        monkeypatch.setattr(repository, "async_session_maker", lambda: session)
+
+        updated = [
+            count
+            async for count in UserWordRepository().update_in_batches(
+                filters=[UserWord.progress == 0], values={"progress": 1}, batch_size=2
+            )
+        ]
+
+        assert updated == [2, 2, 1]
+        assert session.commits == 3
+        sql = [compile_sql(stmt, literal_binds=True) for stmt, _ in session.statements]
+        assert "user_word.id > 3" in sql[1]
+        assert "user_word.id > 9" in sql[2]
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_update_in_batches_subquery_is_not_correlated(monkeypatch):
+        session = UpdatingSession(batches=[[]])
+        monkeypatch.setattr(repository, "async_session_maker", lambda: session)
+
+        async for _ in UserWordRepository().update_in_batches(
+            filters=[UserWord.word_id == Word.id, Word.topic == "Nature"],
+            values={"progress": 0},
+        ):
+            pass
+
+        sql = compile_sql(session.statements[0][0])
+        assert "FROM user_word, word" in sql
+        assert session.commits == 1
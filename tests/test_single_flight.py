@@ -0,0 +1,181 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+
+from redis import RedisError
+
+from src.utils.single_flight import SingleFlight
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+
+    def set(self, key, value, nx=False, px=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        self.ttls[key] = px
+        return True
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def eval(self, script, numkeys, key, token):
+        if self.values.get(key) == token:
+            del self.values[key]
+            return 1
+        return 0
+
+
+class TestSingleFlight:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_followers_wait_for_leader_result():
+        redis = FakeRedis()
+        store = {}
+        calls = []
+
+        async def producer():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            store["house"] = "Дом"
+            return store["house"]
+
+        async def lookup():
+            return store.get("house")
+
+        flights = [
+            SingleFlight(prefix="word", redis=redis, poll_interval=0.01)
+            for _ in range(5)
+        ]
+
+        results = await asyncio.gather(
+            *(
+                flight.run(key="house", producer=producer, lookup=lookup)
+                for flight in flights
+            )
+        )
+
+        assert results == ["Дом"] * 5
+        assert len(calls) == 1
+        assert redis.values == {}
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_follower_takes_over_when_lease_is_released_empty():
+        redis = FakeRedis()
+        redis.set("lease:word:house", "other", nx=True)
+
+        async def producer():
+            return "Дом"
+
+        async def lookup():
+            redis.values.clear()
+            return None
+
+        flight = SingleFlight(prefix="word", redis=redis, poll_interval=0.01)
+
+        assert await flight.run(key="house", producer=producer, lookup=lookup) == "Дом"
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_wait_timeout_returns_none():
+        redis = FakeRedis()
+        redis.set("lease:word:house", "other", nx=True)
+
+        async def producer():
+            raise AssertionError("lease is held by another worker")
+
+        async def lookup():
+            return None
+
+        flight = SingleFlight(
+            prefix="word", redis=redis, wait_timeout=0.05, poll_interval=0.01
+        )
+
+        assert await flight.run(key="house", producer=producer, lookup=lookup) is None
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_redis_error_runs_producer():
+        redis = MagicMock()
+        redis.set.side_effect = RedisError("down")
+        redis.get.side_effect = RedisError("down")
+        redis.eval.side_effect = RedisError("down")
+
+        async def producer():
+            return "Дом"
+
+        async def lookup():
+            return None
+
+        flight = SingleFlight(prefix="word", redis=redis)
+
+        assert await flight.run(key="house", producer=producer, lookup=lookup) == "Дом"
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_followers_return_none_after_empty_result():
+        redis = FakeRedis()
+        calls = []
+
+        async def producer():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return None
+
+        async def lookup():
+            return None
+
+        flights = [
+            SingleFlight(prefix="word", redis=redis, poll_interval=0.01)
+            for _ in range(5)
+        ]
+
+        results = await asyncio.gather(
+            *(
+                flight.run(key="house", producer=producer, lookup=lookup)
+                for flight in flights
+            )
+        )
+
+        assert results == [None] * 5
+        assert len(calls) == 1
+        assert redis.values == {"failed:word:house": "empty"}
+        assert redis.ttls["failed:word:house"] == flights[0].empty_ttl
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_followers_return_none_after_leader_error():
+        redis = FakeRedis()
+        calls = []
+
+        async def producer():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            raise RuntimeError("no picture service")
+
+        async def lookup():
+            return None
+
+        flights = [
+            SingleFlight(prefix="word", redis=redis, poll_interval=0.01)
+            for _ in range(5)
+        ]
+
+        results = await asyncio.gather(
+            *(
+                flight.run(key="house", producer=producer, lookup=lookup)
+                for flight in flights
+            ),
+            return_exceptions=True,
+        )
+
+        assert sum(isinstance(result, RuntimeError) for result in results) == 1
+        assert results.count(None) == 4
+        assert len(calls) == 1
+        assert redis.values == {"failed:word:house": "error"}
+        assert redis.ttls["failed:word:house"] == flights[0].error_ttl
+        assert flights[0].error_ttl < flights[0].empty_ttl
@@ -0,0 +1,192 @@
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.services.speech_service import FakeSpeech, WhisperSpeech, make_speech_backend
+from src.utils.audio import AudioChunk
+from src.utils.stt import SpeechBackend, choose_language, probe_chunks, transcribe
+
+
+RU, EN = "ru-RU", "en-US"
+
+
+@pytest.fixture
+def chunks():
+    # the second and third chunks are the longest, samples hold the number
+    return [
+        AudioChunk(parts=[np.full(seconds * 100, index, dtype=np.int16)], rate=100)
+        for index, seconds in enumerate([10, 30, 30, 5], start=1)
+    ]
+
+
+class ScriptedSpeech(SpeechBackend):
+    def __init__(self, results, batch_size=1, languages=(RU, EN)):
+        self.results = results
+        self.batch_size = batch_size
+        self.languages = languages
+        self.calls = []
+
+    def recognize_batch(self, chunks, language):
+        self.calls.append(([int(chunk.samples()[0]) for chunk in chunks], language))
+        return [self.results[language] for _ in chunks]
+
+
+class WhisperPipeline:
+    # BatchedInferencePipeline.transcribe as faster-whisper 1.1.0 runs it:
+    # collect_chunks slices the audio with the clips and times the segments
+    # in seconds from the start of the array
+    def __init__(self):
+        self.clips = None
+
+    def transcribe(self, audio, language, clip_timestamps, batch_size, vad_filter):
+        self.clips = clip_timestamps
+        segments = []
+        for clip in clip_timestamps:
+            piece = audio[clip["start"] : clip["end"]]
+            segments.append(
+                SimpleNamespace(
+                    start=clip["start"] / 16000,
+                    end=clip["end"] / 16000,
+                    text=f" Chunk {round(float(piece.max()) * 32768)}",
+                    avg_logprob=-0.1,
+                )
+            )
+        return iter(segments), SimpleNamespace(language=language)
+
+
+class TestChooseLanguage:
+    @staticmethod
+    def test_picks_the_confident_language():
+        probed = {
+            RU: [("привет как дела", 0.9), ("хорошо", 0.8)],
+            EN: [("pre vet", 0.3), (" ", 0.0)],
+        }
+
+        assert choose_language(probed) == RU
+
+    @staticmethod
+    def test_close_scores_are_ambiguous():
+        probed = {RU: [("да нет", 0.6)], EN: [("the net", 0.5)]}
+
+        assert choose_language(probed) is None
+
+    @staticmethod
+    def test_nothing_recognized_is_ambiguous():
+        assert choose_language({RU: [(" ", 0.0)], EN: [(" ", 0.0)]}) is None
+
+
+class TestTranscribe:
+    @staticmethod
+    def test_probe_takes_the_longest_chunks(chunks):
+        assert probe_chunks(chunks, probes=2) == chunks[1:3]
+
+    @staticmethod
+    def test_remaining_chunks_run_in_the_chosen_language(chunks):
+        backend = ScriptedSpeech({EN: ("hello there", 0.9), RU: ("хелоу", 0.2)})
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            text, language = transcribe(
+                chunks, backend=backend, executor=executor, probes=2
+            )
+
+        assert language == EN
+        assert text == " ".join(["hello there"] * 4)
+        # 2 probe chunks in both languages, the other 2 in English only
+        assert len(backend.calls) == 6
+        assert sorted(call for call in backend.calls if call[1] == RU) == [
+            ([2], RU),
+            ([3], RU),
+        ]
+
+    @staticmethod
+    def test_ambiguous_probe_runs_both_languages(chunks):
+        backend = ScriptedSpeech({EN: ("yes no", 0.5), RU: ("да нет", 0.5)})
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            text, language = transcribe(
+                chunks, backend=backend, executor=executor, probes=2
+            )
+
+        assert language is None
+        assert len(backend.calls) == 8
+        assert text == " ".join(["да нет"] * 4)
+
+    @staticmethod
+    def test_chunks_are_handed_over_in_batches(chunks):
+        backend = ScriptedSpeech({EN: ("hello", 0.9), RU: ("хелоу", 0.1)}, batch_size=8)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            transcribe(chunks, backend=backend, executor=executor, probes=2)
+
+        assert sorted(backend.calls) == [
+            ([1, 4], EN),
+            ([2, 3], EN),
+            ([2, 3], RU),
+        ]
+
+    @staticmethod
+    def test_language_detecting_backend_sees_each_chunk_once(chunks):
+        backend = ScriptedSpeech({None: ("hello", 0.5)}, languages=(None,))
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            text, _ = transcribe(chunks, backend=backend, executor=executor)
+
+        assert len(backend.calls) == 4
+        assert text == "hello hello hello hello"
+
+    @staticmethod
+    def test_no_chunks_no_text():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert transcribe([], backend=ScriptedSpeech({}), executor=executor) == (
+                "",
+                None,
+            )
+
+
+class TestSpeechBackends:
+    @staticmethod
+    def test_fake_backend_is_deterministic(chunks):
+        backend = FakeSpeech(language=RU)
+
+        first = backend.recognize_batch(chunks, RU)
+
+        assert backend.recognize_batch(chunks, RU) == first
+        assert len(set(text for text, _ in first)) > 1
+        assert backend.recognize(chunks[0], EN)[1] < first[0][1]
+
+    @staticmethod
+    def test_fake_backend_language_wins_the_probe(chunks):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            _, language = transcribe(
+                chunks, backend=FakeSpeech(language=RU), executor=executor
+            )
+
+        assert language == RU
+
+    @staticmethod
+    def test_backend_is_chosen_by_name():
+        assert isinstance(make_speech_backend("fake"), FakeSpeech)
+
+        with pytest.raises(ValueError):
+            make_speech_backend("unknown")
+
+    @staticmethod
+    def test_whisper_batch_maps_segments_back_to_chunks():
+        backend = WhisperSpeech(batch_size=8)
+        backend.pipeline = WhisperPipeline()
+        chunks = [
+            AudioChunk(parts=[np.full(seconds * 16000, index, dtype=np.int16)])
+            for index, seconds in [(1, 3), (2, 5), (3, 1)]
+        ]
+
+        results = backend.recognize_batch(chunks, EN)
+
+        assert [text for text, _ in results] == ["chunk 1", "chunk 2", "chunk 3"]
+        assert all(confidence > 0.9 for _, confidence in results)
+        assert backend.pipeline.clips == [
+            {"start": 0, "end": 48000},
+            {"start": 48000, "end": 128000},
+            {"start": 128000, "end": 144000},
+        ]
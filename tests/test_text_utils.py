@@ -0,0 +1,170 @@
+import string
+import tracemalloc
+from collections import Counter
+
+import pytest
+
+from src.utils.cache import LRUCache
+from src.utils.text import (
+    iter_chunk_counts,
+    iter_clean_tokens,
+    iter_text_chunks,
+    merge_counts,
+    normalize_tokens,
+    remove_spec_chars,
+)
+
+
+class TestCleanText:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "text, expected_result",
+        [
+            (
+                "hello, my name is uwords! i need 300$ dollars..... for api) #money",
+                "hello my name is uwords i need dollars for api money",
+            ),
+            ("what's up?", "whats up"),
+            ("«время» — деньги… ok", "время деньги ok"),
+        ],
+    )
+    def test_remove_spec_chars(text, expected_result):
+        assert remove_spec_chars(text) == expected_result
+
+    @staticmethod
+    def test_remove_spec_chars_matches_char_filter():
+        spec_chars = string.punctuation + "\n\xa0«»\t—…" + string.digits
+        text = "Ёлка, 12 «дом»\tи\nсад — it's 3.14… done!" * 3
+
+        expected_result = " ".join(
+            "".join(char for char in text if char not in spec_chars).split()
+        )
+
+        assert remove_spec_chars(text) == expected_result
+
+    @staticmethod
+    def test_iter_clean_tokens_skips_stopwords():
+        tokens = iter_clean_tokens(
+            text="ну ты это, заходи! если что", stopwords=frozenset({"ну", "ты", "что"})
+        )
+
+        assert list(tokens) == ["это", "заходи", "если"]
+
+    @staticmethod
+    def test_merge_counts_sums_lemmas_by_frequency():
+        counts = {"cats": 1, "dog": 2, "cat": 2, "dogs": 2}
+
+        result = merge_counts(counts=counts, lemmas=["cat", "dog", "cat", "dog"])
+
+        assert result == {"dog": 4, "cat": 3}
+        assert list(result) == ["dog", "cat"]
+
+
+class TestNormalizeTokens:
+    @staticmethod
+    def test_parses_each_surface_form_once():
+        calls = []
+
+        def normalizer(word):
+            calls.append(word)
+            return word.rstrip("s")
+
+        cache = LRUCache(maxsize=100)
+
+        result = normalize_tokens(
+            words=["cats", "dogs", "cats", "cat", "dogs"],
+            normalizer=normalizer,
+            cache=cache,
+        )
+
+        assert result == ["cat", "dog", "cat", "cat", "dog"]
+        assert calls == ["cats", "dogs", "cat"]
+
+    @staticmethod
+    def test_cache_is_shared_between_calls():
+        calls = []
+
+        def normalizer(word):
+            calls.append(word)
+            return word.upper()
+
+        cache = LRUCache(maxsize=100)
+
+        normalize_tokens(words=["дом", "мир"], normalizer=normalizer, cache=cache)
+        result = normalize_tokens(
+            words=["мир", "дом", "год"], normalizer=normalizer, cache=cache
+        )
+
+        assert result == ["МИР", "ДОМ", "ГОД"]
+        assert calls == ["дом", "мир", "год"]
+        assert cache.stats()["hits"] == 2
+
+
+class TestStreamText:
+    @staticmethod
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 64])
+    def test_chunks_rebuild_text_without_cutting_words(chunk_size):
+        text = "alpha beta\ngamma  delta «epsilon» zeta"
+
+        chunks = list(iter_text_chunks(text=text, chunk_size=chunk_size))
+
+        assert "".join(chunks) == text
+        assert [word for chunk in chunks for word in chunk.split()] == text.split()
+
+    @staticmethod
+    def test_chunks_end_on_any_kept_whitespace():
+        text = "alpha\u3000beta\rgamma\u2009delta"
+
+        chunks = list(iter_text_chunks(text=text, chunk_size=8))
+
+        assert chunks == ["alpha", "\u3000beta", "\rgamma", "\u2009delta"]
+
+    @staticmethod
+    def test_chunks_never_end_on_deleted_whitespace():
+        text = "alpha\nbeta\xa0gamma\tdelta epsilon"
+
+        chunks = list(iter_text_chunks(text=text, chunk_size=8))
+
+        assert chunks == ["alpha\nbeta\xa0gamma\tdelta", " epsilon"]
+
+    @staticmethod
+    def test_run_without_separators_is_capped():
+        text = "a" * 100 + " tail"
+
+        chunks = list(iter_text_chunks(text=text, chunk_size=10, max_chunk_size=30))
+
+        assert "".join(chunks) == text
+        assert max(len(chunk) for chunk in chunks) == 30
+
+    @staticmethod
+    def test_chunk_size_must_be_positive():
+        with pytest.raises(ValueError):
+            list(iter_text_chunks(text="text", chunk_size=0))
+
+    @staticmethod
+    def test_chunk_counts_match_whole_text_counts():
+        text = "the cat, the dog!\n and the cat… " * 50
+        stopwords = frozenset({"the", "and"})
+
+        total = Counter()
+        for counts in iter_chunk_counts(text=text, stopwords=stopwords, chunk_size=37):
+            total.update(counts)
+
+        assert total == Counter(iter_clean_tokens(text=text, stopwords=stopwords))
+
+    @staticmethod
+    def test_peak_memory_does_not_grow_with_text_size():
+        def peak(text):
+            tracemalloc.start()
+            for _ in iter_chunk_counts(
+                text=text, stopwords=frozenset(), chunk_size=64 * 1024
+            ):
+                pass
+            _, peak_size = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return peak_size
+
+        small = peak("слово word " * 100_000)
+        large = peak("слово word " * 800_000)
+
+        assert large < small * 1.5
@@ -0,0 +1,94 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.services.translation_cache import EN_RU, TranslationCache
+
+
+class FakeTranslator:
+    def __init__(self, translations):
+        self.translations = translations
+        self.calls = []
+
+    def translate(self, words):
+        self.calls.append(list(words))
+        return {word: self.translations[word] for word in words}
+
+
+@pytest.fixture
+def cache():
+    TranslationCache.memory.clear()
+    TranslationCache.counters.clear()
+
+    redis = MagicMock()
+    redis.mget.side_effect = lambda keys: [
+        "время".encode() if key.endswith(":time") else None for key in keys
+    ]
+
+    repo = MagicMock()
+    repo.get_all_by_filter = AsyncMock(
+        return_value=[MagicMock(enValue="House", ruValue="Дом")]
+    )
+
+    yield TranslationCache(repo=repo, redis=redis)
+
+    TranslationCache.memory.clear()
+    TranslationCache.counters.clear()
+
+
+class TestTranslationCache:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_layers_and_single_model_batch(cache):
+        translator = FakeTranslator({"people": "люди", "world": "мир"})
+
+        result = await cache.translate(
+            words=["house", "time", "people", "world"],
+            direction=EN_RU,
+            translator=translator,
+        )
+
+        assert result == {
+            "house": "Дом",
+            "time": "время",
+            "people": "люди",
+            "world": "мир",
+        }
+        assert translator.calls == [["people", "world"]]
+        assert TranslationCache.counters == {
+            "memory": 0,
+            "redis": 1,
+            "db": 1,
+            "model": 2,
+        }
+
+        pipeline = cache.redis.pipeline.return_value
+        assert pipeline.set.call_count == 3
+        pipeline.execute.assert_called_once()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_memory_layer_skips_model(cache):
+        translator = FakeTranslator({"people": "люди"})
+
+        await cache.translate(words=["people"], direction=EN_RU, translator=translator)
+        result = await cache.translate(
+            words=["people"], direction=EN_RU, translator=translator
+        )
+
+        assert result == {"people": "люди"}
+        assert translator.calls == [["people"]]
+        assert TranslationCache.counters["memory"] == 1
+        assert TranslationCache.stats()["hit_rate"] == 0.5
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_model_errors_are_not_cached(cache):
+        error = ValueError("bad input")
+        translator = FakeTranslator({"people": error})
+
+        result = await cache.translate(
+            words=["people"], direction=EN_RU, translator=translator
+        )
+
+        assert result == {"people": error}
+        assert (EN_RU, "people") not in TranslationCache.memory
@@ -0,0 +1,61 @@
+from src.services.translation_service import MarianTranslator
+
+
+class FakeTokenizer:
+    def __init__(self, tokens):
+        self.tokens = tokens
+
+    def __call__(self, words, add_special_tokens=True):
+        return {"input_ids": [[0] * self.tokens.get(word, 1) for word in words]}
+
+
+class FakeMarianTranslator(MarianTranslator):
+    def __init__(self, bad_words, batch_size=8, tokens=None):
+        super().__init__(
+            tokenizer=FakeTokenizer(tokens or {}), model=None, batch_size=batch_size
+        )
+        self.bad_words = set(bad_words)
+        self.calls = []
+
+    def generate(self, words):
+        self.calls.append(list(words))
+
+        bad = self.bad_words.intersection(words)
+        if bad:
+            raise ValueError(f"cannot translate {sorted(bad)}")
+
+        return [word.upper() for word in words]
+
+
+class TestMarianTranslator:
+    @staticmethod
+    def test_batch_is_translated_at_once():
+        translator = FakeMarianTranslator(bad_words=())
+
+        result = translator.translate(["cat", "dog", "owl"])
+
+        assert result == {"cat": "CAT", "dog": "DOG", "owl": "OWL"}
+        assert len(translator.calls) == 1
+
+    @staticmethod
+    def test_batches_are_bucketed_by_token_length():
+        translator = FakeMarianTranslator(
+            bad_words=(),
+            batch_size=2,
+            tokens={"aaaa": 1, "b": 3, "cc": 1, "ddd": 3},
+        )
+
+        translator.translate(["aaaa", "b", "cc", "ddd"])
+
+        assert translator.calls == [["aaaa", "cc"], ["b", "ddd"]]
+
+    @staticmethod
+    def test_failed_batch_keeps_good_words():
+        translator = FakeMarianTranslator(bad_words={"dog"})
+
+        result = translator.translate(["cat", "dog", "owl"])
+
+        assert result["cat"] == "CAT"
+        assert result["owl"] == "OWL"
+        assert isinstance(result["dog"], ValueError)
+        assert translator.calls[1:] == [["cat"], ["dog"], ["owl"]]
@@ -0,0 +1,132 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi import HTTPException
+
+from src.database.models import UserWord
+from src.utils.repository import SQLAlchemyRepository
+from src.utils.dependenes.unit_of_work_fabric import unit_of_work_fabric
+from src.utils.unit_of_work import UnitOfWork
+
+
+class UserWordRepository(SQLAlchemyRepository):
+    model = UserWord
+
+
+class Savepoint:
+    def __init__(self, session):
+        self.session = session
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.session.savepoints.append(exc_type)
+        return False
+
+
+def session_factory():
+    session = MagicMock()
+    session.savepoints = []
+    session.begin_nested = lambda: Savepoint(session)
+    session.execute = AsyncMock()
+    session.flush = AsyncMock()
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    session.close = AsyncMock()
+    return session
+
+
+class TestUnitOfWork:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_repositories_share_session_and_commit_once():
+        async with UnitOfWork(session_factory=session_factory) as uow:
+            session = uow.session
+            first = UserWordRepository(uow=uow)
+            second = UserWordRepository(uow=uow)
+
+            await first.delete_one(filters=[UserWord.id == 1])
+            await second.delete_one(filters=[UserWord.id == 2])
+
+        assert session.execute.await_count == 2
+        assert session.flush.await_count == 2
+        assert session.savepoints == [None, None]
+        session.commit.assert_awaited_once()
+        session.rollback.assert_not_awaited()
+        session.close.assert_awaited_once()
+        assert uow.session is None
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_error_rolls_back():
+        with pytest.raises(ValueError):
+            async with UnitOfWork(session_factory=session_factory) as uow:
+                session = uow.session
+                await UserWordRepository(uow=uow).delete_one(filters=[UserWord.id == 1])
+                raise ValueError("energy limit")
+
+        session.commit.assert_not_awaited()
+        session.rollback.assert_awaited_once()
+        session.close.assert_awaited_once()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_failed_query_only_rolls_back_its_savepoint():
+        async with UnitOfWork(session_factory=session_factory) as uow:
+            session = uow.session
+            session.execute.side_effect = [RuntimeError("unique violation"), None]
+            repo = UserWordRepository(uow=uow)
+
+            with pytest.raises(RuntimeError):
+                await repo.delete_one(filters=[UserWord.id == 1])
+            await repo.delete_one(filters=[UserWord.id == 2])
+
+        assert session.savepoints == [RuntimeError, None]
+        session.commit.assert_awaited_once()
+        session.rollback.assert_not_awaited()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_release_commits_and_keeps_the_session():
+        async with UnitOfWork(session_factory=session_factory) as uow:
+            session = uow.session
+            await uow.release()
+            await UserWordRepository(uow=uow).delete_one(filters=[UserWord.id == 1])
+
+        assert session.commit.await_count == 2
+        session.rollback.assert_not_awaited()
+
+
+class TestUnitOfWorkFabric:
+    @staticmethod
+    async def finish_with(error):
+        with patch(
+            "src.utils.dependenes.unit_of_work_fabric.UnitOfWork",
+            lambda: UnitOfWork(session_factory=session_factory),
+        ):
+            dependency = unit_of_work_fabric()
+            uow = await dependency.__anext__()
+            session = uow.session
+
+            with pytest.raises(type(error)):
+                await dependency.athrow(error)
+
+        return session
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_http_error_keeps_earlier_writes():
+        session = await TestUnitOfWorkFabric.finish_with(
+            HTTPException(status_code=404, detail="User not found")
+        )
+
+        session.commit.assert_awaited_once()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_other_error_rolls_back():
+        session = await TestUnitOfWorkFabric.finish_with(ValueError("energy limit"))
+
+        session.commit.assert_not_awaited()
+        session.rollback.assert_awaited_once()
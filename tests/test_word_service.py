@@ -0,0 +1,108 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from src.services.word_service import WordService
+
+
+class DirectFlight:
+    async def run(self, key, producer, lookup):
+        return await producer()
+
+
+class FakeTopicService:
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+
+    async def get_word_subtopic(self, word):
+        if word in self.fail:
+            raise RuntimeError(f"no subtopic for {word}")
+        return SimpleNamespace(title="Home", topic_title="Life")
+
+
+def make_service():
+    repo = AsyncMock()
+    repo.get_one.return_value = None
+    repo.add_one_if_absent.side_effect = lambda data, index_elements: data
+    return WordService(repo=repo, single_flight=DirectFlight())
+
+
+class TestWordService:
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_word_without_picture_is_not_voiced():
+        service = make_service()
+
+        with patch(
+            "src.services.word_service.ImageDownloader.download_picture",
+            AsyncMock(return_value=None),
+        ), patch(
+            "src.services.word_service.AudioService.word_to_speech", AsyncMock()
+        ) as word_to_speech:
+            word = await service.enrich_word(
+                en_value="house", ru_value="дом", subtopic_service=FakeTopicService()
+            )
+
+        assert word is None
+        word_to_speech.assert_not_awaited()
+        service.repo.add_one_if_absent.assert_not_awaited()
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_upload_new_words_isolates_failed_words():
+        service = make_service()
+
+        with patch(
+            "src.services.word_service.ImageDownloader.download_picture",
+            AsyncMock(
+                side_effect=lambda word: None if word == "cat" else f"{word}.png"
+            ),
+        ), patch(
+            "src.services.word_service.AudioService.word_to_speech",
+            AsyncMock(side_effect=lambda word: f"{word}.mp3"),
+        ) as word_to_speech:
+            uploaded = await service.upload_new_words(
+                words={"house": "дом", "cat": "кот", "tree": "дерево"},
+                subtopic_service=FakeTopicService(fail={"tree"}),
+            )
+
+        word, created = uploaded["house"]
+        assert created
+        assert word["audioLink"] == "house.mp3"
+        assert word["pictureLink"] == "house.png"
+        assert uploaded["cat"] == (None, False)
+        assert isinstance(uploaded["tree"], RuntimeError)
+        word_to_speech.assert_awaited_once_with(word="house")
+
+    @staticmethod
+    @pytest.mark.asyncio
+    async def test_upload_new_words_respects_concurrency():
+        service = make_service()
+        active = 0
+        peak = 0
+
+        async def download_picture(word):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return f"{word}.png"
+
+        words = {f"word{i}": f"слово{i}" for i in range(10)}
+
+        with patch(
+            "src.services.word_service.ImageDownloader.download_picture",
+            download_picture,
+        ), patch(
+            "src.services.word_service.AudioService.word_to_speech",
+            AsyncMock(return_value=None),
+        ):
+            uploaded = await service.upload_new_words(
+                words=words, subtopic_service=FakeTopicService(), concurrency=3
+            )
+
+        assert peak == 3
+        assert list(uploaded) == list(words)
+        assert all(created for _, created in uploaded.values())